@@ -60,6 +60,14 @@ out vec4 f_color;
 
 uniform sampler2DArray u_terrain_arr;
 uniform sampler2DArray u_atmos_arr;
+
+// Baked lighting (simulation/terrain_lighting.py), used when u_BakedLighting == 1
+// u_light0_arr: normal.x, normal.y (0..1), horizon 0, horizon 1
+// u_light1_arr: horizon 2 .. horizon 5
+// Horizon k = terrain elevation (angle / 90 deg) towards azimuth k * 60 deg
+uniform sampler2DArray u_light0_arr;
+uniform sampler2DArray u_light1_arr;
+uniform int u_BakedLighting;
 uniform int u_layer; 
 uniform float u_time; 
 
@@ -158,6 +166,28 @@ float calculateShadow(vec2 uv, vec3 lightDir, float startHeight) {
     return 1.0; 
 }
 
+// --- BAKED LIGHTING (single lookup instead of the functions above) ---
+
+vec3 getBakedNormal(vec4 l0) {
+    vec2 xy = l0.rg * 2.0 - 1.0;
+    return vec3(xy, sqrt(max(0.0, 1.0 - dot(xy, xy))));
+}
+
+float getBakedShadow(vec4 l0, vec4 l1, vec3 lightDir) {
+    if (lightDir.z <= 0.0) return 0.0;
+    float horizon[6] = float[6](l0.b, l0.a, l1.r, l1.g, l1.b, l1.a);
+
+    // Interpolate the horizon between the two nearest baked azimuths
+    float sector = mod(atan(lightDir.y, lightDir.x) / 6.2831853 * 6.0, 6.0);
+    int k0 = int(floor(sector));
+    int k1 = (k0 + 1) % 6;
+    float h = mix(horizon[k0], horizon[k1], fract(sector));
+
+    // Light elevation on the same 0..1 (= 0..90 deg) scale, soft edge
+    float elevation = atan(lightDir.z, length(lightDir.xy)) / 1.5707963;
+    return smoothstep(h - 0.01, h + 0.01, elevation);
+}
+
 void main() {
     // --- TERRAIN DATA ---
     vec4 t_data = texture(u_terrain_arr, vec3(v_uv, u_layer));
@@ -199,7 +229,16 @@ void main() {
     // DYNAMIC LIGHTING
     // ---------------------------------------------------------
     
-    vec3 normal = getNormal(v_uv, u_HeightScale); 
+    vec4 l0 = vec4(0.5, 0.5, 0.0, 0.0);
+    vec4 l1 = vec4(0.0);
+    vec3 normal;
+    if (u_BakedLighting == 1) {
+        l0 = texture(u_light0_arr, vec3(v_uv, u_layer));
+        l1 = texture(u_light1_arr, vec3(v_uv, u_layer));
+        normal = getBakedNormal(l0);
+    } else {
+        normal = getNormal(v_uv, u_HeightScale); 
+    }
     
     vec3 sunVec  = getLightVector(v_LatLon.y, v_LatLon.x, u_SolarDeclination, u_GHA);
     vec3 moonVec = getLightVector(v_LatLon.y, v_LatLon.x, u_LunarDeclination, u_LunarGHA);
@@ -210,10 +249,14 @@ void main() {
     float moon_diffuse = max(0.0, dot(normal, moonVec));
     
     float sun_shadow = 1.0;
-    if(sun_diffuse > 0.0) sun_shadow = calculateShadow(v_uv, sunVec, h);
+    if(sun_diffuse > 0.0) {
+        sun_shadow = (u_BakedLighting == 1) ? getBakedShadow(l0, l1, sunVec) : calculateShadow(v_uv, sunVec, h);
+    }
     
     float moon_shadow = 1.0;
-    if(moon_diffuse > 0.0 && u_MoonPhase > 0.05) moon_shadow = calculateShadow(v_uv, moonVec, h);
+    if(moon_diffuse > 0.0 && u_MoonPhase > 0.05) {
+        moon_shadow = (u_BakedLighting == 1) ? getBakedShadow(l0, l1, moonVec) : calculateShadow(v_uv, moonVec, h);
+    }
 
     // Specular (Water Reflection)
     vec3 specular = vec3(0.0);
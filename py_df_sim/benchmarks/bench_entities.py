@@ -0,0 +1,69 @@
+"""
+Entity throughput benchmark.
+Spawns N agents over a block of generated chunks and reports agents/tick.
+
+Usage:
+    python py_df_sim/benchmarks/bench_entities.py --agents 10000 50000 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Make 'src' importable the same way main.py sees it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from engine.save_manager import SaveManager
+from simulation.data_manager import DataManager
+from simulation.entities import EntityStore, HERBIVORE, CARNIVORE
+from simulation.generator import TerrainGenerator
+
+
+def build_world(level, span):
+    """Generates a span x span block of resident chunks at 'level'."""
+    save_manager = SaveManager(save_dir=tempfile.mkdtemp(prefix="natura_bench_"))
+    data_manager = DataManager(TerrainGenerator(seed=12345), save_manager)
+    for cy in range(span):
+        for cx in range(span):
+            data_manager.get_chunk(cx, cy, level)
+    return data_manager
+
+
+def run(agent_count, data_manager, extent, ticks, dt):
+    store = EntityStore(capacity=agent_count, seed=1)
+    rng = np.random.default_rng(2)
+    species = np.where(rng.random(agent_count) < 0.9, HERBIVORE, CARNIVORE)
+    store.spawn(rng.random(agent_count) * extent, rng.random(agent_count) * extent, species)
+
+    store.update(dt, data_manager)  # Warm-up
+    start = time.perf_counter()
+    for _ in range(ticks):
+        store.update(dt, data_manager)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--level", type=int, default=2)
+    parser.add_argument("--span", type=int, default=4, help="Chunks per side of the resident block")
+    args = parser.parse_args()
+
+    print(f"Generating {args.span}x{args.span} chunks at level {args.level}...")
+    data_manager = build_world(args.level, args.span)
+    extent = args.span / (2 ** args.level)  # World units covered by the block
+
+    print(f"{'agents':>10} {'ms/tick':>10} {'agents/tick/s':>15}")
+    for count in args.agents:
+        seconds = run(count, data_manager, extent, args.ticks, dt=1.0 / 60.0)
+        print(f"{count:>10} {seconds * 1000.0:>10.3f} {count / seconds:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Time-to-first-frame benchmark.
+Measures how long it takes until every node of a view has drawable data,
+with full-resolution generation vs progressive preview streaming,
+and how long the background refinement then needs to finish.
+
+Usage:
+    python py_df_sim/benchmarks/bench_first_frame.py --zoom 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Make 'src' importable the same way main.py sees it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from engine.save_manager import SaveManager
+from simulation.data_manager import DataManager
+from simulation.generator import TerrainGenerator
+from simulation.quadtree import QuadtreeManager
+
+
+def first_frame(nodes, preview):
+    """Seconds until all nodes can be drawn, and until they are at full resolution."""
+    save_manager = SaveManager(save_dir=tempfile.mkdtemp(prefix="natura_bench_"))
+    data_manager = DataManager(TerrainGenerator(seed=12345), save_manager)
+
+    start = time.perf_counter()
+    if preview:
+        # What the TextureManager does before its upload loop
+        data_manager.prefetch_previews([(n.x, n.y, n.level) for n in nodes])
+    for node in nodes:
+        chunk = data_manager.get_chunk(node.x, node.y, node.level, preview=preview)
+        # What the TextureManager reads for the first upload
+        chunk.get_display_layers(0, 4)
+        chunk.get_display_layers(4, 8)
+    drawable = time.perf_counter() - start
+
+    while data_manager.refining:
+        data_manager.poll_refinements()
+        time.sleep(0.001)
+    refined = time.perf_counter() - start
+
+    data_manager.clear()
+    return drawable, refined
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zoom", type=float, nargs="+", default=[1.0, 8.0, 64.0])
+    args = parser.parse_args()
+
+    quadtree = QuadtreeManager()
+    print(f"{'zoom':>8} {'nodes':>6} {'full ms':>10} {'preview ms':>11} {'speedup':>8} {'refined ms':>11}")
+    for zoom in args.zoom:
+        quadtree.update((0.5, 0.5), zoom)
+        nodes = quadtree.visible_nodes
+        full, _ = first_frame(nodes, preview=False)
+        quick, refined = first_frame(nodes, preview=True)
+        print(f"{zoom:>8.1f} {len(nodes):>6} {full * 1000.0:>10.1f} {quick * 1000.0:>11.1f} "
+              f"{full / quick:>7.1f}x {refined * 1000.0:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+LOD churn benchmark.
+Replays an oscillating-zoom camera trace (small wiggles around a split
+threshold plus a slow zoom drift) through the Quadtree -> prune -> load
+pipeline of main.py, once with the old single 0.75 threshold and once with
+the configured hysteresis, and counts how many chunks had to be generated
+and uploaded per second of trace.
+
+Usage:
+    python py_df_sim/benchmarks/bench_lod_churn.py --seconds 10 --wiggle 0.08
+"""
+import argparse
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+import time
+
+# Make 'src' importable the same way main.py sees it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np
+
+from engine.save_manager import SaveManager
+from simulation.data_manager import DataManager
+from simulation.generator import TerrainGenerator
+from simulation.quadtree import QuadtreeManager
+
+
+def zoom_trace(frames, fps, base_zoom, wiggle, drift, seed=0):
+    """Camera zoom per frame: base * (1 + wiggle * sin) * slow drift, with jitter (like scroll/trackpad input)."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames) / fps
+    oscillation = 1.0 + wiggle * np.sin(2.0 * math.pi * 1.5 * t) + rng.normal(0.0, wiggle * 0.25, frames)
+    return base_zoom * oscillation * (1.0 + drift * t / t[-1])
+
+
+def replay(quadtree, zooms, cam_pos):
+    """Runs the per-frame LOD pipeline. Returns (generated, uploaded, visible-set changes, generate seconds)."""
+    data_manager = DataManager(TerrainGenerator(seed=12345),
+                               SaveManager(save_dir=tempfile.mkdtemp(prefix="natura_bench_")))
+    uploaded_keys = set()
+    generated = uploaded = changes = 0
+    generate_time = 0.0
+    previous = set()
+
+    for zoom in zooms:
+        quadtree.update(cam_pos, zoom)
+        visible = set((n.x, n.y, n.level) for n in quadtree.visible_nodes)
+        changes += visible != previous
+        previous = visible
+
+        with contextlib.redirect_stdout(io.StringIO()):  # prune() logs every unload
+            data_manager.prune(quadtree.visible_nodes)
+        uploaded_keys &= visible  # TextureManager frees layers of nodes out of view
+
+        for key in visible:
+            if key in uploaded_keys:
+                continue
+            start = time.perf_counter()
+            if key not in data_manager.loaded_chunks:
+                generated += 1
+            chunk = data_manager.get_chunk(*key)
+            chunk.get_display_layers(0, 8)  # What the upload reads
+            generate_time += time.perf_counter() - start
+            uploaded_keys.add(key)
+            uploaded += 1
+    return generated, uploaded, changes, generate_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--zoom", type=float, default=6.0, help="Base zoom, near a split threshold")
+    parser.add_argument("--wiggle", type=float, default=0.08, help="Relative zoom oscillation")
+    parser.add_argument("--drift", type=float, default=0.0, help="Relative zoom change over the trace")
+    args = parser.parse_args()
+
+    frames = int(args.seconds * args.fps)
+    zooms = zoom_trace(frames, args.fps, args.zoom, args.wiggle, args.drift)
+    cam_pos = (0.43, 0.57)
+    print(f"{frames} frames, zoom {zooms.min():.2f} - {zooms.max():.2f}")
+
+    setups = [
+        ("single 0.75", QuadtreeManager(split_threshold=0.75, merge_threshold=0.75, min_residency=0)),
+        ("hysteresis", QuadtreeManager()),
+    ]
+    print(f"\n{'setup':>26} {'generated/s':>12} {'uploaded/s':>11} {'set changes':>12} {'gen ms/s':>9}")
+    for name, quadtree in setups:
+        if name == "hysteresis":
+            name += f" {quadtree.merge_threshold}/{quadtree.split_threshold}/{quadtree.min_residency}f"
+        generated, uploaded, changes, gen_time = replay(quadtree, zooms, cam_pos)
+        print(f"{name:>26} {generated / args.seconds:>12.1f} {uploaded / args.seconds:>11.1f} "
+              f"{changes:>12} {gen_time * 1000.0 / args.seconds:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
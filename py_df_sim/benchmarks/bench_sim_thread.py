@@ -0,0 +1,95 @@
+"""
+Simulation/render split benchmark (headless, no GL context needed).
+Runs the SimulationThread over a panning camera, once stepped inline like
+the old single loop and once on its own thread, against a stand-in renderer
+that takes the newest FrameState and waits --render-ms (GL submit + vsync,
+which release the GIL like the real driver calls). Reports frames drawn and
+simulation steps per second.
+
+Usage:
+    python py_df_sim/benchmarks/bench_sim_thread.py --seconds 8 --render-ms 10
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Make 'src' importable the same way main.py sees it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from config import CHUNK_SIZE, WEATHER_LOD_LEVEL
+from engine.save_manager import SaveManager
+from engine.sim_thread import FrameBuffer, SimulationThread
+from engine.texture_staging import TextureStager
+from simulation.catch_up import CatchUpSimulator
+from simulation.celestials import Celestials
+from simulation.chronos import Chronos
+from simulation.data_manager import DataManager
+from simulation.erosion import ErosionSimulator
+from simulation.generator import TerrainGenerator
+from simulation.quadtree import QuadtreeManager
+from simulation.weather import WeatherSimulator
+
+
+def build(pool_size=102):
+    """The systems main.py wires into the SimulationThread, on a fresh save directory."""
+    save_manager = SaveManager(save_dir=tempfile.mkdtemp(prefix="natura_bench_"))
+    data_manager = DataManager(TerrainGenerator(seed=12345), save_manager)
+    chronos = Chronos()
+    weather = WeatherSimulator(CHUNK_SIZE * 2 ** WEATHER_LOD_LEVEL)
+    stager = TextureStager(pool_size, ('nu2', 'nu1', 'nu1', 'nu1'), baked_lighting=True)
+    frame_buffer = FrameBuffer()
+    sim = SimulationThread(chronos, Celestials(chronos), QuadtreeManager(), data_manager, weather,
+                           ErosionSimulator(data_manager), CatchUpSimulator(data_manager, chronos, weather),
+                           stager, frame_buffer)
+    return sim, frame_buffer
+
+
+def replay(threaded, seconds, render_ms, zoom):
+    """Returns (frames drawn, simulation steps, frames skipped, upload jobs applied)."""
+    sim, frame_buffer = build()
+    pos = [0.43, 0.57]
+    sim.set_view(pos, zoom)
+    frames = uploads = 0
+
+    with contextlib.redirect_stdout(io.StringIO()):  # prune() logs every unload
+        if threaded:
+            sim.start()
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            pos[0] += 0.0005  # Slow pan: new chunks keep streaming in
+            sim.set_view(pos, zoom)
+            if not threaded:
+                sim.step(1.0 / 60.0)
+            elif sim.error is not None:
+                raise sim.error
+
+            # Stand-in renderer: take the newest frame, "draw" it
+            frame = frame_buffer.take()
+            if frame is not None:
+                uploads += len(frame.uploads)
+            time.sleep(render_ms / 1000.0)
+            frames += 1
+        sim.stop()
+    return frames, frame_buffer.published, frame_buffer.skipped, uploads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=8.0)
+    parser.add_argument("--render-ms", type=float, default=10.0, help="Simulated GL + vsync time per frame")
+    parser.add_argument("--zoom", type=float, default=6.0)
+    args = parser.parse_args()
+
+    print(f"{'setup':>12} {'frames/s':>9} {'steps/s':>8} {'skipped':>8} {'uploads':>8}")
+    for name, threaded in (("single loop", False), ("threaded", True)):
+        frames, steps, skipped, uploads = replay(threaded, args.seconds, args.render_ms, args.zoom)
+        print(f"{name:>12} {frames / args.seconds:>9.1f} {steps / args.seconds:>8.1f} "
+              f"{skipped:>8} {uploads:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Spatial hash benchmark.
+Times a full build, an incremental rebuild after a small move, a batched
+radius query and a batched k-nearest query for every agent.
+
+Usage:
+    python py_df_sim/benchmarks/bench_spatial_hash.py --agents 10000 100000 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Make 'src' importable the same way main.py sees it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from simulation.spatial_hash import SpatialHash
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000.0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, nargs="+", default=[10000, 100000, 200000])
+    parser.add_argument("--density", type=float, default=5000.0, help="Agents per World Unit squared")
+    parser.add_argument("--radius", type=float, default=0.01)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--level", type=int, default=6)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'agents':>8} {'build':>9} {'rebuild':>9} {'radius':>9} {'knn':>9} {'nbrs/agent':>11}  (ms)")
+    for count in args.agents:
+        extent = np.sqrt(count / args.density)
+        xs = (rng.random(count) * extent).astype(np.float32)
+        ys = (rng.random(count) * extent).astype(np.float32)
+        everyone = np.arange(count)
+
+        index = SpatialHash(level=args.level)
+        t_build, _ = timed(index.rebuild, xs, ys)
+
+        # One tick of movement (agents drift a fraction of a cell)
+        xs += rng.normal(0.0, index.cell_size * 0.05, count).astype(np.float32)
+        ys += rng.normal(0.0, index.cell_size * 0.05, count).astype(np.float32)
+        t_rebuild, _ = timed(index.rebuild, xs, ys)
+
+        t_radius, (offsets, _) = timed(index.query_radius, xs, ys, args.radius, exclude=everyone)
+        t_knn, _ = timed(index.query_knn, xs, ys, args.k, exclude=everyone)
+
+        print(f"{count:>8} {t_build:>9.2f} {t_rebuild:>9.2f} {t_radius:>9.2f} {t_knn:>9.2f} "
+              f"{offsets[-1] / count:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Texture storage format benchmark (headless, no GL context needed).
+For every format it reports VRAM per chunk slot, how many slots fit the
+TEXTURE_VRAM_BUDGET_MB pool, the CPU staging time per chunk upload, and the
+round-trip error of each chunk layer (what the shader samples vs the Float32 data).
+
+Usage:
+    python py_df_sim/benchmarks/bench_texture_formats.py --chunks 64
+"""
+import argparse
+import os
+import sys
+import time
+
+# Make 'src' importable the same way main.py sees it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np
+
+from config import CHUNK_SIZE, TEXTURE_FORMATS, TEXTURE_VRAM_BUDGET_MB, TEXTURE_MAX_LAYERS
+from engine import texture_formats
+from simulation.generator import TerrainGenerator
+
+LAYER_NAMES = ["Height", "GroundTemp", "Hum", "Bio", "WindX", "WindY", "AirTemp", "AirHum"]
+
+
+def staging_time(stack, fmt, repeats):
+    """Seconds per chunk to turn one texture group (4 layers) into upload bytes."""
+    group = stack[..., 0:4]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for chunk in group:
+            texture_formats.encode(chunk, fmt).tobytes()
+    return (time.perf_counter() - start) / (repeats * len(group))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=64, help="Generated sample chunks (levels 0-4)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=12345)
+    args = parser.parse_args()
+
+    generator = TerrainGenerator(seed=args.seed)
+    rng = np.random.default_rng(0)
+    keys = []
+    for _ in range(args.chunks):
+        level = int(rng.integers(0, 5))
+        keys.append((int(rng.integers(0, 2 ** level)), int(rng.integers(0, 2 ** level)), level))
+    stack = np.stack([generator.generate_chunk_data(*k) for k in keys])
+    print(f"{len(keys)} chunks, {CHUNK_SIZE}x{CHUNK_SIZE} texels, budget {TEXTURE_VRAM_BUDGET_MB} MB")
+
+    # 1. Size and staging cost per format (one RGBA array)
+    print(f"\n{'format':>6} {'bytes/slot':>11} {'stage ms':>9}")
+    for fmt in texture_formats.FORMATS:
+        slot = texture_formats.texel_bytes(fmt) * CHUNK_SIZE * CHUNK_SIZE
+        ms = staging_time(stack, fmt, args.repeats) * 1000.0
+        print(f"{fmt:>6} {slot:>11} {ms:>9.3f}")
+
+    # 2. Pool capacity for a few terrain/atmos combinations
+    print(f"\n{'terrain/atmos':>14} {'KB/chunk':>9} {'slots':>6} {'vs f4':>6}")
+    baseline = None
+    configured = (TEXTURE_FORMATS['terrain'], TEXTURE_FORMATS['atmos'])
+    for combo in [('f4', 'f4'), ('f2', 'f2'), ('nu2', 'f2'), ('nu2', 'nu1'), ('nu1', 'nu1')]:
+        slot = sum(texture_formats.texel_bytes(f) for f in combo) * CHUNK_SIZE * CHUNK_SIZE
+        slots = min(TEXTURE_VRAM_BUDGET_MB * 1024 * 1024 // slot, TEXTURE_MAX_LAYERS)
+        baseline = baseline or slots
+        mark = "  <- config" if combo == configured else ""
+        print(f"{'/'.join(combo):>14} {slot // 1024:>9} {slots:>6} {slots / baseline:>5.1f}x{mark}")
+
+    # 3. Precision per layer, every format applied to both groups
+    print(f"\nmax abs error per layer (clipped fraction in brackets if > 0)")
+    print(f"{'layer':>10} " + " ".join(f"{fmt:>18}" for fmt in texture_formats.FORMATS))
+    reports = {fmt: texture_formats.precision_report(stack, (fmt, fmt)) for fmt in texture_formats.FORMATS}
+    for layer, name in enumerate(LAYER_NAMES):
+        cells = []
+        for fmt in texture_formats.FORMATS:
+            _, max_err, rms, clipped = reports[fmt][layer]
+            cell = f"{max_err:.2e}" + (f" [{clipped:.1%}]" if clipped else "")
+            cells.append(f"{cell:>18}")
+        print(f"{name:>10} " + " ".join(cells))
+
+    # 4. The configured formats, with RMS
+    print(f"\nconfigured {configured[0]}/{configured[1]}:")
+    for layer, (fmt, max_err, rms, clipped) in texture_formats.precision_report(stack, configured).items():
+        print(f"  {LAYER_NAMES[layer]:>10} {fmt:>4}  max {max_err:.2e}  rms {rms:.2e}  clipped {clipped:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Load test for src/tile_server.py.
+Opens N keep-alive connections that request random chunks/tiles from a
+fixed key set and reports requests/sec and latency percentiles.
+Starts its own server on a free localhost port unless --port is given.
+
+Usage:
+    python py_df_sim/benchmarks/bench_tile_server.py --connections 16 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+async def client(host, port, paths, deadline, latencies, revalidate, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        while time.perf_counter() < deadline:
+            path = rng.choice(paths)
+            headers = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+            if revalidate and path in etags:
+                headers += f"If-None-Match: {etags[path]}\r\n"
+            start = time.perf_counter()
+            writer.write((headers + "\r\n").encode())
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line == b"\r\n":
+                    break
+                name, _, value = line.decode().partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+                elif name.lower() == 'etag':
+                    etags[path] = value.strip()
+            await reader.readexactly(length)
+            latencies.append((time.perf_counter() - start, status))
+    finally:
+        writer.close()
+
+
+async def run(host, port, paths, connections, seconds, revalidate):
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, paths, deadline, latencies, revalidate, random.Random(i))
+                           for i in range(connections)))
+    return latencies, time.perf_counter() - start
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_server(port, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=None, help="Use a running server on this port")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--level", type=int, default=3)
+    parser.add_argument("--span", type=int, default=8, help="Keys per side of the requested block")
+    parser.add_argument("--kind", choices=["chunk", "tiles"], default="chunk")
+    parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match after the first response")
+    args = parser.parse_args()
+
+    ext = "bin" if args.kind == "chunk" else "png"
+    paths = [f"/{args.kind}/{args.level}/{x}/{y}.{ext}" for x in range(args.span) for y in range(args.span)]
+
+    server = None
+    port = args.port
+    if port is None:
+        port = free_port()
+        server = subprocess.Popen([sys.executable, os.path.join(SRC, "tile_server.py"), "--port", str(port),
+                                   "--save-dir", tempfile.mkdtemp(prefix="natura_bench_")],
+                                  stdout=subprocess.DEVNULL)
+        wait_for_server(port)
+
+    try:
+        latencies, elapsed = asyncio.run(run("127.0.0.1", port, paths, args.connections,
+                                             args.seconds, args.revalidate))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    times = sorted(t for t, _ in latencies)
+    statuses = {}
+    for _, status in latencies:
+        statuses[status] = statuses.get(status, 0) + 1
+
+    def pct(p):
+        return times[min(len(times) - 1, int(len(times) * p))] * 1000.0
+
+    print(f"{len(times)} requests in {elapsed:.1f}s over {args.connections} connections")
+    print(f"  requests/sec: {len(times) / elapsed:,.0f}")
+    print(f"  latency ms:   p50 {pct(0.50):.2f}  p90 {pct(0.90):.2f}  p99 {pct(0.99):.2f}")
+    print(f"  statuses:     {statuses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Microbenchmark regression suite (headless: no display, no GPU, no pygame).
+
+Times single components in isolation, writes the results to JSON together
+with machine metadata, and compares two result files to flag regressions.
+
+Usage:
+    python py_df_sim/benchmarks/run.py run                      # -> benchmarks/results/<host>-<time>.json
+    python py_df_sim/benchmarks/run.py run --save-baseline      # also store it as the baseline
+    python py_df_sim/benchmarks/run.py run --filter weather quadtree
+    python py_df_sim/benchmarks/run.py compare                  # latest result vs baseline
+    python py_df_sim/benchmarks/run.py compare old.json new.json --threshold 0.15
+
+'compare' exits with status 1 if any benchmark got slower than the threshold,
+so it can gate a CI job. Timings are only comparable on the same machine;
+a warning is printed when the metadata differs.
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Make 'src' importable the same way main.py sees it
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+import numpy as np
+
+from config import CHUNK_SIZE
+from engine.save_manager import SaveManager
+from simulation.celestials import Celestials
+from simulation.chronos import Chronos
+from simulation.chunk_data import ChunkData
+from simulation.erosion import ErosionSimulator
+from simulation.generator import TerrainGenerator
+from simulation.quadtree import QuadtreeManager
+from simulation import terrain_lighting
+from simulation.weather import WeatherSimulator
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+SCHEMA_VERSION = 1
+
+
+# ----------------------------------------------------------------------
+# BENCHMARKS
+# Each factory does its (untimed) setup and returns the callable to time.
+# ----------------------------------------------------------------------
+
+def bench_generate_chunk(level):
+    generator = TerrainGenerator(seed=12345)
+    out = np.zeros((CHUNK_SIZE, CHUNK_SIZE, 8), dtype=np.float32)
+    n = 2 ** level
+    return lambda: generator.generate_chunk_data(n // 2, n // 3, level, out=out)
+
+
+def bench_bake_lighting():
+    height = TerrainGenerator(seed=12345).generate_chunk_data(3, 5, 4)[:, :, 0].copy()
+    return lambda: terrain_lighting.bake(height)
+
+
+def bench_erosion_step():
+    # One hydraulic + thermal step on a 3x3 chunk mosaic (no DataManager needed)
+    size = 3 * CHUNK_SIZE
+    height = TerrainGenerator(seed=12345).generate_chunk_data(3, 5, 4)[:, :, 0]
+    height = np.tile(height, (3, 3))[:size, :size].copy()
+    water = np.zeros_like(height)
+    sediment = np.zeros_like(height)
+    erosion = ErosionSimulator(data_manager=None)
+    return lambda: erosion.step(height, water, sediment, relief=16.0)
+
+
+def bench_quadtree(zoom):
+    quadtree = QuadtreeManager()
+    cam_pos = (0.43, 0.57)
+    quadtree.update(cam_pos, zoom)  # Settle the hysteresis state
+    return lambda: quadtree.update(cam_pos, zoom)
+
+
+def _save_fixture(scratch_dir):
+    save_manager = SaveManager(save_dir=scratch_dir)
+    data = TerrainGenerator(seed=12345).generate_chunk_data(3, 5, 4)
+    return save_manager, ChunkData(3, 5, 4, data)
+
+
+def bench_save_chunk(scratch_dir):
+    save_manager, chunk = _save_fixture(scratch_dir)
+
+    def run():
+        chunk.invalidate_summaries()  # A saved chunk was edited, so its biome summary is new
+        save_manager.save_chunk(chunk)
+    return run
+
+
+def bench_load_chunk(scratch_dir):
+    save_manager, chunk = _save_fixture(scratch_dir)
+    save_manager.save_chunk(chunk)
+    return lambda: save_manager.load_chunk_data(3, 5, 4)
+
+
+def bench_weather(size):
+    generator = TerrainGenerator(seed=12345)
+    tiles = size // CHUNK_SIZE
+    world_map = np.zeros((size, size, 8), dtype=np.float32)
+    for ty in range(tiles):
+        for tx in range(tiles):
+            world_map[ty * CHUNK_SIZE:(ty + 1) * CHUNK_SIZE, tx * CHUNK_SIZE:(tx + 1) * CHUNK_SIZE] = \
+                generator.generate_chunk_data(tx, ty, 3)
+    weather = WeatherSimulator(size)
+    return lambda: weather.update(world_map, 1.0 / 60.0)
+
+
+def bench_celestials(table):
+    chronos = Chronos()
+    celestials = Celestials(chronos)
+    if table:
+        celestials.enable_table()
+
+    def run():
+        chronos.update(1.0 / 60.0)
+        celestials.update()
+    return run
+
+
+# Placeholder factory argument: run_suite() passes its temporary directory instead
+SCRATCH_DIR = "<scratch>"
+
+# name -> (factory, args). Names are the keys used in the JSON files.
+BENCHMARKS = {
+    "generator.generate_chunk_data[level=0]": (bench_generate_chunk, (0,)),
+    "generator.generate_chunk_data[level=6]": (bench_generate_chunk, (6,)),
+    "terrain_lighting.bake": (bench_bake_lighting, ()),
+    "erosion.step[192x192]": (bench_erosion_step, ()),
+    "quadtree.update[zoom=1]": (bench_quadtree, (1.0,)),
+    "quadtree.update[zoom=8]": (bench_quadtree, (8.0,)),
+    "quadtree.update[zoom=64]": (bench_quadtree, (64.0,)),
+    "save_manager.save_chunk": (bench_save_chunk, (SCRATCH_DIR,)),
+    "save_manager.load_chunk_data": (bench_load_chunk, (SCRATCH_DIR,)),
+    "weather.update[64]": (bench_weather, (64,)),
+    "weather.update[256]": (bench_weather, (256,)),
+    "weather.update[512]": (bench_weather, (512,)),
+    "celestials.update[solve]": (bench_celestials, (False,)),
+    "celestials.update[table]": (bench_celestials, (True,)),
+}
+
+
+# ----------------------------------------------------------------------
+# TIMING
+# ----------------------------------------------------------------------
+
+def measure(fn, repeats, min_round_time):
+    """
+    timeit-style: calls per round are doubled until one round takes
+    min_round_time, then 'repeats' rounds are timed. Returns seconds per call.
+    """
+    fn()  # Warm-up (caches, lazy imports, first allocation)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_round_time or number >= 1 << 20:
+            break
+        number *= 2
+
+    rounds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number)
+
+    return {
+        "median": statistics.median(rounds),
+        "min": min(rounds),
+        "mean": statistics.fmean(rounds),
+        "stdev": statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+        "calls_per_round": number,
+        "rounds": repeats,
+    }
+
+
+def machine_metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                                capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    import scipy
+    return {
+        "host": socket.gethostname(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "commit": commit,
+    }
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+# ----------------------------------------------------------------------
+# COMMANDS
+# ----------------------------------------------------------------------
+
+def run_suite(args):
+    names = [n for n in BENCHMARKS if not args.filter or any(f in n for f in args.filter)]
+    if not names:
+        print("No benchmark matches", args.filter)
+        return 2
+
+    results = {}
+    # Disk benchmarks write into one scratch directory, deleted afterwards
+    with tempfile.TemporaryDirectory(prefix="natura_bench_") as scratch_dir:
+        for name in names:
+            factory, factory_args = BENCHMARKS[name]
+            factory_args = tuple(scratch_dir if a == SCRATCH_DIR else a for a in factory_args)
+            timing = measure(factory(*factory_args), args.repeats, args.min_time)
+            results[name] = timing
+            print(f"{name:<42} {format_time(timing['median']):>12}  (+/- {format_time(timing['stdev'])})")
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_metadata(),
+        "settings": {"repeats": args.repeats, "min_round_time": args.min_time},
+        "results": results,
+    }
+
+    out = args.out
+    if out is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        out = os.path.join(RESULTS_DIR, f"{report['machine']['host']}-{stamp}.json")
+    paths = [out] + ([BASELINE_PATH] if args.save_baseline else [])
+    for path in paths:
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {path}")
+    return 0
+
+
+def compare(args):
+    baseline_path = args.baseline or BASELINE_PATH
+    current_path = args.current
+    if current_path is None:
+        candidates = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")), key=os.path.getmtime)
+        if not candidates:
+            print("No results yet, use 'run' first.")
+            return 2
+        current_path = candidates[-1]
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}, use 'run --save-baseline' first.")
+        return 2
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+    print(f"baseline: {baseline_path} ({baseline['created']}, {baseline['machine']['commit']})")
+    print(f"current:  {current_path} ({current['created']}, {current['machine']['commit']})")
+
+    # Timings from different machines or library versions are not comparable
+    keys = ("host", "processor", "cpu_count", "python", "numpy")
+    differs = [k for k in keys if baseline['machine'].get(k) != current['machine'].get(k)]
+    if differs:
+        print(f"WARNING: machine metadata differs ({', '.join(differs)}), timings may not be comparable")
+
+    regressions = 0
+    print(f"\n{'benchmark (best round)':<42} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name in sorted(set(baseline['results']) | set(current['results'])):
+        old = baseline['results'].get(name)
+        new = current['results'].get(name)
+        if old is None or new is None:
+            print(f"{name:<42} {'(only in ' + ('current' if old is None else 'baseline') + ')':>34}")
+            continue
+        # Best round: the least noisy estimate of the true cost (other processes only add time)
+        change = new['min'] / old['min'] - 1.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "  faster"
+        print(f"{name:<42} {format_time(old['min']):>12} {format_time(new['min']):>12} "
+              f"{change:>+7.1%}{flag}")
+
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the suite and write a JSON result file")
+    run_parser.add_argument("--filter", nargs="+", help="Only benchmarks whose name contains one of these")
+    run_parser.add_argument("--repeats", type=int, default=7, help="Timed rounds per benchmark")
+    run_parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per round")
+    run_parser.add_argument("--out", default=None, help="Result file (default: benchmarks/results/...)")
+    run_parser.add_argument("--save-baseline", action="store_true", help=f"Also write {BASELINE_PATH}")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions against a baseline")
+    compare_parser.add_argument("baseline", nargs="?", default=None, help="Default: benchmarks/baseline.json")
+    compare_parser.add_argument("current", nargs="?", default=None, help="Default: newest file in results/")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown (0.10 = 10%%)")
+
+    args = parser.parse_args()
+    sys.exit(run_suite(args) if args.command == "run" else compare(args))
+
+
+if __name__ == "__main__":
+    main()
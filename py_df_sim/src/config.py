@@ -42,3 +42,98 @@ REAL_SECONDS_PER_GAME_DAY = 60.0
 # Calendar
 DAYS_PER_YEAR = 360  # Simplifies math (12 months of 30 days), or use 365
 STARTING_HOUR = 12.0 # Noon
+
+# --- LOD SELECTION (QuadtreeManager) ---
+# A node splits when it covers more than LOD_SPLIT_THRESHOLD of the screen
+# height (size * zoom) and its children merge back only below
+# LOD_MERGE_THRESHOLD. The gap between the two (hysteresis) keeps small zoom
+# wiggles around a threshold from flipping nodes every frame.
+LOD_SPLIT_THRESHOLD = 0.85
+LOD_MERGE_THRESHOLD = 0.65
+# Frames a split/merge decision must stand before it may be reversed
+LOD_MIN_RESIDENCY_FRAMES = 20
+
+# --- EROSION (simulation/erosion.py) ---
+# Hydraulic + thermal erosion steps spent per frame on resident chunks,
+# and the total number of steps every chunk receives before it is done.
+EROSION_ITERATIONS_PER_FRAME = 1
+EROSION_ITERATIONS_PER_CHUNK = 120
+# Only detail levels are eroded; coarser LODs follow via the mip pyramid
+EROSION_MIN_LEVEL = 3
+# Chunks stitched into one mosaic per batch, and the halo (pixels) read
+# from their neighbours so flow is continuous across the mosaic border
+EROSION_MAX_CHUNKS = 16
+EROSION_HALO = 8
+# Steps a chunk accumulates before they are published as an edit
+# (stats + mip pyramid + texture upload cost more than a step)
+EROSION_PUBLISH_STEPS = 8
+
+# --- CATCH-UP SIMULATION (simulation/catch_up.py) ---
+# Chunks only evolve while resident; on their return they jump to "now".
+# Resident chunks advance in steps of at least this many game hours,
+# at most CATCH_UP_MAX_CHUNKS per frame (each step is a chunk edit).
+CATCH_UP_INTERVAL_HOURS = 6.0
+CATCH_UP_MAX_CHUNKS = 8
+# Logistic biomass growth rate per game day
+BIOMASS_GROWTH_RATE = 0.1
+
+# --- WEATHER SETTINGS ---
+# Weather is simulated on coarse Quadtree chunks only (fronts are regional).
+# Finer chunks get their atmosphere by upsampling their coarse ancestor.
+# 0 = Root chunks, 2 = 4x4 chunks per root.
+WEATHER_LOD_LEVEL = 2
+
+# --- DATA SAMPLING ---
+# How many off-screen chunks DataManager.sample() keeps in its LRU side cache
+# (64x64x8 Float32 = 128 KB each)
+SAMPLE_CACHE_SIZE = 128
+# Biome summaries kept for chunks outside the view (~4 KB each)
+BIOME_CACHE_SIZE = 1024
+
+# --- CHUNK MEMORY ---
+# Slots in the ChunkArena slab (64x64x8 Float32 = 128 KB each).
+# Must cover every resident chunk; extra chunks fall back to separate arrays.
+CHUNK_ARENA_CAPACITY = 256
+# 'heap', 'shared' (multiprocessing.shared_memory) or 'memmap'
+CHUNK_ARENA_BACKING = 'heap'
+
+# --- PROGRESSIVE STREAMING ---
+# Newly generated visible chunks first appear as a coarse preview
+# (PREVIEW_RESOLUTION samples per side, 0 = disabled) and are refined
+# to full resolution by REFINE_WORKERS background threads.
+PREVIEW_RESOLUTION = 16
+REFINE_WORKERS = 2
+
+# --- TERRAIN LIGHTING ---
+# Vertical exaggeration of the height map for normals and shadows
+# (shader u_HeightScale, tile_rasterizer, simulation/terrain_lighting.py)
+TERRAIN_HEIGHT_SCALE = 40.0
+# Bake normals + horizon angles once per chunk into two extra texture arrays
+# instead of ray marching the height map per pixel every frame
+BAKE_TERRAIN_LIGHTING = True
+
+# --- TEXTURE POOL ---
+# Storage format of the two chunk texture arrays (see engine/texture_formats.py):
+# 'f4' Float32, 'f2' half float, 'nu2' / 'nu1' normalized 16 / 8 bit.
+# Terrain keeps 16 bit for the height (normals and shadows use its slope).
+# The atmosphere is only drawn (wind, clouds), so 8 bit is enough.
+# Baked lighting (normals, horizon angles) is smooth and only shades, 8 bit suffices.
+TEXTURE_FORMATS = {'terrain': 'nu2', 'atmos': 'nu1', 'lighting': 'nu1'}
+# The pool gets as many chunk slots as fit in this budget
+# (64 slots at the old all-Float32 size = 8 MB)
+TEXTURE_VRAM_BUDGET_MB = 8
+# OpenGL 3.3 only guarantees 256 layers per texture array
+TEXTURE_MAX_LAYERS = 256
+
+# --- THREADING (engine/sim_thread.py) ---
+# Run time, LOD selection, chunk streaming, weather, erosion and texture
+# staging on a simulation thread; the main thread only renders the newest
+# published frame. False = both in one loop (easier to debug/profile).
+SIM_THREAD = True
+# Simulation steps per second (rendering runs at FPS independently)
+SIM_RATE = 60
+
+# --- TILE SERVER (src/tile_server.py) ---
+TILE_SERVER_PORT = 8765
+TILE_SERVER_CACHE_SIZE = 512  # Responses kept in the in-process LRU
+TILE_SERVER_MAX_LEVEL = 6     # Deepest level served (QuadtreeManager.max_level), deeper is 404
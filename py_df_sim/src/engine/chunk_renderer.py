@@ -111,7 +111,7 @@ class ChunkRenderer:
         
         if 'u_HeightScale' in self.prog:
             # Exaggerates the height map. Higher values = steeper mountains = deeper shadows.
-            self.prog['u_HeightScale'].value = 40.0 
+            self.prog['u_HeightScale'].value = config.TERRAIN_HEIGHT_SCALE
             
         if 'u_TexRes' in self.prog:
             # The resolution of the chunk (e.g., 128). 
@@ -121,13 +121,21 @@ class ChunkRenderer:
         # -----------------------------------------------------------------
         # 5. TEXTURE BINDING
         # -----------------------------------------------------------------
-        texture_manager.bind_textures(location_terrain=0, location_atmos=1)
+        texture_manager.bind_textures(location_terrain=0, location_atmos=1, location_lighting=2)
         
         if 'u_terrain_arr' in self.prog:
             self.prog['u_terrain_arr'].value = 0
         if 'u_atmos_arr' in self.prog:
             self.prog['u_atmos_arr'].value = 1
         
+        # Baked normals/horizons (one lookup) or the per-pixel fallback (ray marching)
+        if 'u_BakedLighting' in self.prog:
+            self.prog['u_BakedLighting'].value = int(texture_manager.baked_lighting)
+        if 'u_light0_arr' in self.prog:
+            self.prog['u_light0_arr'].value = 2
+        if 'u_light1_arr' in self.prog:
+            self.prog['u_light1_arr'].value = 3
+        
         # -----------------------------------------------------------------
         # 6. RENDER LOOP
         # -----------------------------------------------------------------
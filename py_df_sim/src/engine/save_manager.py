@@ -1,40 +1,51 @@
 import os
 import json
+import struct
 import numpy as np
 import config
+from simulation.chunk_stats import ChunkStatsIndex
 
 SAVE_DIR = "saves/default"
 
+# Session snapshot file layout:
+#   [8 bytes magic][uint64 header length][JSON header][padding][raw Float32 blob]
+# The blob starts on a SNAPSHOT_ALIGN boundary so it can be memory-mapped directly.
+SNAPSHOT_MAGIC = b"NATSNAP1"
+SNAPSHOT_ALIGN = 4096
+
 class SaveManager:
-    def __init__(self):
+    def __init__(self, save_dir=SAVE_DIR):
+        # Root folder of this save (world.json + chunks/)
+        self.save_dir = save_dir
         self.ensure_save_directory()
 
     def ensure_save_directory(self):
-        if not os.path.exists(SAVE_DIR):
-            os.makedirs(SAVE_DIR)
+        if not os.path.exists(self.save_dir):
+            os.makedirs(self.save_dir)
         
         # Subfolder for chunk arrays
-        chunks_dir = os.path.join(SAVE_DIR, "chunks")
+        chunks_dir = os.path.join(self.save_dir, "chunks")
         if not os.path.exists(chunks_dir):
             os.makedirs(chunks_dir)
 
-    def save_global_state(self, seed, camera):
-        """Saves seed and camera position to a JSON file."""
+    def save_global_state(self, seed, camera, game_hours=None):
+        """Saves seed, camera position and the game clock (Chronos.total_game_hours) to a JSON file."""
         data = {
             "seed": seed,
             "camera_x": camera.pos[0],
             "camera_y": camera.pos[1],
-            "zoom": camera.zoom
+            "zoom": camera.zoom,
+            "game_hours": game_hours
         }
         
-        path = os.path.join(SAVE_DIR, "world.json")
+        path = os.path.join(self.save_dir, "world.json")
         with open(path, 'w') as f:
             json.dump(data, f, indent=4)
         print("Global state saved.")
 
     def load_global_state(self):
         """Returns a dict of global state, or None if no save exists."""
-        path = os.path.join(SAVE_DIR, "world.json")
+        path = os.path.join(self.save_dir, "world.json")
         if not os.path.exists(path):
             return None
             
@@ -45,18 +56,160 @@ class SaveManager:
         """Saves a single ChunkData object to .npy file."""
         # Filename format: chunk_x_y_level.npy
         filename = f"chunk_{chunk_data.x}_{chunk_data.y}_{chunk_data.level}.npy"
-        path = os.path.join(SAVE_DIR, "chunks", filename)
+        path = os.path.join(self.save_dir, "chunks", filename)
         
         np.save(path, chunk_data.height_map)
+        
+        # The RAM copy now matches the file
+        chunk_data.is_dirty = False
+        chunk_data.saved_version = chunk_data.version
+        chunk_data.source_mtime = os.stat(path).st_mtime_ns
+        
+        # Biome summary lives next to the chunk: chunk_x_y_level_biome.npz
+        biome_map, biome_histogram = chunk_data.biome_summary()
+        self.save_chunk_biomes(chunk_data.x, chunk_data.y, chunk_data.level,
+                               biome_map, biome_histogram)
+
+    def chunk_mtime(self, x, y, level):
+        """Modification time (ns) of the chunk's .npy file, None if it is not saved."""
+        filename = f"chunk_{x}_{y}_{level}.npy"
+        try:
+            return os.stat(os.path.join(self.save_dir, "chunks", filename)).st_mtime_ns
+        except FileNotFoundError:
+            return None
 
-    def load_chunk_data(self, x, y, level):
+    def has_chunk(self, x, y, level):
+        """True if the chunk's layers are saved on disk."""
+        filename = f"chunk_{x}_{y}_{level}.npy"
+        return os.path.exists(os.path.join(self.save_dir, "chunks", filename))
+
+    def load_chunk_data(self, x, y, level, out=None):
         """
         Attempts to load chunk heightmap from disk.
+        out: Optional array to read into (e.g. a ChunkArena slot) instead of allocating.
         Returns numpy array if found, None if not.
         """
         filename = f"chunk_{x}_{y}_{level}.npy"
-        path = os.path.join(SAVE_DIR, "chunks", filename)
+        path = os.path.join(self.save_dir, "chunks", filename)
         
         if os.path.exists(path):
-            return np.load(path)
+            if out is None:
+                return np.load(path)
+            # Memory-map the file and copy straight into the destination
+            out[...] = np.load(path, mmap_mode='r')
+            return out
         return None
+
+
+    def save_chunk_biomes(self, x, y, level, biome_map, biome_histogram):
+        """Saves a chunk's biome ids (uint8) and histogram to a .npz file."""
+        filename = f"chunk_{x}_{y}_{level}_biome.npz"
+        path = os.path.join(self.save_dir, "chunks", filename)
+        
+        np.savez(path, ids=biome_map, histogram=biome_histogram)
+
+    def load_chunk_biomes(self, x, y, level):
+        """
+        Attempts to load a chunk's biome summary from disk.
+        Returns (biome_map, biome_histogram) if found, None if not.
+        """
+        filename = f"chunk_{x}_{y}_{level}_biome.npz"
+        path = os.path.join(self.save_dir, "chunks", filename)
+        
+        if os.path.exists(path):
+            with np.load(path) as data:
+                return data['ids'], data['histogram']
+        return None
+
+    def save_stats_index(self, index):
+        """Saves the chunk statistics pyramid (own summaries only) to stats.npz."""
+        path = os.path.join(self.save_dir, "stats.npz")
+        np.savez(path, **index.to_arrays())
+
+    def load_stats_index(self):
+        """Returns the saved ChunkStatsIndex, or an empty one if none exists."""
+        path = os.path.join(self.save_dir, "stats.npz")
+        if not os.path.exists(path):
+            return ChunkStatsIndex()
+        
+        with np.load(path) as data:
+            return ChunkStatsIndex.from_arrays(data)
+
+    def save_chunk_table(self, name, table):
+        """
+        Saves a per-chunk value table {(x, y, level): number} to <name>.npz
+        (e.g. erosion progress). Written atomically.
+        """
+        keys = np.array(list(table.keys()), dtype=np.int64).reshape(-1, 3)
+        values = np.array(list(table.values()), dtype=np.float64)
+        path = os.path.join(self.save_dir, f"{name}.npz")
+        tmp_path = os.path.join(self.save_dir, f"{name}.tmp.npz")
+        np.savez(tmp_path, keys=keys, values=values)
+        os.replace(tmp_path, path)
+
+    def load_chunk_table(self, name):
+        """Returns the table saved by save_chunk_table(), or {} if there is none."""
+        path = os.path.join(self.save_dir, f"{name}.npz")
+        if not os.path.exists(path):
+            return {}
+        with np.load(path) as data:
+            return {tuple(int(v) for v in key): value
+                    for key, value in zip(data['keys'], data['values'].tolist())}
+
+    def save_snapshot(self, seed, camera, chunks, game_hours=None):
+        """
+        Writes the resident working set into ONE file (session.snap):
+        chunk keys and flags in a JSON header, all layer arrays in one
+        contiguous blob (chunk i = blob[i], shape (64, 64, 8) Float32).
+        Written to a temp file first so a crash never leaves half a snapshot.
+        """
+        header = {
+            "version": 1,
+            "seed": seed,
+            "camera_x": camera.pos[0],
+            "camera_y": camera.pos[1],
+            "zoom": camera.zoom,
+            "game_hours": game_hours,
+            "shape": [len(chunks), config.CHUNK_SIZE, config.CHUNK_SIZE, 8],
+            "keys": [[c.x, c.y, c.level] for c in chunks],
+            "dirty": [bool(c.is_dirty) for c in chunks],
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+        prefix = len(SNAPSHOT_MAGIC) + 8 + len(header_bytes)
+        padding = -prefix % SNAPSHOT_ALIGN
+        
+        path = os.path.join(self.save_dir, "session.snap")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(struct.pack('<Q', len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b"\0" * padding)
+            for chunk in chunks:
+                f.write(np.ascontiguousarray(chunk.height_map, dtype=np.float32).tobytes())
+        os.replace(tmp_path, path)
+
+    def load_snapshot(self):
+        """
+        Maps session.snap without reading it.
+        Returns (header dict, read-only np.memmap of shape (N, 64, 64, 8)),
+        or None if there is no valid snapshot.
+        """
+        path = os.path.join(self.save_dir, "session.snap")
+        if not os.path.exists(path):
+            return None
+        
+        with open(path, 'rb') as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                print("Snapshot ignored: unknown format.")
+                return None
+            (header_len,) = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_len).decode("utf-8"))
+        
+        prefix = len(SNAPSHOT_MAGIC) + 8 + header_len
+        offset = prefix + (-prefix % SNAPSHOT_ALIGN)
+        shape = tuple(header["shape"])
+        if shape[0] == 0:
+            return header, np.zeros(shape, dtype=np.float32)
+        blob = np.memmap(path, dtype=np.float32, mode='r', offset=offset, shape=shape)
+        return header, blob
@@ -0,0 +1,179 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+from config import SIM_RATE
+
+# Simulation / render split.
+# SimulationThread owns every system that reads or writes chunk data (time,
+# orbits, LOD selection, chunk streaming, erosion, catch-up, weather and the
+# CPU side of texture uploads) and publishes one immutable FrameState per step
+# into a FrameBuffer. The render thread (the main thread: pygame and the GL
+# context must stay there) only takes the newest FrameState and issues GL calls.
+# NumPy, noise, file I/O and the GPU driver release the GIL, so a slow
+# simulation step no longer stalls drawing and vice versa.
+
+# Orbital values the ChunkRenderer reads (same attribute names as Celestials)
+SkyState = namedtuple('SkyState', ['solar_declination', 'greenwich_hour_angle',
+                                   'lunar_declination', 'lunar_gha', 'moon_phase_intensity'])
+
+# Everything the render thread needs for one frame.
+# visible_nodes: QuadtreeNodes (fresh objects every quadtree.update(), never mutated)
+# uploads:       TextureStager jobs (encoded bytes, no reference to chunk buffers)
+# calendar:      (year, day_of_year, time_of_day) for the window title
+FrameState = namedtuple('FrameState', ['frame', 'visible_nodes', 'visible_keys', 'sky',
+                                       'calendar', 'uploads', 'sim_ms'])
+
+
+class FrameBuffer:
+    """
+    Double buffer between the two threads. The simulation builds the next
+    frame on its side and swaps it in with publish(); the renderer takes the
+    newest one with take() and keeps drawing it until another arrives.
+    A frame that is replaced before it was taken hands its upload jobs on to
+    its successor: state can be skipped, texture writes cannot.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.front = None    # Newest published frame, not taken yet
+        self.rejected = []   # Keys the renderer found no texture layer for
+        self.published = 0
+        self.skipped = 0     # Frames replaced before the renderer saw them
+
+    def publish(self, state):
+        with self.lock:
+            if self.front is not None:
+                state = state._replace(uploads=self.front.uploads + state.uploads)
+                self.skipped += 1
+            self.front = state
+            self.published += 1
+
+    def take(self):
+        """The newest frame since the last call, or None."""
+        with self.lock:
+            state, self.front = self.front, None
+        return state
+
+    def reject(self, keys):
+        """Render side: upload jobs that could not be applied (see TextureManager.apply)."""
+        if keys:
+            with self.lock:
+                self.rejected.extend(keys)
+
+    def take_rejected(self):
+        with self.lock:
+            keys, self.rejected = self.rejected, []
+        return keys
+
+
+class SimulationThread(threading.Thread):
+    def __init__(self, chronos, celestials, quadtree, data_manager, weather, erosion, catch_up,
+                 stager, frame_buffer, rate=SIM_RATE):
+        super().__init__(name="simulation", daemon=True)
+        self.chronos = chronos
+        self.celestials = celestials
+        self.quadtree = quadtree
+        self.data_manager = data_manager
+        self.weather = weather
+        self.erosion = erosion
+        self.catch_up = catch_up
+        self.stager = stager  # TextureManager.stager (CPU half of the texture pool)
+        self.frame_buffer = frame_buffer
+
+        # Steps per second (the renderer runs at its own pace)
+        self.rate = rate
+        self.frame = 0
+
+        # Input from the render thread
+        self.view = ((0.0, 0.0), 1.0)  # Latest (camera pos, zoom), replaced as a whole
+        self.commands = queue.Queue()  # Callables run on this thread between steps (save, skip, reload)
+
+        self.stop_event = threading.Event()
+        self.error = None  # Exception that ended the thread (re-raised by the renderer)
+
+    def set_view(self, pos, zoom):
+        """Render thread: camera the next step selects chunks for."""
+        self.view = (tuple(pos), zoom)
+
+    def submit(self, command):
+        """Render thread: runs command() on the simulation thread before the next step."""
+        self.commands.put(command)
+
+    def stop(self):
+        """Finishes the current step and ends the thread. Chunk data is then safe to touch again."""
+        self.stop_event.set()
+        if self.is_alive():
+            self.join()
+
+    def run(self):
+        period = 1.0 / self.rate
+        last = time.perf_counter()
+        try:
+            while not self.stop_event.is_set():
+                start = time.perf_counter()
+                self.step(start - last)
+                last = start
+
+                # Sleep off the rest of the tick (the renderer gets the GIL meanwhile)
+                remaining = period - (time.perf_counter() - start)
+                if remaining > 0:
+                    self.stop_event.wait(remaining)
+        except Exception as e:
+            self.error = e
+
+    def step(self, dt):
+        """
+        One simulation step, then publishes its FrameState.
+        Also called directly by main.py when SIM_THREAD is off.
+        """
+        start = time.perf_counter()
+
+        # 0. Commands from the render thread
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            command()
+
+        cam_pos, zoom = self.view
+
+        # 1. Time and Orbits
+        self.chronos.update(dt)
+        self.celestials.update()
+
+        # 2. LOD selection
+        self.quadtree.update(cam_pos, zoom)
+        visible_nodes = self.quadtree.visible_nodes
+
+        # 3. Terrain edits: erode a little, push edits up to the coarser levels
+        self.erosion.update()
+        self.data_manager.flush_edits()
+
+        # 4. Chunk management: refined previews in, chunks out of view out of RAM
+        self.data_manager.poll_refinements()
+        self.data_manager.prune(visible_nodes)
+
+        # 5. Evolving layers: catch-up of outdated chunks, live weather on the view
+        self.catch_up.update()
+        self.weather.update_lod(visible_nodes, self.data_manager, dt)
+
+        # 6. Texture staging (loads new visible chunks, encodes uploads)
+        self.stager.reject(self.frame_buffer.take_rejected())
+        uploads = self.stager.collect(visible_nodes, self.data_manager)
+
+        # 7. Publish
+        celestials = self.celestials
+        sky = SkyState(celestials.solar_declination, celestials.greenwich_hour_angle,
+                       celestials.lunar_declination, celestials.lunar_gha,
+                       celestials.moon_phase_intensity)
+        self.frame += 1
+        self.frame_buffer.publish(FrameState(
+            frame=self.frame,
+            visible_nodes=tuple(visible_nodes),
+            visible_keys=frozenset((n.x, n.y, n.level) for n in visible_nodes),
+            sky=sky,
+            calendar=(self.chronos.year, self.chronos.day_of_year, self.chronos.time_of_day),
+            uploads=tuple(uploads),
+            sim_ms=(time.perf_counter() - start) * 1000.0,
+        ))
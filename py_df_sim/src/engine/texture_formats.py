@@ -0,0 +1,73 @@
+import numpy as np
+
+# Storage formats for the chunk texture arrays (CPU side, no GL needed).
+# Names are the ModernGL dtype strings, so they go straight into ctx.texture_array().
+#   'f4'  Float32          16 bytes per RGBA texel (exact)
+#   'f2'  Float16           8 bytes (~3 significant digits, keeps values outside 0-1)
+#   'nu2' normalized 16 bit 8 bytes (step 1/65535, clamped to 0-1)
+#   'nu1' normalized 8 bit  4 bytes (step 1/255, clamped to 0-1)
+# Normalized formats are sampled as floats in 0-1, so the shader does not change.
+
+# Format -> (NumPy storage dtype, scale of 1.0 for normalized formats, None for floats)
+FORMATS = {
+    'f4':  (np.float32, None),
+    'f2':  (np.float16, None),
+    'nu2': (np.uint16, 65535.0),
+    'nu1': (np.uint8, 255.0),
+}
+
+
+def texel_bytes(fmt, components=4):
+    return np.dtype(FORMATS[fmt][0]).itemsize * components
+
+
+def encode(values, fmt):
+    """
+    Converts Float32 chunk layers (any shape) to the storage dtype of 'fmt'.
+    The result is a new contiguous array, ready for tobytes().
+    """
+    dtype, scale = FORMATS[fmt]
+    if scale is None:
+        return np.ascontiguousarray(values, dtype=dtype)
+
+    # Round to nearest; clamp first, the GPU would saturate anyway
+    scaled = np.clip(values, 0.0, 1.0) * np.float32(scale)
+    scaled += np.float32(0.5)
+    return scaled.astype(dtype)
+
+
+def decode(stored, fmt):
+    """What the shader samples from an encoded array (as Float32)."""
+    scale = FORMATS[fmt][1]
+    if scale is None:
+        return stored.astype(np.float32)
+    return stored.astype(np.float32) / np.float32(scale)
+
+
+def precision_report(samples, formats, groups=((0, 4), (4, 8))):
+    """
+    Round-trip error of every chunk layer under the chosen formats.
+    samples: (..., 8) Float32 layers, e.g. a stack of chunks.
+    formats: one format per texture group (terrain, atmos).
+    Returns {layer: (format, max_abs_error, rms_error, clipped_fraction)}.
+    """
+    report = {}
+    for fmt, (start, stop) in zip(formats, groups):
+        values = samples[..., start:stop].astype(np.float32)
+        error = decode(encode(values, fmt), fmt) - values
+
+        scale = FORMATS[fmt][1]
+        if scale is None:
+            clipped = np.zeros(values.shape, dtype=bool)
+        else:
+            clipped = (values < 0.0) | (values > 1.0)
+
+        for i in range(stop - start):
+            e = error[..., i]
+            report[start + i] = (
+                fmt,
+                float(np.abs(e).max()),
+                float(np.sqrt(np.mean(e.astype(np.float64) ** 2))),
+                float(clipped[..., i].mean()),
+            )
+    return report
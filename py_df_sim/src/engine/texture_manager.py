@@ -1,79 +1,138 @@
 import moderngl
-from config import CHUNK_SIZE
+import numpy as np
+from config import CHUNK_SIZE, TEXTURE_FORMATS, TEXTURE_VRAM_BUDGET_MB, TEXTURE_MAX_LAYERS, BAKE_TERRAIN_LIGHTING
+from engine import texture_formats
+from engine.texture_staging import TextureStager
 
 class TextureManager:
-    def __init__(self, ctx, pool_size=64):
+    def __init__(self, ctx, pool_size=None, formats=None, baked_lighting=BAKE_TERRAIN_LIGHTING):
         self.ctx = ctx
+        self.baked_lighting = baked_lighting
+        
+        # 0. Storage formats (terrain, atmos, 2x lighting) and pool size
+        formats = formats or TEXTURE_FORMATS
+        self.formats = (formats['terrain'], formats['atmos'])
+        if baked_lighting:
+            self.formats += (formats['lighting'], formats['lighting'])
+        self.slot_bytes = sum(texture_formats.texel_bytes(f) for f in self.formats) * CHUNK_SIZE * CHUNK_SIZE
+        if pool_size is None:
+            # As many slots as fit the VRAM budget (smaller formats -> more chunks)
+            pool_size = min(TEXTURE_VRAM_BUDGET_MB * 1024 * 1024 // self.slot_bytes, TEXTURE_MAX_LAYERS)
         self.pool_size = pool_size
         
         # 1. Texture Array 0: TERRAIN (RGBA)
-        self.terrain_array = ctx.texture_array((pool_size, CHUNK_SIZE, CHUNK_SIZE), 4, dtype='f4')
+        self.terrain_array = ctx.texture_array((pool_size, CHUNK_SIZE, CHUNK_SIZE), 4, dtype=self.formats[0])
         self.terrain_array.filter = (moderngl.NEAREST, moderngl.NEAREST)
         
         # 2. Texture Array 1: ATMOSPHERE (RGBA)
-        self.atmos_array = ctx.texture_array((pool_size, CHUNK_SIZE, CHUNK_SIZE), 4, dtype='f4')
+        self.atmos_array = ctx.texture_array((pool_size, CHUNK_SIZE, CHUNK_SIZE), 4, dtype=self.formats[1])
         # Linear filter for clouds makes them look softer
         self.atmos_array.filter = (moderngl.LINEAR, moderngl.LINEAR) 
+        
+        # 3. Texture Arrays 2 + 3: BAKED LIGHTING (normal xy + 6 horizon angles)
+        self.lighting_arrays = ()
+        if baked_lighting:
+            self.lighting_arrays = tuple(
+                ctx.texture_array((pool_size, CHUNK_SIZE, CHUNK_SIZE), 4, dtype=self.formats[2 + i])
+                for i in range(2))
+            for array in self.lighting_arrays:
+                array.filter = (moderngl.NEAREST, moderngl.NEAREST)
+
+        # All arrays in TextureStager order (terrain, atmos, lighting)
+        self.arrays = (self.terrain_array, self.atmos_array) + self.lighting_arrays
 
         self.available_indices = list(range(pool_size))
         self.node_to_texture_id = {}
+        
+        # CPU side: decides what to upload and encodes it (no GL, thread-safe to move)
+        self.stager = TextureStager(pool_size, self.formats, baked_lighting)
+        
+        print(f"Texture pool: {pool_size} slots, {'/'.join(self.formats)}, "
+              f"{self.slot_bytes // 1024} KB per chunk")
 
-    def update(self, visible_nodes, data_manager, generator): 
-        # A. Identify needed keys
+    def update(self, visible_nodes, data_manager, generator):
+        """
+        Single-threaded path: stages this frame's uploads and writes them.
+        (The threaded loop runs self.stager.collect() on the simulation thread
+        and only apply() here, see engine/sim_thread.py.)
+        """
+        jobs = self.stager.collect(visible_nodes, data_manager)
         needed_keys = set((n.x, n.y, n.level) for n in visible_nodes)
-            
-        # B. Garbage Collection
+        self.stager.reject(self.apply(needed_keys, jobs))
+
+    def apply(self, visible_keys, jobs):
+        """
+        GL half of update(): frees the layers of keys out of view, then writes
+        the staged upload jobs (see TextureStager). Jobs of keys that are no
+        longer visible are dropped. Returns the keys that found no free layer.
+        """
+        # A. Garbage Collection
         for key in list(self.node_to_texture_id.keys()):
-            if key not in needed_keys:
+            if key not in visible_keys:
                 tex_id = self.node_to_texture_id[key]
                 del self.node_to_texture_id[key]
                 self.available_indices.append(tex_id)
 
-        # C. Loading
-        for node in visible_nodes:
-            key = (node.x, node.y, node.level)
-            
-            if key not in self.node_to_texture_id:
+        # B. Writes
+        rejected = []
+        for key, full, writes in jobs:
+            if key not in visible_keys:
+                continue
+            tex_id = self.node_to_texture_id.get(key)
+            if tex_id is None:
+                if not full:
+                    continue  # Never got a layer: its full upload is staged again
                 if not self.available_indices:
+                    rejected.append(key)
                     continue
-                
                 tex_id = self.available_indices.pop()
                 self.node_to_texture_id[key] = tex_id
-                
-                # 1. Get Data (8 Layers)
-                chunk_data = data_manager.get_chunk(node.x, node.y, node.level)
-                full_data = chunk_data.height_map 
-                
-                # 2. Split Data
-                # Layers 0-3 -> Terrain
-                terrain_bytes = full_data[:, :, 0:4].tobytes()
-                
-                # Layers 4-7 -> Atmos
-                atmos_bytes = full_data[:, :, 4:8].tobytes()
-                
-                # 3. Write to Specific Layer in Texture Array
-                # viewport defines which layer of the array we write to: (x, y, width, height, layer_index)
-                # Ideally, texture_array.write handles 3D data, but for specific layers in an array, 
-                # ModernGL requires passing the data for that specific slice.
-                
-                # NOTE: texture_array.write expects data for the WHOLE array or a viewport.
-                # To write to a single layer Z, we calculate offsets.
-                # Actually, simpler method in ModernGL for TextureArrays:
-                # We can't easily write to just one layer index using standard .write without complex viewports.
-                # BUT, since we built a texture_array, we treat it like a 3D texture.
-                
-                # Correction: The easiest way to manage this pool is actually unrelated to TextureArrays
-                # if we want to write individually easily. 
-                # HOWEVER, to keep your Quadtree logic fast, TextureArrays are best.
-                
-                # Let's use the specific write command for a layer:
-                self.terrain_array.write(terrain_bytes, viewport=(0, 0, tex_id, CHUNK_SIZE, CHUNK_SIZE, 1))
-                self.atmos_array.write(atmos_bytes, viewport=(0, 0, tex_id, CHUNK_SIZE, CHUNK_SIZE, 1))
 
-    def bind_textures(self, location_terrain=0, location_atmos=1):
-        """Binds the entire arrays to the shader units"""
+            # viewport: (x, y, layer, width, height, depth) of the layer we write to
+            for array, x, y, w, h, data in writes:
+                self.arrays[array].write(data, viewport=(x, y, tex_id, w, h, 1))
+        return rejected
+
+    def upload_bulk(self, chunks):
+        """
+        Uploads many chunks at once (e.g. a restored session snapshot).
+        Chunks get consecutive texture layers where possible, so each run of
+        layers is ONE write per array instead of one per chunk.
+        """
+        chunks = [c for c in chunks if (c.x, c.y, c.level) not in self.node_to_texture_id]
+        chunks = chunks[:len(self.available_indices)]
+        if not chunks:
+            return
+        
+        # Lowest free layers first (a fresh pool gives one contiguous run)
+        free = sorted(self.available_indices)
+        tex_ids = free[:len(chunks)]
+        self.available_indices = free[len(chunks):]
+        
+        for chunk, tex_id in zip(chunks, tex_ids):
+            self.node_to_texture_id[(chunk.x, chunk.y, chunk.level)] = tex_id
+            self.stager.uploaded.add((chunk.x, chunk.y, chunk.level))
+            chunk.take_dirty_rects()  # Fresh upload covers pending edits
+        
+        # Split into runs of consecutive layers
+        start = 0
+        for i in range(1, len(chunks) + 1):
+            if i == len(chunks) or tex_ids[i] != tex_ids[i - 1] + 1:
+                run = chunks[start:i]
+                stacked = np.stack([c.get_display_layers(0, 8) for c in run])
+                groups = [self.stager.stage(0, stacked[..., 0:4]), self.stager.stage(1, stacked[..., 4:8])]
+                groups += self.stager.stage_lighting(run)
+                viewport = (0, 0, tex_ids[start], CHUNK_SIZE, CHUNK_SIZE, len(run))
+                for array, data in zip(self.arrays, groups):
+                    array.write(data, viewport=viewport)
+                start = i
+
+    def bind_textures(self, location_terrain=0, location_atmos=1, location_lighting=2):
+        """Binds the entire arrays to the shader units (lighting: location_lighting and +1)"""
         self.terrain_array.use(location=location_terrain)
         self.atmos_array.use(location=location_atmos)
+        for i, array in enumerate(self.lighting_arrays):
+            array.use(location=location_lighting + i)
 
     def get_texture_id(self, node):
         """Returns the Z-index (layer) in the array for this node"""
@@ -0,0 +1,116 @@
+import numpy as np
+from config import CHUNK_SIZE
+from engine import texture_formats
+
+# CPU half of the texture pool: no GL calls, so it can run on the simulation
+# thread. Decides which visible chunks need a first upload or a partial
+# re-upload and encodes their layers into upload bytes; TextureManager.apply()
+# on the render thread only writes those bytes into the arrays.
+#
+# An upload job is (key, full, writes):
+#   full:   True = first upload (the chunk needs a pool slot), False = update in place
+#   writes: tuple of (array, x, y, width, height, data), array 0: terrain,
+#           1: atmos, 2/3: baked lighting (see TextureManager.arrays)
+
+
+class TextureStager:
+    def __init__(self, pool_size, formats, baked_lighting):
+        self.pool_size = pool_size
+        self.formats = formats  # Storage format per array (see TextureManager)
+        self.baked_lighting = baked_lighting
+
+        # Keys that hold (or were just given) a pool slot.
+        # Mirror of TextureManager.node_to_texture_id, kept in sync by
+        # dropping keys that leave the view and keys apply() rejected.
+        self.uploaded = set()
+
+    def stage(self, group, values):
+        """
+        Converts Float32 layers of texture group 0 (terrain), 1 (atmos)
+        or 2/3 (baked lighting) to upload bytes.
+        """
+        return texture_formats.encode(values, self.formats[group]).tobytes()
+
+    def stage_lighting(self, chunks):
+        """Upload bytes of both lighting arrays for consecutive chunks (baked or reused)."""
+        if not self.baked_lighting:
+            return ()
+        stacked = np.stack([c.lighting_maps() for c in chunks])
+        for c in chunks:
+            c.uploaded_lighting_key = c.lighting_key
+        return tuple(self.stage(2 + i, stacked[..., i * 4:i * 4 + 4]) for i in range(2))
+
+    def collect(self, visible_nodes, data_manager):
+        """
+        Makes the visible chunks resident and returns this frame's upload jobs:
+        new nodes get a full upload while the pool has room, resident ones
+        with pending edits get their dirty rectangles.
+        """
+        # A. Nodes out of view lose their slot (TextureManager.apply frees it too)
+        needed_keys = set((n.x, n.y, n.level) for n in visible_nodes)
+        self.uploaded &= needed_keys
+
+        # B. Generate previews for every new node in one batch before staging
+        new_keys = [(n.x, n.y, n.level) for n in visible_nodes
+                    if (n.x, n.y, n.level) not in self.uploaded]
+        data_manager.prefetch_previews(new_keys[:self.pool_size - len(self.uploaded)])
+
+        jobs = []
+        for node in visible_nodes:
+            key = (node.x, node.y, node.level)
+
+            if key not in self.uploaded:
+                if len(self.uploaded) >= self.pool_size:
+                    continue
+                self.uploaded.add(key)
+
+                # 1. Get Data (8 Layers)
+                # (New chunks arrive as coarse previews; refined ones are re-uploaded below)
+                chunk_data = data_manager.get_chunk(node.x, node.y, node.level, preview=True)
+
+                # 2. Split Data (each group is requested separately,
+                #    so lazy chunks only generate what is uploaded)
+                #    Layers 0-3 -> Terrain, Layers 4-7 -> Atmos, baked lighting
+                groups = [self.stage(0, chunk_data.get_display_layers(0, 4)),
+                          self.stage(1, chunk_data.get_display_layers(4, 8))]
+                groups += self.stage_lighting([chunk_data])
+                writes = tuple((array, 0, 0, CHUNK_SIZE, CHUNK_SIZE, data)
+                               for array, data in enumerate(groups))
+
+                # Fresh upload covers any pending edits
+                chunk_data.take_dirty_rects()
+                jobs.append((key, True, writes))
+
+            else:
+                # C. Incremental updates of chunks already on the GPU
+                chunk_data = data_manager.loaded_chunks.get(key)
+                if chunk_data is not None and chunk_data.needs_texture_update:
+                    jobs.append((key, False, self.stage_dirty_rects(chunk_data)))
+        return jobs
+
+    def stage_dirty_rects(self, chunk_data):
+        """
+        Writes for only the changed sub-rectangles of an edited chunk.
+        A brush stroke or a weather write-back touches one texture group,
+        so the other array is not re-uploaded at all.
+        """
+        writes = []
+        for group, rects in enumerate(chunk_data.take_dirty_rects()):
+            if not rects:
+                continue
+            group_data = chunk_data.get_display_layers(group * 4, group * 4 + 4)
+            for x0, y0, x1, y1 in rects:
+                # Slices are strided views: staging copies them into a contiguous block
+                region = self.stage(group, group_data[y0:y1, x0:x1])
+                writes.append((group, x0, y0, x1 - x0, y1 - y0, region))
+
+            if group == 0 and chunk_data.uploaded_lighting_key != chunk_data.lighting_version:
+                # Height edits move shadows up to SHADOW_STEPS texels away: re-bake the chunk
+                # (edits of Layers 1-3 only keep the uploaded lighting)
+                for i, data in enumerate(self.stage_lighting([chunk_data])):
+                    writes.append((2 + i, 0, 0, CHUNK_SIZE, CHUNK_SIZE, data))
+        return tuple(writes)
+
+    def reject(self, keys):
+        """Keys TextureManager.apply() found no slot for: staged again while visible."""
+        self.uploaded.difference_update(keys)
@@ -0,0 +1,80 @@
+import numpy as np
+from config import TERRAIN_HEIGHT_SCALE
+from simulation import biomes
+from simulation.terrain_lighting import surface_normals
+
+# CPU (NumPy) version of the colouring in assets/shaders/chunk.glsl.
+# Used for static map exports, so there is no day/night cycle: the terrain is
+# lit by one fixed sun (classic hillshade) instead of Celestials.
+
+# Same value as u_HeightScale in ChunkRenderer
+HEIGHT_SCALE = TERRAIN_HEIGHT_SCALE
+
+# Land colours per biome id (shader "Base Color" block)
+BIOME_COLORS = np.zeros((biomes.BIOME_COUNT, 3), dtype=np.float32)
+BIOME_COLORS[biomes.SNOW] = (0.95, 0.95, 1.0)
+BIOME_COLORS[biomes.DESERT] = (0.85, 0.75, 0.5)
+BIOME_COLORS[biomes.JUNGLE] = (0.05, 0.25, 0.05)
+BIOME_COLORS[biomes.SAVANNAH] = (0.5, 0.6, 0.2)
+BIOME_COLORS[biomes.FOREST] = (0.1, 0.5, 0.1)
+
+DEEP_WATER = np.array([0.01, 0.05, 0.2], dtype=np.float32)
+SHALLOW_WATER = np.array([0.0, 0.3, 0.6], dtype=np.float32)
+CLOUD_COLOR = np.float32(0.9)
+
+# Lighting (shader: ambient + noon sun colour)
+AMBIENT = np.array([0.02, 0.02, 0.04], dtype=np.float32)
+SUN_COLOR = np.array([1.0, 0.98, 0.90], dtype=np.float32)
+
+
+def light_direction(azimuth=315.0, altitude=45.0):
+    """
+    Unit vector towards the sun. azimuth in degrees clockwise from north (+y),
+    altitude in degrees above the horizon. Default: the usual north-west hillshade.
+    """
+    az, alt = np.radians(azimuth), np.radians(altitude)
+    return np.array([np.sin(az) * np.cos(alt), np.cos(az) * np.cos(alt), np.sin(alt)], dtype=np.float32)
+
+
+def base_color(layers, clouds=True):
+    """Unlit colour (H, W, 3) from chunk layers 0-2 (+7 for clouds)."""
+    h = layers[..., 0]
+    ids = biomes.classify(layers)
+
+    # Land: biome colour tinted by elevation
+    elev = (h - 0.5) * 2.0
+    color = BIOME_COLORS[ids] * (0.8 + 0.2 * elev)[..., None]
+
+    # Water: gradient, deep water darker
+    water = ids == biomes.OCEAN
+    depth = (h[water] * 2.0)[:, None]
+    color[water] = DEEP_WATER + (SHALLOW_WATER - DEEP_WATER) * depth
+
+    # Weather overlay (clouds)
+    if clouds:
+        a_hum = layers[..., 7]
+        density = np.where(a_hum > 0.6, (a_hum - 0.6) * 2.5 * 0.8, 0.0)[..., None]
+        color = color + (CLOUD_COLOR - color) * density
+
+    return color
+
+
+def shade(layers, light=None, clouds=True, height_scale=HEIGHT_SCALE):
+    """
+    Lit colour of a chunk (or any (H, W, 8) layer mosaic) as float RGB.
+    """
+    if light is None:
+        light = light_direction()
+    color = base_color(layers, clouds)
+    diffuse = np.maximum(0.0, surface_normals(layers[..., 0], height_scale) @ light)
+    total_light = AMBIENT + SUN_COLOR * diffuse[..., None]
+    return color * total_light
+
+
+def rasterize(layers, light=None, clouds=True, height_scale=HEIGHT_SCALE):
+    """
+    Image of the layers as (H, W, 3) uint8, north up:
+    image row 0 is the highest y (data row H-1), like the on-screen view.
+    """
+    rgb = shade(layers, light, clouds, height_scale)
+    return (np.clip(rgb[::-1], 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
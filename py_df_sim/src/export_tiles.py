@@ -0,0 +1,115 @@
+"""
+Headless map export: renders a region into a z/x/y PNG tile pyramid on the CPU.
+
+One tile = one Quadtree chunk: z = level, x = chunk x, y = chunk y
+(TMS order, y grows northwards). Chunks already saved on disk are read from
+the save, only missing ones are generated. Tiles that already exist are
+skipped, so an interrupted export resumes where it stopped.
+
+Usage:
+    python py_df_sim/src/export_tiles.py --levels 0 1 2 3 --region 0 0 1 1 --out tiles
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine.save_manager import SaveManager, SAVE_DIR
+from engine.tile_rasterizer import rasterize, light_direction
+from simulation.generator import TerrainGenerator
+from utils.png import write_png
+
+# --- WORKER STATE ---
+# Built once per process by _init_worker, reused by every job
+_save_manager = None
+_generator = None
+_options = None
+
+
+def _init_worker(save_dir, seed, options):
+    global _save_manager, _generator, _options
+    _save_manager = SaveManager(save_dir=save_dir)
+    _generator = TerrainGenerator(seed=seed)
+    _options = options
+
+
+def tile_path(out_dir, x, y, level):
+    return os.path.join(out_dir, str(level), str(x), f"{y}.png")
+
+
+def _render_tiles(keys):
+    """Process-pool job: renders a batch of (x, y, level) tiles. Returns how many were written."""
+    light = light_direction(_options['azimuth'], _options['altitude'])
+    written = 0
+    for x, y, level in keys:
+        path = tile_path(_options['out'], x, y, level)
+        if os.path.exists(path):
+            continue  # Finished by an earlier (interrupted) run
+
+        # Disk first, generate only what was never saved
+        layers = _save_manager.load_chunk_data(x, y, level)
+        if layers is None:
+            layers = _generator.generate_chunk_data(x, y, level)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_png(path, rasterize(layers, light, clouds=_options['clouds']))
+        written += 1
+    return written
+
+
+def region_keys(level, x0, y0, x1, y1):
+    """Every chunk key of 'level' touching the world rectangle [x0, x1) x [y0, y1)."""
+    n = 2 ** level
+    cx0, cy0 = int(x0 * n // 1), int(y0 * n // 1)
+    cx1, cy1 = int(-(-x1 * n // 1)), int(-(-y1 * n // 1))
+    return [(cx, cy, level) for cy in range(cy0, cy1) for cx in range(cx0, cx1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--region", type=float, nargs=4, default=[0.0, 0.0, 1.0, 1.0],
+                        metavar=("X0", "Y0", "X1", "Y1"), help="World rectangle to export")
+    parser.add_argument("--out", default="tiles")
+    parser.add_argument("--save-dir", default=SAVE_DIR, help="Save to read existing chunks from")
+    parser.add_argument("--seed", type=int, default=None, help="Default: seed of the save, else 12345")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch", type=int, default=16, help="Tiles per pool job")
+    parser.add_argument("--azimuth", type=float, default=315.0)
+    parser.add_argument("--altitude", type=float, default=45.0)
+    parser.add_argument("--no-clouds", action="store_true")
+    args = parser.parse_args()
+
+    seed = args.seed
+    if seed is None:
+        state = SaveManager(save_dir=args.save_dir).load_global_state()
+        seed = state['seed'] if state else 12345
+
+    keys = []
+    for level in args.levels:
+        keys += region_keys(level, *args.region)
+    todo = [k for k in keys if not os.path.exists(tile_path(args.out, *k))]
+    print(f"{len(keys)} tiles in region, {len(keys) - len(todo)} already exported, {len(todo)} to render.")
+
+    options = {
+        'out': args.out,
+        'azimuth': args.azimuth,
+        'altitude': args.altitude,
+        'clouds': not args.no_clouds,
+    }
+    batches = [todo[i:i + args.batch] for i in range(0, len(todo), args.batch)]
+
+    start = time.perf_counter()
+    written = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.save_dir, seed, options)) as pool:
+        for count in pool.map(_render_tiles, batches):
+            written += count
+            print(f"\r{written}/{len(todo)} tiles", end="", flush=True)
+
+    elapsed = time.perf_counter() - start
+    print(f"\nDone: {written} tiles in {elapsed:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,15 @@ from engine.chunk_renderer import ChunkRenderer
 from engine.line_renderer import LineRenderer
 from engine.texture_manager import TextureManager
 from engine.save_manager import SaveManager
+from engine.sim_thread import FrameBuffer, SimulationThread
 
 # Simulation Systems
 from simulation.quadtree import QuadtreeManager
 from simulation.generator import TerrainGenerator
 from simulation.data_manager import DataManager
+from simulation.erosion import ErosionSimulator
+from simulation.weather import WeatherSimulator
+from simulation.catch_up import CatchUpSimulator
 
 # Step 2 & 3: Time and Orbit Systems
 from simulation.chronos import Chronos 
@@ -38,14 +42,23 @@ def main():
     seed = 12345
     start_pos = (0, 0)
     start_zoom = 1.0
+    game_hours = None
     
     if saved_state:
         print(">>> Save file found! Resuming world...")
         seed = saved_state['seed']
         start_pos = (saved_state['camera_x'], saved_state['camera_y'])
         start_zoom = saved_state['zoom']
+        game_hours = saved_state.get('game_hours')
     else:
         print(">>> No save found. Creating new world.")
+    
+    # Session snapshot (written on exit and F5): resume exactly where we left off
+    snapshot = save_manager.load_snapshot()
+    if snapshot and snapshot[0].get("seed") == seed:
+        start_pos = (snapshot[0]['camera_x'], snapshot[0]['camera_y'])
+        start_zoom = snapshot[0]['zoom']
+        game_hours = snapshot[0].get('game_hours', game_hours)
 
     # 3. Instantiate Systems
     
@@ -63,8 +76,20 @@ def main():
     # DataManager: The "Memory" (RAM + Disk Cache)
     data_manager = DataManager(generator, save_manager)
     
+    # Erosion: carves valleys into resident chunks, a few steps per frame
+    erosion = ErosionSimulator(data_manager)
+    erosion.load(save_manager)
+    
     # TextureManager: The "Gallery" (VRAM Management)
-    texture_manager = TextureManager(ctx, pool_size=64)
+    # (pool size follows TEXTURE_VRAM_BUDGET_MB and TEXTURE_FORMATS)
+    texture_manager = TextureManager(ctx)
+    
+    # Warm start: map last session's resident chunks and fill RAM + VRAM in bulk
+    if snapshot:
+        restored = data_manager.restore_snapshot(*snapshot)
+        texture_manager.upload_bulk(restored)
+        print(f">>> Warm start: {len(restored)} chunks restored from snapshot.")
+        del snapshot  # Release the file mapping
     
     # Renderers: The "Painters"
     chunk_renderer = ChunkRenderer(ctx)
@@ -73,18 +98,67 @@ def main():
     # --- SIMULATION CORE ---
     # Step 2: Initialize Chronos (The Clock)
     chronos = Chronos()
+    if game_hours is not None:
+        # Resume the saved clock (calendar rollovers are recomputed)
+        chronos.advance_hours(game_hours - chronos.total_game_hours)
     
     # Step 3: Initialize Celestials (The Orbits)
     # This takes chronos as a dependency to calculate sun/moon position
     celestials = Celestials(chronos)
     
+    # Systems that must be fast-forwarded when time is skipped
+    chronos.add_catch_up_hook(celestials.catch_up)
+    
+    # Weather: regional atmosphere on coarse chunks, upsampled into the view
+    weather = WeatherSimulator(config.CHUNK_SIZE * 2 ** config.WEATHER_LOD_LEVEL)
+    
+    # Catch-up: chunks only evolve while resident and jump to "now" when they return
+    catch_up = CatchUpSimulator(data_manager, chronos, weather)
+    catch_up.load(save_manager)
+    
+    # Simulation thread: runs every system above and publishes one frame per step
+    # (the main thread below only handles input and GL, see engine/sim_thread.py)
+    chronos.add_catch_up_hook(weather.catch_up)
+    frame_buffer = FrameBuffer()
+    sim = SimulationThread(chronos, celestials, quadtree, data_manager, weather, erosion, catch_up,
+                           texture_manager.stager, frame_buffer)
+    sim.set_view(camera.pos, camera.zoom)
+    
+    # --- Commands (run on the simulation thread, between two steps) ---
+    def save_game():
+        print("\n>>> SAVING GAME...")
+        # 1. Save Camera, Seed & Clock (camera is only read: two floats)
+        save_manager.save_global_state(generator.seed, camera, chronos.total_game_hours)
+        # 2. Save all Modified/Loaded Chunks
+        data_manager.save_all_loaded_chunks()
+        erosion.save(save_manager)
+        catch_up.save(save_manager)
+        # 3. Snapshot the working set for a fast warm start
+        data_manager.save_snapshot(camera, chronos.total_game_hours)
+        print(">>> SAVE COMPLETE.\n")
+    
+    def skip_day():
+        chronos.skip(days=1)
+        print(f">>> SKIPPED 1 DAY. {chronos.get_info()}")
+    
+    def reload_world():
+        # Reload only the chunks that differ from the save
+        # (they keep their texture layer and are re-uploaded in place)
+        reloaded = data_manager.reload_changed()
+        # The clock keeps running: reloaded chunks catch up from their saved time
+        catch_up.reload()
+        print(f">>> RELOAD COMPLETE. {reloaded} chunks changed.\n")
+    
     # Loop Setup
     clock = pygame.time.Clock()
     running = True
+    frame = None  # Newest FrameState taken from the simulation (redrawn until replaced)
+    if config.SIM_THREAD:
+        sim.start()
     
     print("\n--- ENGINE STARTED ---")
     print("Controls: WASD or Drag to Pan | Scroll to Zoom")
-    print("F5: Quick Save | F9: Reload World")
+    print("F5: Quick Save | F9: Reload World | F6: Skip 1 Day")
     print("----------------------\n")
 
     while running:
@@ -104,13 +178,11 @@ def main():
             if event.type == pygame.KEYDOWN:
                 # SAVE
                 if event.key == pygame.K_F5:
-                    print("\n>>> SAVING GAME...")
-                    # 1. Save Camera & Seed
-                    save_manager.save_global_state(generator.seed, camera)
-                    # 2. Save all Modified/Loaded Chunks
-                    data_manager.save_all_loaded_chunks()
-                    # (Optional: Save chronos.time_of_day and chronos.day_of_year here later)
-                    print(">>> SAVE COMPLETE.\n")
+                    sim.submit(save_game)
+                
+                # TIME SKIP (Fast-forward one day in O(1))
+                elif event.key == pygame.K_F6:
+                    sim.submit(skip_day)
                 
                 # LOAD (Hot Reload)
                 elif event.key == pygame.K_F9:
@@ -118,75 +190,77 @@ def main():
                     saved_state = save_manager.load_global_state()
                     
                     if saved_state:
-                        # 1. Restore Camera
+                        # 1. Restore Camera (input side)
                         camera.pos = [saved_state['camera_x'], saved_state['camera_y']]
                         camera.zoom = saved_state['zoom']
-                        
-                        # 2. Flush RAM (Data Manager)
-                        data_manager.loaded_chunks.clear()
-                        
-                        # 3. Flush VRAM (Texture Manager)
-                        texture_manager.node_to_texture_id.clear()
-                        texture_manager.available_indices = list(range(texture_manager.pool_size))
-                        
-                        # (Optional: Reload chronos state here later)
-                        print(">>> RELOAD COMPLETE.\n")
+                        # 2. Chunks (simulation side)
+                        sim.submit(reload_world)
                     else:
                         print(">>> NO SAVE FOUND.\n")
 
             # Pass generic events to camera
             camera.handle_event(event)
         
-        # --- B. Simulation Updates ---
+        # --- B. Simulation ---
+        # Chunks are selected for the camera of this frame
+        sim.set_view(camera.pos, camera.zoom)
+        if not config.SIM_THREAD:
+            sim.step(dt)
+        elif sim.error is not None:
+            raise sim.error
         
-        # 1. Update Time (Step 2)
-        chronos.update(dt)
-
-        # 2. Update Orbits (Step 3)
-        # Calculates new Solar Declination and Hour Angle based on updated time
-        celestials.update()
-
-        # 3. Update Quadtree
-        quadtree.update(camera.pos, camera.zoom)
-
-        # Free up RAM for chunks we can't see anymore
-        data_manager.prune(quadtree.visible_nodes)
-
-        # 4. Update Textures
-        texture_manager.update(quadtree.visible_nodes, data_manager, generator)
+        # Newest published frame: write its texture uploads
+        published = frame_buffer.take()
+        if published is not None:
+            frame = published
+            frame_buffer.reject(texture_manager.apply(frame.visible_keys, frame.uploads))
         
         # --- C. Rendering ---
         
         # 1. Clear Screen (Dark Grey)
         ctx.clear(0.1, 0.1, 0.1)
         
-        # 2. Draw Terrain
-        # We now pass 'celestials' so the shader gets the computed angles (Declination, GHA)
-        chunk_renderer.render(
-            quadtree.visible_nodes, 
-            texture_manager, 
-            camera.pos, 
-            camera.zoom,
-            celestials 
-        )
-        
-        # 3. Draw Debug Grid
-        line_renderer.render(
-            quadtree.visible_nodes, 
-            camera.pos, 
-            camera.zoom
-        )
+        if frame is not None:
+            # 2. Draw Terrain
+            # Sun/Moon angles come from the frame (same fields as Celestials)
+            chunk_renderer.render(
+                frame.visible_nodes, 
+                texture_manager, 
+                camera.pos, 
+                camera.zoom,
+                frame.sky 
+            )
+            
+            # 3. Draw Debug Grid
+            line_renderer.render(
+                frame.visible_nodes, 
+                camera.pos, 
+                camera.zoom
+            )
         
         # 4. Refresh Display
         pygame.display.flip()
         
         # Window Title Status
-        pygame.display.set_caption(
-            f"FPS: {clock.get_fps():.1f} | "
-            f"Zoom: {camera.zoom:.2f} | "
-            f"Year: {chronos.year} Day: {chronos.day_of_year} Hour: {chronos.time_of_day:.1f}"
-        )
+        if frame is not None:
+            year, day, hour = frame.calendar
+            pygame.display.set_caption(
+                f"FPS: {clock.get_fps():.1f} | "
+                f"Sim: {frame.sim_ms:.1f} ms | "
+                f"Zoom: {camera.zoom:.2f} | "
+                f"Year: {year} Day: {day} Hour: {hour:.1f}"
+            )
 
+    # Let the simulation finish its step: chunk data is ours again
+    sim.stop()
+    
+    # Snapshot the working set so the next start is instant
+    data_manager.save_snapshot(camera, chronos.total_game_hours)
+    erosion.save(save_manager)  # The snapshot holds eroded chunks
+    catch_up.save(save_manager)
+    # The statistics index is persistent: keep the updates made since the last F5
+    save_manager.save_stats_index(data_manager.stats_index)
+    
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,49 @@
+import numpy as np
+
+# --- BIOME IDS ---
+# CPU port of the biome rules in assets/shaders/chunk.glsl (main, "Base Color").
+# Keep both in sync: the shader decides what the player sees,
+# this module answers "what biome is here" for gameplay and analytics.
+OCEAN = 0
+SNOW = 1
+DESERT = 2
+JUNGLE = 3
+SAVANNAH = 4
+FOREST = 5
+
+BIOME_NAMES = ('ocean', 'snow', 'desert', 'jungle', 'savannah', 'forest')
+BIOME_COUNT = len(BIOME_NAMES)
+
+# Thresholds (same constants as the shader)
+SEA_LEVEL = 0.5
+SNOW_TEMP = 0.35
+HOT_TEMP = 0.65
+DESERT_HUM = 0.3
+SAVANNAH_HUM = 0.4
+
+
+def classify(layers):
+    """
+    Vectorized biome classification.
+    layers: (..., C) array with at least Layers 0-2 (Height, Ground Temp, Ground Hum).
+    Returns a uint8 array of biome ids with shape layers.shape[:-1].
+    """
+    h = layers[..., 0]
+    t_temp = layers[..., 1]
+    t_hum = layers[..., 2]
+
+    hot = t_temp > HOT_TEMP
+    conditions = [
+        h < SEA_LEVEL,
+        t_temp < SNOW_TEMP,
+        hot & (t_hum < DESERT_HUM),
+        hot,
+        t_hum < SAVANNAH_HUM,
+    ]
+    choices = [OCEAN, SNOW, DESERT, JUNGLE, SAVANNAH]
+    return np.select(conditions, choices, default=FOREST).astype(np.uint8)
+
+
+def histogram(biome_ids):
+    """Pixel count per biome id (length BIOME_COUNT)."""
+    return np.bincount(biome_ids.ravel(), minlength=BIOME_COUNT).astype(np.int64)
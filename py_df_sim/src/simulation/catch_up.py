@@ -0,0 +1,169 @@
+import numpy as np
+from config import (REAL_SECONDS_PER_GAME_DAY, CATCH_UP_INTERVAL_HOURS, CATCH_UP_MAX_CHUNKS,
+                    BIOMASS_GROWTH_RATE)
+
+# Lazy catch-up of the time-evolving chunk layers.
+# Only resident chunks are ever simulated. Each one remembers the game time
+# (Chronos.total_game_hours) its data was last advanced to; when it becomes
+# resident again it jumps straight to "now" in one closed-form step.
+# The world seems to keep living, but only observed chunks cost anything.
+#
+# Evolving layers:
+#   3 (Bio):      logistic growth towards a climate carrying capacity
+#   6 (Air Temp): exponential relaxation (WeatherSimulator.relax_air_temperature)
+
+SEA_LEVEL = 0.5
+BIOMASS_SEED = 1e-3  # Biomass that re-colonizes bare land (logistic growth cannot start from 0)
+EVOLVING_LAYERS = (3, 6)
+
+
+def biomass_capacity(layers):
+    """
+    Carrying capacity (0..1) of every pixel of (..., 8) layers:
+    humid land at mild ground temperature supports the most life, water none.
+    """
+    temp_fit = np.clip(1.0 - np.abs(layers[..., 1] - 0.6) / 0.4, 0.0, 1.0)
+    capacity = np.clip(layers[..., 2], 0.0, 1.0) * temp_fit
+    capacity[layers[..., 0] < SEA_LEVEL] = 0.0
+    return capacity.astype(np.float32)
+
+
+def grow_biomass(biomass, capacity, days, rate=BIOMASS_GROWTH_RATE):
+    """
+    Closed form of dB/dt = r * B * (1 - B / K) after 'days' game days:
+        B(t) = K * B0 / (B0 + (K - B0) * e^(-r * t))
+    Exact for any t, so one call replaces any number of small steps.
+    Where K = 0 (water) biomass dies back exponentially instead.
+    """
+    decay = np.float32(np.exp(-rate * days))
+    alive = capacity > 0.0
+    b0 = np.where(alive, np.maximum(biomass, np.float32(BIOMASS_SEED)), biomass)
+    grown = capacity * b0 / (b0 + (capacity - b0) * decay)
+    return np.where(alive, grown, biomass * decay).astype(np.float32)
+
+
+class CatchUpSimulator:
+    def __init__(self, data_manager, chronos, weather,
+                 interval_hours=CATCH_UP_INTERVAL_HOURS, max_chunks=CATCH_UP_MAX_CHUNKS):
+        self.data_manager = data_manager
+        self.chronos = chronos
+        self.weather = weather  # Owner of the air temperature closed form
+
+        # Resident chunks are advanced in steps of at least this many game hours,
+        # at most max_chunks per frame (oldest first)
+        self.interval_hours = interval_hours
+        self.max_chunks = max_chunks
+
+        # Game hour the saved data of each chunk was simulated up to (see save()/load())
+        self.saved_times = {}
+
+        # Game hour the data of each resident chunk was simulated up to.
+        # Dropped when the chunk leaves RAM: DataManager.prune does not save it,
+        # so its data falls back to the saved state (and saved_times).
+        self.times = {}
+
+        # Chunks loaded mid-frame catch up before they are first drawn
+        data_manager.add_load_hook(self.on_load)
+
+        # So do the coarse weather fields: _refine_chunk overwrites Layers 4-7
+        # of the resident chunks from them every frame
+        weather.add_field_hook(self.on_field)
+
+    def on_load(self, chunk):
+        """DataManager load hook: brings a chunk that just became resident up to 'now'."""
+        if chunk.is_preview:
+            return  # Tracked once refined (see update())
+        key = (chunk.x, chunk.y, chunk.level)
+        self.times[key] = self.start_time(key, chunk)
+        if self.chronos.total_game_hours - self.times[key] >= self.interval_hours:
+            self.advance(chunk)
+
+    def on_field(self, chunk, field):
+        """
+        WeatherSimulator field hook: a coarse field copied from 'chunk' stands
+        for the same game hour as the chunk data (its own time record if
+        resident, else start_time()). Its air temperature is relaxed to now;
+        from then on the weather keeps it live.
+        """
+        key = (chunk.x, chunk.y, chunk.level)
+        since = self.times.get(key)
+        if since is None:
+            since = self.start_time(key, chunk)
+        hours = self.chronos.total_game_hours - since
+        if hours > 0.0:
+            self.weather.relax_air_temperature(field, (hours / 24.0) * REAL_SECONDS_PER_GAME_DAY)
+
+    def start_time(self, key, chunk):
+        """
+        Game hour the data of a newly tracked chunk stands for.
+        Straight from the generator (not disk or snapshot): the world epoch,
+        so first sight advances it by the whole game time. Data with no record
+        otherwise (e.g. saved before catch-up existed) is taken as current.
+        """
+        if chunk.regenerated:
+            return 0.0
+        return self.saved_times.get(key, self.chronos.total_game_hours)
+
+    def update(self):
+        """
+        Call once per frame (after DataManager.prune).
+        Starts tracking new resident chunks and advances the most outdated
+        ones to the current game time. Returns the number of chunks advanced.
+        """
+        resident = self.data_manager.loaded_chunks
+        now = self.chronos.total_game_hours
+
+        # Forget chunks that left RAM
+        for key in [k for k in self.times if k not in resident]:
+            del self.times[key]
+
+        # 1. Chunks that are a full interval (or a whole absence) behind
+        stale = []
+        for key, chunk in resident.items():
+            if chunk.is_preview:
+                continue
+            if key not in self.times:
+                self.times[key] = self.start_time(key, chunk)
+            if now - self.times[key] >= self.interval_hours:
+                stale.append(key)
+
+        # 2. Oldest first, a bounded number per frame (each one is an edit)
+        stale.sort(key=self.times.get)
+        for key in stale[:self.max_chunks]:
+            self.advance(resident[key])
+        return min(len(stale), self.max_chunks)
+
+    def advance(self, chunk):
+        """Moves the evolving layers of a resident chunk from its last simulated time to now."""
+        key = (chunk.x, chunk.y, chunk.level)
+        now = self.chronos.total_game_hours
+        hours = now - self.times.get(key, now)
+        self.times[key] = now
+        if hours <= 0.0:
+            return
+
+        # 1. Biomass (needs height, ground temp and humidity for the capacity)
+        chunk.ensure_layers((0, 1, 2, 3, 6))
+        layers = chunk.buffer
+        layers[:, :, 3] = grow_biomass(layers[:, :, 3], biomass_capacity(layers), hours / 24.0)
+
+        # 2. Air temperature (the weather works in real seconds, like WeatherSimulator.catch_up)
+        self.weather.relax_air_temperature(layers, (hours / 24.0) * REAL_SECONDS_PER_GAME_DAY)
+
+        self.data_manager.mark_chunk_edited(chunk, layers=EVOLVING_LAYERS)
+
+    def reload(self):
+        """After DataManager.reload_changed(): resident data is the saved state again."""
+        self.times.clear()
+
+    # ------------------------------------------------------------------
+    # PERSISTENCE
+    # ------------------------------------------------------------------
+
+    def save(self, save_manager):
+        """Call together with the chunk saves / snapshot: resident data is stored as of self.times."""
+        self.saved_times.update(self.times)
+        save_manager.save_chunk_table("sim_time", self.saved_times)
+
+    def load(self, save_manager):
+        self.saved_times = save_manager.load_chunk_table("sim_time")
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from config import DAYS_PER_YEAR
 
 class Celestials:
@@ -28,17 +29,82 @@ class Celestials:
         self.lunar_period_sidereal = 27.32 # Orbital cycle relative to stars
         self.lunar_node_cycle = 6793.5     # 18.6 years (Nodal Precession)
 
+        # --- OPTIONAL EPHEMERIS TABLE (Per-frame fast path) ---
+        # None = solve the orbits every frame. See enable_table().
+        self.table = None
+        self.table_span_hours = 0.0
+        self.table_step_hours = 0.0
+
     def update(self):
         """
         Calculates precise orbital positions using Ecliptic -> Equatorial conversion.
+        If an ephemeris table is enabled, interpolates it instead.
+        """
+        if self.table is not None:
+            hours = self.chronos.total_game_hours
+            if not self.table.covers(hours):
+                # Slide the window forward (or back) to the current time
+                self.table = EphemerisTable(self, hours, self.table_span_hours, self.table_step_hours)
+            values = self.table.sample(hours)
+        else:
+            values = self._solve(self.chronos.day_of_year, self.chronos.year, self.chronos.time_of_day)
+
+        self.solar_declination = float(values['solar_declination'])
+        self.greenwich_hour_angle = float(values['greenwich_hour_angle'])
+        self.lunar_declination = float(values['lunar_declination'])
+        self.lunar_gha = float(values['lunar_gha'])
+        self.moon_phase_intensity = float(values['moon_phase_intensity'])
+
+    def catch_up(self, elapsed_hours):
+        """
+        Chronos catch-up hook. Orbits are a closed-form function of time,
+        so skipping any amount of time is a single update().
+        """
+        self.update()
+
+    def ephemeris(self, hours):
+        """
+        Batched version of update() for many instants at once.
+        hours: Absolute game time (Chronos.total_game_hours), scalar or array.
+        Returns a dict of arrays keyed like the attributes update() sets:
+        solar_declination, greenwich_hour_angle, lunar_declination,
+        lunar_gha, moon_phase_intensity.
+        """
+        hours = np.asarray(hours, dtype=np.float64)
+
+        # Convert the continuous clock back into Chronos' calendar fields
+        # (Day 1 of Year 1 starts at hour 0.0)
+        day_index = np.floor(hours / 24.0)
+        time_of_day = hours - day_index * 24.0
+        day_of_year = np.mod(day_index, DAYS_PER_YEAR) + 1
+        year = np.floor_divide(day_index, DAYS_PER_YEAR) + 1
+
+        return self._solve(day_of_year, year, time_of_day)
+
+    def enable_table(self, span_days=30.0, step_hours=0.25):
+        """
+        Switches update() to a precomputed ephemeris table with linear
+        interpolation. The table is rebuilt when time leaves its window.
+        """
+        self.table_span_hours = span_days * 24.0
+        self.table_step_hours = step_hours
+        self.table = EphemerisTable(self, self.chronos.total_game_hours,
+                                    self.table_span_hours, self.table_step_hours)
+
+    def disable_table(self):
+        self.table = None
+
+    def _solve(self, day_of_year, year, time_of_day):
+        """
+        The orbital math. Works on scalars or NumPy arrays of calendar fields.
         """
         # =========================================================
         # 1. TIME PARAMETERS
         # =========================================================
         # Continuous time in days including years
-        total_days = self.chronos.day_of_year + (self.chronos.year * DAYS_PER_YEAR)
+        total_days = day_of_year + (year * DAYS_PER_YEAR)
         # Fraction of the current day (0.0 to 1.0)
-        day_frac = self.chronos.time_of_day / 24.0
+        day_frac = time_of_day / 24.0
         
         # Exact time t (in days)
         t = total_days + day_frac
@@ -50,16 +116,16 @@ class Celestials:
         # Mean Longitude of the Sun (0 to 2PI)
         # This is the Sun's angle on the Ecliptic plane (The Year)
         # We offset by PI/2 so Day 0 is Spring Equinox (Dec=0) not Winter Solstice
-        sun_long = (2.0 * math.pi * (self.chronos.day_of_year / DAYS_PER_YEAR))
+        sun_long = (2.0 * math.pi * (day_of_year / DAYS_PER_YEAR))
         
         # Sun Declination Formula (Ecliptic -> Equatorial)
         # sin(Dec) = sin(Obliquity) * sin(Longitude)
-        self.solar_declination = math.asin(math.sin(self.epsilon) * math.sin(sun_long))
+        solar_declination = np.arcsin(math.sin(self.epsilon) * np.sin(sun_long))
 
         # Sun GHA (Earth's Rotation)
         # Noon (12.0) = 0.0 rads. Earth rotates East, Sun moves West (-).
-        time_norm = (self.chronos.time_of_day - 12.0) / 12.0
-        self.greenwich_hour_angle = time_norm * math.pi * -1.0
+        time_norm = (time_of_day - 12.0) / 12.0
+        greenwich_hour_angle = time_norm * math.pi * -1.0
 
         # =========================================================
         # 3. THE MOON (The Complex Body)
@@ -80,7 +146,7 @@ class Celestials:
         dist_from_node = moon_long - node_long
         
         # Ecliptic Latitude of Moon
-        moon_lat = self.i_moon * math.sin(dist_from_node)
+        moon_lat = self.i_moon * np.sin(dist_from_node)
         
         # C. Coordinate Transformation: Ecliptic -> Equatorial
         # This is the "Not Cheap" Math.
@@ -89,10 +155,10 @@ class Celestials:
         # Formula:
         # sin(dec) = sin(lat)*cos(eps) + cos(lat)*sin(eps)*sin(long)
         
-        sin_dec = (math.sin(moon_lat) * math.cos(self.epsilon)) + \
-                  (math.cos(moon_lat) * math.sin(self.epsilon) * math.sin(moon_long))
+        sin_dec = (np.sin(moon_lat) * math.cos(self.epsilon)) + \
+                  (np.cos(moon_lat) * math.sin(self.epsilon) * np.sin(moon_long))
         
-        self.lunar_declination = math.asin(sin_dec)
+        lunar_declination = np.arcsin(sin_dec)
 
         # D. Lunar GHA
         # We need the difference between Sun and Moon (Phase) to determine offset.
@@ -102,7 +168,7 @@ class Celestials:
         long_diff = moon_long - sun_long
         
         # The Moon lags the Sun by this longitudinal difference
-        self.lunar_gha = self.greenwich_hour_angle - long_diff
+        lunar_gha = greenwich_hour_angle - long_diff
 
         # =========================================================
         # 4. PHASE MAGNITUDE (Illumination)
@@ -113,7 +179,61 @@ class Celestials:
         
         # We use (1 - cos(theta)) / 2 to normalize to 0..1 range
         phase_angle = long_diff
-        self.moon_phase_intensity = (1.0 - math.cos(phase_angle)) * 0.5
+        moon_phase_intensity = (1.0 - np.cos(phase_angle)) * 0.5
         
         # Slight boost to gamma correction so half-moons aren't too dim
-        self.moon_phase_intensity = pow(self.moon_phase_intensity, 0.8)
+        moon_phase_intensity = np.power(moon_phase_intensity, 0.8)
+
+        return {
+            'solar_declination': solar_declination,
+            'greenwich_hour_angle': greenwich_hour_angle,
+            'lunar_declination': lunar_declination,
+            'lunar_gha': lunar_gha,
+            'moon_phase_intensity': moon_phase_intensity,
+        }
+
+
+class EphemerisTable:
+    """
+    Celestials.ephemeris() sampled on a regular time grid.
+    Lookups are linear interpolation, so many instants cost a few np.interp
+    calls instead of the full trigonometry.
+
+    Hour angles are stored unwrapped (the midnight jump of 2*PI removed), so
+    they interpolate exactly; callers only use them through sin/cos.
+    The Sun's declination changes once per day (day_of_year is an integer),
+    so around midnight it ramps over one table step instead of jumping.
+    """
+    ANGLE_KEYS = ('greenwich_hour_angle', 'lunar_gha')
+
+    def __init__(self, celestials, start_hours, span_hours, step_hours):
+        count = max(2, int(math.ceil(span_hours / step_hours)) + 1)
+
+        self.start_hours = start_hours
+        self.step_hours = step_hours
+        self.end_hours = start_hours + (count - 1) * step_hours
+        self.hours = start_hours + np.arange(count) * step_hours
+
+        self.values = celestials.ephemeris(self.hours)
+        for key in self.ANGLE_KEYS:
+            self.values[key] = np.unwrap(self.values[key])
+
+        # Plain Python copies for the scalar path (avoids NumPy scalar overhead)
+        self._lists = {key: column.tolist() for key, column in self.values.items()}
+
+    def covers(self, hours):
+        return self.start_hours <= hours <= self.end_hours
+
+    def sample(self, hours):
+        """
+        Interpolated ephemeris for scalar or array hours inside the table window.
+        """
+        if np.ndim(hours) == 0:
+            # Per-frame path: direct index math, no array allocation
+            pos = (hours - self.start_hours) / self.step_hours
+            i = min(int(pos), len(self.hours) - 2)
+            frac = pos - i
+            return {key: column[i] + (column[i + 1] - column[i]) * frac
+                    for key, column in self._lists.items()}
+
+        return {key: np.interp(hours, self.hours, column) for key, column in self.values.items()}
@@ -15,6 +15,10 @@ class Chronos:
         # Total accumulated game hours (good for continuous functions)
         self.total_game_hours = STARTING_HOUR
 
+        # Systems that want to be fast-forwarded after a skip()
+        # Each hook is called as hook(elapsed_game_hours)
+        self.catch_up_hooks = []
+
     def update(self, dt):
         """
         dt: Delta Time in seconds from the main game loop
@@ -23,19 +27,52 @@ class Chronos:
         # Formula: (RealDT / RealSecPerDay) * 24 hours
         game_hours_passed = (dt / REAL_SECONDS_PER_GAME_DAY) * 24.0
         
-        self.total_game_hours += game_hours_passed
-        self.time_of_day += game_hours_passed
-        
-        # 2. Check for End of Day (24h rollover)
-        if self.time_of_day >= 24.0:
-            self.time_of_day -= 24.0
-            self.day_of_year += 1
-            
-            # 3. Check for End of Year
-            if self.day_of_year > DAYS_PER_YEAR:
-                self.day_of_year = 1
-                self.year += 1
-                print(f"Happy New Year! Year {self.year}")
+        # 2. Advance the calendar (handles any number of rollovers, e.g. after a pause)
+        self.advance_hours(game_hours_passed)
+
+    def advance_hours(self, hours):
+        """
+        Moves the clock by an arbitrary number of game hours in O(1).
+        Does NOT notify catch-up hooks (use skip() for that).
+        """
+        self.total_game_hours += hours
+        
+        # 1. Split into whole days + remaining hour of the day
+        days_passed, self.time_of_day = divmod(self.time_of_day + hours, 24.0)
+        if days_passed == 0:
+            return
+        
+        # 2. Calendar arithmetic on a 0-based day index
+        day_index = (self.day_of_year - 1) + int(days_passed)
+        years_passed, day_index = divmod(day_index, DAYS_PER_YEAR)
+        self.day_of_year = day_index + 1
+        
+        # 3. Check for End of Year
+        if years_passed:
+            self.year += years_passed
+            print(f"Happy New Year! Year {self.year}")
+
+    def skip(self, hours=0.0, days=0.0, years=0.0):
+        """
+        Fast-forwards time (e.g. "Sleep", "Wait 1 Year") in constant time,
+        then lets dependent systems catch up in one closed-form/coarse step
+        instead of replaying every frame.
+        Returns the total game hours skipped.
+        """
+        elapsed = hours + (days * 24.0) + (years * DAYS_PER_YEAR * 24.0)
+        if elapsed < 0:
+            raise ValueError("Chronos can only skip forward in time.")
+        
+        self.advance_hours(elapsed)
+        
+        for hook in self.catch_up_hooks:
+            hook(elapsed)
+        
+        return elapsed
+
+    def add_catch_up_hook(self, hook):
+        """Registers hook(elapsed_game_hours), called after every skip()."""
+        self.catch_up_hooks.append(hook)
 
     def get_info(self):
         return f"Y:{self.year} D:{self.day_of_year} H:{self.time_of_day:.2f}"
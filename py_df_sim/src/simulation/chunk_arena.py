@@ -0,0 +1,121 @@
+import numpy as np
+from multiprocessing import shared_memory
+from config import CHUNK_SIZE
+
+LAYERS = 8
+SLOT_SHAPE = (CHUNK_SIZE, CHUNK_SIZE, LAYERS)
+
+
+class ChunkArena:
+    """
+    One preallocated (capacity, 64, 64, 8) Float32 slab holding chunk layers.
+    ChunkData.height_map becomes a view into a slot, so chunks do not fragment
+    the heap and other processes can write into the same memory.
+
+    backing:
+      'heap'   - plain NumPy array (single process)
+      'shared' - multiprocessing.shared_memory block (workers attach by name)
+      'memmap' - file-backed np.memmap at 'path' (workers attach by path)
+    """
+    def __init__(self, capacity, backing='heap', path=None, _attach=None):
+        self.capacity = capacity
+        self.backing = backing
+        self.path = path
+        self.shm = None
+
+        shape = (capacity,) + SLOT_SHAPE
+        nbytes = int(np.prod(shape)) * 4
+
+        if backing == 'heap':
+            self.slab = np.zeros(shape, dtype=np.float32)
+        elif backing == 'shared':
+            if _attach is None:
+                self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            else:
+                self.shm = shared_memory.SharedMemory(name=_attach)
+            self.slab = np.ndarray(shape, dtype=np.float32, buffer=self.shm.buf)
+        elif backing == 'memmap':
+            mode = 'r+' if _attach is not None else 'w+'
+            self.slab = np.memmap(path, dtype=np.float32, mode=mode, shape=shape)
+        else:
+            raise ValueError(f"Unknown arena backing: {backing}")
+
+        # Free-list allocator: a stack of unused slot indices (lowest first)
+        # Attached (worker) views never allocate, the owner hands out slots.
+        self.owner = _attach is None
+        self.free_slots = list(range(capacity - 1, -1, -1)) if self.owner else []
+
+    # ------------------------------------------------------------------
+    # ALLOCATION
+    # ------------------------------------------------------------------
+
+    @property
+    def used(self):
+        return self.capacity - len(self.free_slots)
+
+    def allocate(self):
+        """Returns a free slot index, or None if the arena is full."""
+        if not self.free_slots:
+            return None
+        return self.free_slots.pop()
+
+    def release(self, slot):
+        """Returns a slot to the free-list. Views into it must not be used afterwards."""
+        self.free_slots.append(slot)
+
+    def view(self, slot):
+        """(64, 64, 8) view of a slot (no copy)."""
+        return self.slab[slot]
+
+    # ------------------------------------------------------------------
+    # SHARING
+    # ------------------------------------------------------------------
+
+    def descriptor(self):
+        """Picklable description that lets another process attach() to this slab."""
+        if self.backing == 'heap':
+            raise ValueError("A 'heap' arena cannot be shared between processes")
+        return {
+            'capacity': self.capacity,
+            'backing': self.backing,
+            'name': self.shm.name if self.shm is not None else None,
+            'path': self.path,
+        }
+
+    @classmethod
+    def attach(cls, descriptor):
+        """Opens an existing 'shared' or 'memmap' arena (e.g. inside a worker)."""
+        handle = descriptor['name'] if descriptor['backing'] == 'shared' else True
+        return cls(descriptor['capacity'], descriptor['backing'], descriptor['path'], _attach=handle)
+
+    def close(self):
+        """Detaches from the memory. The owner also frees the shared block."""
+        self.slab = None
+        if self.shm is not None:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+            self.shm = None
+
+
+# --- WORKER SIDE ---
+# Each worker process keeps its arena attachment and generator between jobs.
+_worker_arena = None
+_worker_generator = None
+
+
+def generate_into_slot(descriptor, seed, slot, x, y, level):
+    """
+    Process-pool job: generates chunk (x, y, level) directly into 'slot'
+    of the shared arena. Nothing but the slot index crosses the process boundary.
+    """
+    global _worker_arena, _worker_generator
+    from simulation.generator import TerrainGenerator
+
+    if _worker_arena is None or _worker_arena.descriptor() != descriptor:
+        _worker_arena = ChunkArena.attach(descriptor)
+    if _worker_generator is None or _worker_generator.seed != seed:
+        _worker_generator = TerrainGenerator(seed=seed)
+
+    _worker_generator.generate_chunk_data(x, y, level, out=_worker_arena.view(slot))
+    return slot
@@ -1,20 +1,231 @@
 import numpy as np
+from config import CHUNK_SIZE
+from utils.rects import clip_rect, merge_rects
+from simulation import biomes, terrain_lighting
+from simulation.chunk_stats import ChunkStats
 
 class ChunkData:
     """
     Holds the pure gameplay data for a specific chunk.
     This is decoupled from OpenGL or Visuals.
     """
+    LAYER_COUNT = 8
+
     def __init__(self, x, y, level, height_map):
         self.x = x
         self.y = y
         self.level = level
         
-        # The core data: A 2D numpy array of floats (0.0 to 1.0)
-        self.height_map = height_map
+        # The core data: A (64, 64, 8) numpy array of floats (0.0 to 1.0).
+        # Stored in 'buffer'; the height_map property materializes every layer.
+        self.buffer = height_map
+        
+        # LAZY LAYERS:
+        # materialized[i] is True once layer i holds real data.
+        # A lazy chunk (see lazy()) asks the generator for a layer on first access.
+        self.generator = None
+        self.materialized = np.ones(self.LAYER_COUNT, dtype=bool)
+        
+        # PROGRESSIVE STREAMING:
+        # Samples per side of what 'buffer' shows for non-materialized layers.
+        # CHUNK_SIZE = full resolution. A preview chunk (see preview()) holds a
+        # coarse placeholder until the DataManager refines it in the background.
+        self.resolution = CHUNK_SIZE
+        
+        # ChunkArena slot that height_map is a view of (None = separate array)
+        self.slot = None
         
         # MEMORY OPTIMIZATION:
         # True if this chunk is new or modified and needs saving.
         # False if it matches what is already on the disk.
         self.is_dirty = True         
         self.needs_texture_update = False # If True, GPU needs a new texture
+        
+        # CHANGE TRACKING (hot reload, caches):
+        # version:        bumped by every edit (DataManager.mark_chunk_edited)
+        # height_version: bumped only by edits of Layer 0 (keys the baked lighting)
+        # saved_version:  version that matches the file on disk
+        # source_mtime:   mtime of the .npy this data came from / was saved to
+        #                 (None = never on disk, data equals the generator output)
+        self.version = 0
+        self.height_version = 0
+        self.saved_version = 0
+        self.source_mtime = None
+        
+        # True if the data was produced by the generator when this object was
+        # created (not read from disk or a snapshot). Edits do not clear it:
+        # systems with per-chunk progress (erosion, catch-up) use it to tell
+        # that earlier unsaved work on this key is gone.
+        self.regenerated = False
+        
+        # Changed pixel rectangles (x0, y0, x1, y1) per texture group
+        # (0: Layers 0-3 -> terrain array, 1: Layers 4-7 -> atmos array).
+        # Empty lists with needs_texture_update = True mean "upload everything".
+        self.dirty_rects = ([], [])
+        
+        # Cached biome summary (see biome_summary()). None = not computed yet.
+        self.biome_map = None        # (H, W) uint8 biome ids
+        self.biome_histogram = None  # (BIOME_COUNT,) pixel counts
+        
+        # Cached min/max/mean summary (see chunk_stats())
+        self.stats = None
+        
+        # Cached baked normals + horizons (see lighting_maps()) and the
+        # lighting_version they were baked from / last uploaded with
+        self.lighting = None
+        self.lighting_key = None
+        self.uploaded_lighting_key = None  # Set by TextureStager.stage_lighting
+
+    @classmethod
+    def lazy(cls, x, y, level, generator, buffer=None):
+        """
+        A chunk whose layers are generated one by one when first accessed.
+        buffer: Optional (64, 64, 8) array to fill (e.g. a ChunkArena slot).
+        """
+        if buffer is None:
+            buffer = np.zeros((CHUNK_SIZE, CHUNK_SIZE, cls.LAYER_COUNT), dtype=np.float32)
+        chunk = cls(x, y, level, buffer)
+        chunk.generator = generator
+        chunk.materialized[:] = False
+        chunk.regenerated = True
+        return chunk
+
+    @classmethod
+    def preview(cls, x, y, level, generator, resolution, buffer=None):
+        """
+        A lazy chunk whose buffer already holds a coarse (resolution x resolution)
+        version of all layers, good enough to draw. Real layers still
+        materialize on access, so data consumers never see the placeholder.
+        """
+        chunk = cls.lazy(x, y, level, generator, buffer)
+        generator.generate_layers(x, y, level, range(cls.LAYER_COUNT), out=chunk.buffer,
+                                  resolution=resolution)
+        chunk.resolution = resolution
+        return chunk
+
+    @property
+    def is_preview(self):
+        return self.resolution < CHUNK_SIZE
+
+    @property
+    def is_complete(self):
+        return bool(self.materialized.all())
+
+    @property
+    def height_map(self):
+        """All 8 layers (generates whatever is still missing)."""
+        self.ensure_layers(range(self.LAYER_COUNT))
+        return self.buffer
+
+    @height_map.setter
+    def height_map(self, value):
+        self.buffer = value
+        self.materialized[:] = True
+
+    def ensure_layers(self, layers):
+        """Generates the listed layers if they are not materialized yet."""
+        missing = [layer for layer in layers if not self.materialized[layer]]
+        if missing:
+            self.generator.generate_layers(self.x, self.y, self.level, missing, out=self.buffer)
+            self.materialized[missing] = True
+
+    def get_layers(self, start, stop, overwrite=False):
+        """
+        View of layers [start, stop) as a (64, 64, stop - start) array.
+        overwrite=True skips generation: the caller promises to fill
+        the whole range itself (e.g. weather writing the atmosphere).
+        """
+        if overwrite:
+            self.materialized[start:stop] = True
+        else:
+            self.ensure_layers(range(start, stop))
+        return self.buffer[:, :, start:stop]
+
+    def get_display_layers(self, start, stop):
+        """
+        Layers [start, stop) for drawing. Preview chunks return the buffer as is
+        (placeholder where not refined yet) instead of generating synchronously.
+        """
+        if self.is_preview:
+            return self.buffer[:, :, start:stop]
+        return self.get_layers(start, stop)
+
+    def biome_summary(self):
+        """
+        Returns (biome_map, biome_histogram), classifying the chunk only once.
+        """
+        if self.biome_map is None:
+            self.biome_map = biomes.classify(self.get_layers(0, 3))
+            self.biome_histogram = biomes.histogram(self.biome_map)
+        return self.biome_map, self.biome_histogram
+
+    def lighting_maps(self):
+        """
+        (64, 64, 8) baked lighting of the displayed height layer
+        (see simulation/terrain_lighting.py), baked once per lighting_version.
+        """
+        key = self.lighting_version
+        if self.lighting is None or self.lighting_key != key:
+            self.lighting = terrain_lighting.bake(self.get_display_layers(0, 1)[:, :, 0])
+            self.lighting_key = key
+        return self.lighting
+
+    @property
+    def lighting_version(self):
+        """State the baked lighting depends on: the displayed height only."""
+        return (self.height_version, self.resolution, bool(self.materialized[0]))
+
+    def mark_dirty_rect(self, rect=None, layers=None):
+        """
+        Records that pixels in rect (x0, y0, x1, y1) of 'layers' changed.
+        rect=None: whole chunk. layers=None: all 8 layers.
+        """
+        if rect is None:
+            rect = (0, 0, CHUNK_SIZE, CHUNK_SIZE)
+        rect = clip_rect(rect, CHUNK_SIZE, CHUNK_SIZE)
+        if rect is None:
+            return
+        
+        groups = {0, 1} if layers is None else {layer // 4 for layer in layers}
+        for group in groups:
+            pending = self.dirty_rects[group]
+            pending.append(rect)
+            # Chunks that are not on the GPU are never drained: keep the list short
+            if len(pending) > 16:
+                pending[:] = merge_rects(pending)
+        self.needs_texture_update = True
+
+    def take_dirty_rects(self, max_rects=4):
+        """
+        Returns the merged dirty rectangles per texture group and clears them.
+        Called by the TextureManager when it uploads the changes.
+        """
+        if self.needs_texture_update and not any(self.dirty_rects):
+            # Flag set without a rectangle: treat as a full-chunk change
+            self.mark_dirty_rect()
+        rects = tuple(merge_rects(group, max_rects) for group in self.dirty_rects)
+        self.dirty_rects = ([], [])
+        self.needs_texture_update = False
+        return rects
+
+    def chunk_stats(self):
+        """Returns the ChunkStats summary (min/max/mean per layer, land fraction)."""
+        if self.stats is None:
+            self.stats = ChunkStats.from_layers(self.height_map)
+        return self.stats
+
+    def reset_lazy(self, generator):
+        """Forgets every layer: they are regenerated on next access (same buffer)."""
+        self.generator = generator
+        self.materialized[:] = False
+        self.regenerated = True
+        self.resolution = CHUNK_SIZE
+        self.invalidate_summaries()
+
+    def invalidate_summaries(self, layers=None):
+        """Drops the cached summaries after 'layers' (None = all) were modified."""
+        self.biome_map = None
+        self.biome_histogram = None
+        self.stats = None
+        if layers is None or 0 in layers:
+            self.lighting = None  # Baked from the height only
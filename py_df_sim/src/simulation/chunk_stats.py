@@ -0,0 +1,208 @@
+import numpy as np
+
+SEA_LEVEL = 0.5  # Same threshold as chunk.glsl (h < 0.5 is water)
+
+
+class ChunkStats:
+    """
+    Small summary of a chunk (or of a whole Quadtree node):
+    min / max / mean of every layer plus the fraction of land pixels.
+    coverage: fraction of the node's area the summary is built from (1.0 = complete).
+    """
+    __slots__ = ('mins', 'maxs', 'means', 'land_fraction', 'coverage')
+
+    def __init__(self, mins, maxs, means, land_fraction, coverage=1.0):
+        self.mins = mins
+        self.maxs = maxs
+        self.means = means
+        self.land_fraction = land_fraction
+        self.coverage = coverage
+
+    @classmethod
+    def from_layers(cls, layers):
+        """Summary of a raw (H, W, C) chunk array."""
+        flat = layers.reshape(-1, layers.shape[-1])
+        return cls(flat.min(axis=0), flat.max(axis=0), flat.mean(axis=0, dtype=np.float64),
+                   float(np.count_nonzero(flat[:, 0] >= SEA_LEVEL)) / len(flat))
+
+    @classmethod
+    def combine(cls, parts, weights):
+        """
+        Merges summaries. weights: area each part describes (same units).
+        The result's coverage is left to the caller.
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        total = weights.sum()
+        mins = np.min([p.mins for p in parts], axis=0)
+        maxs = np.max([p.maxs for p in parts], axis=0)
+        means = np.dot(weights, [p.means for p in parts]) / total
+        land = float(np.dot(weights, [p.land_fraction for p in parts]) / total)
+        return cls(mins, maxs, means, land)
+
+
+class ChunkStatsIndex:
+    """
+    Statistics pyramid keyed like QuadtreeNode: (x, y, level).
+
+    own   - summaries computed from actual chunk data at that key
+    nodes - the effective summary of every known node:
+            1. the merged children, if all 4 children are complete (finer data wins)
+            2. otherwise the node's own chunk summary, if it has one
+            3. otherwise the merged known children (coverage < 1)
+
+    Every update walks from the chunk up to level 0, so each insert costs
+    O(level) small merges and coarse queries never touch chunk arrays.
+    """
+    def __init__(self):
+        self.own = {}
+        self.nodes = {}
+
+    def __len__(self):
+        return len(self.own)
+
+    # ------------------------------------------------------------------
+    # UPDATES
+    # ------------------------------------------------------------------
+
+    def update_chunk(self, chunk):
+        """(Re)indexes a ChunkData. Call after generation, load or edit."""
+        self.set_stats((chunk.x, chunk.y, chunk.level), chunk.chunk_stats())
+
+    def set_stats(self, key, stats):
+        self.own[key] = stats
+        x, y, level = key
+        while True:
+            self._refresh((x, y, level))
+            if level == 0:
+                break
+            x, y, level = x // 2, y // 2, level - 1
+
+    def _refresh(self, key):
+        x, y, level = key
+        child_level = level + 1
+        children = [self.nodes.get((x * 2 + dx, y * 2 + dy, child_level))
+                    for dy in (0, 1) for dx in (0, 1)]
+        children = [c for c in children if c is not None]
+        own = self.own.get(key)
+
+        if len(children) == 4 and all(c.coverage >= 1.0 for c in children):
+            stats = ChunkStats.combine(children, [1.0] * 4)
+        elif own is not None:
+            stats = own
+        elif children:
+            stats = ChunkStats.combine(children, [c.coverage for c in children])
+            stats.coverage = sum(c.coverage for c in children) / 4.0
+        else:
+            self.nodes.pop(key, None)
+            return
+        self.nodes[key] = stats
+
+    def rebuild(self):
+        """Recomputes every node from the 'own' summaries (after loading)."""
+        self.nodes = {}
+        # Finest first, so each parent is refreshed with its children already in place
+        for key in sorted(self.own, key=lambda k: -k[2]):
+            self.set_stats(key, self.own[key])
+
+    # ------------------------------------------------------------------
+    # QUERIES
+    # ------------------------------------------------------------------
+
+    def get(self, x, y, level):
+        """Effective summary of a node, or None if nothing is known about it."""
+        return self.nodes.get((x, y, level))
+
+    def query_rect(self, x0, y0, x1, y1, max_level=None):
+        """
+        Summary of the world rectangle [x0, x1) x [y0, y1) from the pyramid only.
+        Descends while nodes straddle the rectangle edge and finer data exists.
+        Nodes that only partly overlap the rectangle are taken whole, so
+        min/max are conservative bounds. coverage = fraction of the rectangle's
+        area that known data describes. Returns None if nothing is known.
+        """
+        parts, weights = [], []
+        for rx in range(int(np.floor(x0)), int(np.ceil(x1))):
+            for ry in range(int(np.floor(y0)), int(np.ceil(y1))):
+                self._collect((rx, ry, 0), (x0, y0, x1, y1), max_level, parts, weights)
+
+        if not parts:
+            return None
+        stats = ChunkStats.combine(parts, weights)
+        stats.coverage = min(1.0, sum(weights) / ((x1 - x0) * (y1 - y0)))
+        return stats
+
+    def _collect(self, key, rect, max_level, parts, weights):
+        stats = self.nodes.get(key)
+        if stats is None:
+            return
+
+        x, y, level = key
+        size = 1.0 / (2 ** level)
+        nx0, ny0 = x * size, y * size
+        ox = min(nx0 + size, rect[2]) - max(nx0, rect[0])
+        oy = min(ny0 + size, rect[3]) - max(ny0, rect[1])
+        if ox <= 0 or oy <= 0:
+            return
+
+        inside = ox >= size and oy >= size
+        children = [(x * 2 + dx, y * 2 + dy, level + 1) for dy in (0, 1) for dx in (0, 1)]
+        can_descend = (max_level is None or level < max_level) and \
+            any(c in self.nodes for c in children)
+
+        # Descend only if it adds detail: straddling node, or incomplete summary.
+        # Missing children are fine only if the node has no own data to fall back on.
+        if can_descend and (not inside or stats.coverage < 1.0):
+            if key not in self.own or all(c in self.nodes for c in children):
+                for child in children:
+                    self._collect(child, rect, max_level, parts, weights)
+                return
+
+        parts.append(stats)
+        weights.append(ox * oy * stats.coverage)
+
+    def max_height(self, x0, y0, x1, y1):
+        """Upper bound of Layer 0 (Height) inside the rectangle, None if unknown."""
+        stats = self.query_rect(x0, y0, x1, y1)
+        return None if stats is None else float(stats.maxs[0])
+
+    def is_all_ocean(self, x0, y0, x1, y1):
+        """True only if the rectangle is fully known and provably below sea level."""
+        stats = self.query_rect(x0, y0, x1, y1)
+        return stats is not None and stats.coverage >= 1.0 and stats.maxs[0] < SEA_LEVEL
+
+    def is_uniform(self, x, y, level, layers=None, tolerance=1e-3):
+        """
+        True if the node's layers vary by at most 'tolerance' (safe to cull or
+        draw as a flat colour). layers: indices to check, default all.
+        """
+        stats = self.nodes.get((x, y, level))
+        if stats is None or stats.coverage < 1.0:
+            return False
+        spread = stats.maxs - stats.mins
+        if layers is not None:
+            spread = spread[list(layers)]
+        return bool(np.all(spread <= tolerance))
+
+    # ------------------------------------------------------------------
+    # PERSISTENCE (plain arrays, written by SaveManager)
+    # ------------------------------------------------------------------
+
+    def to_arrays(self):
+        keys = list(self.own)
+        parts = [self.own[k] for k in keys]
+        return {
+            'keys': np.array(keys, dtype=np.int64).reshape(-1, 3),
+            'mins': np.array([p.mins for p in parts], dtype=np.float32).reshape(len(keys), -1),
+            'maxs': np.array([p.maxs for p in parts], dtype=np.float32).reshape(len(keys), -1),
+            'means': np.array([p.means for p in parts], dtype=np.float64).reshape(len(keys), -1),
+            'land': np.array([p.land_fraction for p in parts], dtype=np.float64),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        index = cls()
+        for i, key in enumerate(arrays['keys'].tolist()):
+            index.own[tuple(key)] = ChunkStats(arrays['mins'][i], arrays['maxs'][i],
+                                               arrays['means'][i], float(arrays['land'][i]))
+        index.rebuild()
+        return index
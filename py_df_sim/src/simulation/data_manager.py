@@ -1,20 +1,75 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config import CHUNK_SIZE, SAMPLE_CACHE_SIZE, BIOME_CACHE_SIZE, CHUNK_ARENA_CAPACITY, CHUNK_ARENA_BACKING
+from config import PREVIEW_RESOLUTION, REFINE_WORKERS
+from simulation import biomes
+from simulation.chunk_arena import ChunkArena, generate_into_slot
 from simulation.chunk_data import ChunkData
+from simulation.mip_pyramid import MipPyramid
 
 class DataManager:
-    def __init__(self, generator, save_manager):
+    def __init__(self, generator, save_manager, arena=None):
         self.generator = generator
         self.save_manager = save_manager  # Reference to the Save System
         
         # The RAM Cache: Dictionary mapping (x, y, level) -> ChunkData object
         self.loaded_chunks = {}
+        
+        # Slab that resident chunk layers live in (ChunkData.height_map is a slot view)
+        if arena is None:
+            path = os.path.join(save_manager.save_dir, "chunk_arena.bin")
+            arena = ChunkArena(CHUNK_ARENA_CAPACITY, CHUNK_ARENA_BACKING, path=path)
+        self.arena = arena
+        
+        # Side cache for chunks read by sample() that the Quadtree is not showing.
+        # LRU: (x, y, level) -> raw layer array. Not touched by prune().
+        self.sample_cache = OrderedDict()
+        self.sample_cache_size = SAMPLE_CACHE_SIZE
+        
+        # Biome summaries of chunks that are not resident.
+        # LRU: (x, y, level) -> (biome_map, biome_histogram)
+        self.biome_cache = OrderedDict()
+        self.biome_cache_size = BIOME_CACHE_SIZE
+        
+        # Min/Max/Mean pyramid over every chunk ever generated or loaded (persistent)
+        self.stats_index = save_manager.load_stats_index()
+        
+        # Propagates edits to coarser LODs (flushed once per frame)
+        self.mip_pyramid = MipPyramid(self)
+        
+        # Resident lazy chunks not yet in stats_index (see _index_pending())
+        self.unindexed = set()
+        
+        # Progressive streaming: preview chunks being refined in the background
+        # key -> (ChunkData, Future of the full-resolution layers)
+        self.preview_resolution = PREVIEW_RESOLUTION
+        self.refine_executor = None  # Created on first use
+        self.refining = {}
+        
+        # Systems that want to see a chunk as soon as get_chunk() makes it resident
+        # (e.g. catch-up simulation). Each hook is called as hook(chunk)
+        self.load_hooks = []
+        
+        # Ancestors edited while not in RAM catch up first (see MipPyramid.stale)
+        self.mip_pyramid.load_stale(save_manager)
+        self.add_load_hook(self.mip_pyramid.on_load)
+
+    def add_load_hook(self, hook):
+        """Registers hook(chunk), called for every chunk get_chunk() loads or generates."""
+        self.load_hooks.append(hook)
 
-    def get_chunk(self, x, y, level):
+    def get_chunk(self, x, y, level, preview=False):
         """
         Returns a ChunkData object.
         Priority:
         1. RAM (Fastest)
         2. Disk (Fast)
         3. Generator (Slowest - creates new data)
+        Generated chunks are lazy: each layer is computed on first access.
+        preview=True (drawing): a generated chunk starts as a coarse preview
+        and is refined in the background (see poll_refinements()).
         """
         key = (x, y, level)
         
@@ -23,26 +78,430 @@ class DataManager:
         if key in self.loaded_chunks:
             return self.loaded_chunks[key]
         
+        # Reserve a slot in the arena: Disk or Generator write straight into it.
+        # (Arena full -> fall back to a separately allocated array)
+        slot = self.arena.allocate()
+        out = self.arena.view(slot) if slot is not None else None
+        
         # 2. DISK CHECK
         # Ask the SaveManager if this file exists on the hard drive.
-        height_map = self.save_manager.load_chunk_data(x, y, level)
+        height_map = self.save_manager.load_chunk_data(x, y, level, out=out)
         
         if height_map is not None:
             # We found it on disk! 
             # Wrap the raw numpy array in our ChunkData object.
             chunk = ChunkData(x, y, level, height_map)
+            chunk.is_dirty = False
+            chunk.source_mtime = self.save_manager.chunk_mtime(x, y, level)
+            
+            # Reuse the saved biome summary instead of reclassifying
+            summary = self.save_manager.load_chunk_biomes(x, y, level)
+            if summary is not None:
+                chunk.biome_map, chunk.biome_histogram = summary
         else:
             # 3. GENERATOR FALLBACK
             # It's not in RAM and not on Disk. It is "Void".
             # We must generate it from scratch using the math.
-            height_map = self.generator.generate_chunk_data(x, y, level)
-            chunk = ChunkData(x, y, level, height_map)
+            # (Lazily: only the layers callers actually read get computed)
+            if preview and self.preview_resolution:
+                chunk = ChunkData.preview(x, y, level, self.generator,
+                                          self.preview_resolution, buffer=out)
+                self._schedule_refine(key, chunk)
+            else:
+                chunk = ChunkData.lazy(x, y, level, self.generator, buffer=out)
+        
+        chunk.slot = slot
+        
+        # Keep the statistics pyramid in sync (cheap: one pass over the array).
+        # Stats need every layer, so lazy chunks are indexed once complete.
+        if chunk.is_complete:
+            self.stats_index.update_chunk(chunk)
+        else:
+            self.unindexed.add(key)
         
         # Store the result in RAM so we don't look it up again next frame.
         self.loaded_chunks[key] = chunk
         
+        for hook in self.load_hooks:
+            hook(chunk)
+        
         return chunk
 
+    def prefetch_previews(self, keys):
+        """
+        Makes every chunk in 'keys' resident, generating the missing ones as
+        previews in ONE batched noise pass (see TerrainGenerator.generate_previews),
+        then queues their refinement. Call before get_chunk(..., preview=True)
+        for a whole view; this is what makes the first frame fast.
+        """
+        if not self.preview_resolution:
+            return
+        
+        new_chunks = []
+        for key in keys:
+            if key in self.loaded_chunks or self.save_manager.has_chunk(*key):
+                continue
+            slot = self.arena.allocate()
+            out = self.arena.view(slot) if slot is not None else None
+            chunk = ChunkData.lazy(*key, self.generator, buffer=out)
+            chunk.slot = slot
+            chunk.resolution = self.preview_resolution
+            new_chunks.append(chunk)
+        
+        if not new_chunks:
+            return
+        
+        self.generator.generate_previews([(c.x, c.y, c.level) for c in new_chunks],
+                                         self.preview_resolution, [c.buffer for c in new_chunks])
+        for chunk in new_chunks:
+            key = (chunk.x, chunk.y, chunk.level)
+            self.loaded_chunks[key] = chunk
+            self.unindexed.add(key)
+        
+        # Refine only after every preview exists (workers would slow the batch down)
+        for chunk in new_chunks:
+            self._schedule_refine((chunk.x, chunk.y, chunk.level), chunk)
+
+    def _schedule_refine(self, key, chunk):
+        """Starts generating the full-resolution layers of a preview chunk."""
+        if self.refine_executor is None:
+            self.refine_executor = ThreadPoolExecutor(max_workers=REFINE_WORKERS)
+        # The worker fills a private array: the chunk buffer is only touched on the main thread
+        future = self.refine_executor.submit(
+            self.generator.generate_layers, chunk.x, chunk.y, chunk.level, range(ChunkData.LAYER_COUNT))
+        self.refining[key] = (chunk, future)
+
+    def poll_refinements(self):
+        """
+        Swaps in the full-resolution layers of every finished preview chunk
+        and flags them for re-upload. Call once per frame (main thread).
+        Returns the number of chunks refined.
+        """
+        done = [key for key, (_, future) in self.refining.items() if future.done()]
+        for key in done:
+            chunk, future = self.refining.pop(key)
+            full = future.result()
+            
+            # Layers materialized meanwhile (accessed, or written by weather) are newer
+            missing = np.flatnonzero(~chunk.materialized)
+            chunk.buffer[:, :, missing] = full[:, :, missing]
+            chunk.materialized[:] = True
+            chunk.resolution = CHUNK_SIZE
+            chunk.mark_dirty_rect()  # The GPU copy may still be the placeholder
+        return len(done)
+
+    def generate_chunks_parallel(self, keys, executor):
+        """
+        Generates many chunks at once in worker processes that write
+        directly into a 'shared' or 'memmap' arena (no array is pickled).
+        executor: a concurrent.futures.ProcessPoolExecutor
+        Keys already resident, on disk, or beyond the arena capacity go
+        through get_chunk() as usual. Returns the list of ChunkData.
+        """
+        descriptor = self.arena.descriptor()
+        jobs = []
+        for key in keys:
+            if key in self.loaded_chunks or self.save_manager.has_chunk(*key):
+                continue
+            slot = self.arena.allocate()
+            if slot is None:
+                break
+            jobs.append((key, slot, executor.submit(
+                generate_into_slot, descriptor, self.generator.seed, slot, *key)))
+        
+        for key, slot, future in jobs:
+            future.result()
+            chunk = ChunkData(*key, self.arena.view(slot))
+            chunk.slot = slot
+            chunk.regenerated = True
+            self.stats_index.update_chunk(chunk)
+            self.loaded_chunks[key] = chunk
+        
+        return [self.get_chunk(*key) for key in keys]
+
+    def fetch_chunk(self, x, y, level):
+        """
+        Returns a ChunkData WITHOUT adding it to the RAM cache.
+        Used by background systems (weather, sampling) that need data
+        for chunks the Quadtree is not showing.
+        Same priority as get_chunk: RAM -> Disk -> Generator (lazy).
+        """
+        key = (x, y, level)
+        if key in self.loaded_chunks:
+            return self.loaded_chunks[key]
+
+        data = self.save_manager.load_chunk_data(x, y, level)
+        if data is None:
+            chunk = ChunkData.lazy(x, y, level, self.generator)
+        else:
+            chunk = ChunkData(x, y, level, data)
+            chunk.is_dirty = False
+            chunk.source_mtime = self.save_manager.chunk_mtime(x, y, level)
+        
+        # An ancestor of unsaved edits: rebuild the copy from its children
+        if key in self.mip_pyramid.stale:
+            self.mip_pyramid.apply_stale(chunk, keep=True)
+            chunk.is_dirty = True
+        return chunk
+
+    def fetch_chunk_data(self, x, y, level):
+        """Returns the raw (H, W, 8) layer array of fetch_chunk() (all layers)."""
+        return self.fetch_chunk(x, y, level).height_map
+
+    def _sample_source(self, key):
+        """
+        ChunkData for sample(): RAM first, then the LRU side cache,
+        then Disk/Generator (and remember the result in the side cache).
+        """
+        chunk = self.loaded_chunks.get(key)
+        if chunk is not None:
+            return chunk
+        
+        chunk = self.sample_cache.get(key)
+        if chunk is not None:
+            self.sample_cache.move_to_end(key)
+            return chunk
+        
+        chunk = self.fetch_chunk(*key)
+        self.sample_cache[key] = chunk
+        if len(self.sample_cache) > self.sample_cache_size:
+            self.sample_cache.popitem(last=False)
+        return chunk
+
+    def sample(self, xs, ys, layers=(0,), level=0):
+        """
+        Bilinear samples of chunk layers at arbitrary world positions.
+        xs, ys: World coordinates (arrays, same shape)
+        layers: Layer index or sequence of indices (0: Height ... 7: Air Hum)
+        level:  Quadtree level to read (resolution of the data)
+        Returns an array shaped like xs (single layer) or xs.shape + (len(layers),).
+        
+        Points are grouped by chunk, so the Python work is one lookup per
+        distinct chunk, not per point. Neighbouring pixels across chunk borders
+        are read from the neighbour chunk, so samples are continuous.
+        """
+        single = np.ndim(layers) == 0
+        layers = [layers] if single else list(layers)
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        shape = xs.shape
+        xs, ys = xs.ravel(), ys.ravel()
+        n = len(xs)
+        
+        # 1. Global pixel coordinates at this level
+        #    (pixel i of chunk c sits at world (c + i / CHUNK_SIZE) * size, like the generator)
+        res = CHUNK_SIZE * (2 ** level)
+        fx, fy = xs * res, ys * res
+        px0, py0 = np.floor(fx).astype(np.int64), np.floor(fy).astype(np.int64)
+        tx = (fx - px0).astype(np.float32)[:, None]
+        ty = (fy - py0).astype(np.float32)[:, None]
+        
+        # 2. The 4 bilinear corners of every point, as one flat batch
+        px = np.concatenate([px0, px0 + 1, px0, px0 + 1])
+        py = np.concatenate([py0, py0, py0 + 1, py0 + 1])
+        cx, cy = px // CHUNK_SIZE, py // CHUNK_SIZE
+        
+        # 3. Group corners by chunk and gather from a stack of the needed chunks
+        packed = (cx << 32) + (cy + (1 << 31))
+        keys, inverse = np.unique(packed, return_inverse=True)
+        stacked = np.empty((len(keys), CHUNK_SIZE, CHUNK_SIZE, len(layers)), dtype=np.float32)
+        for i, key in enumerate(keys.tolist()):
+            chunk_x = key >> 32
+            chunk_y = (key & 0xFFFFFFFF) - (1 << 31)
+            chunk = self._sample_source((chunk_x, chunk_y, level))
+            chunk.ensure_layers(layers)  # Lazy chunks generate only these layers
+            stacked[i] = chunk.buffer[:, :, layers]
+        
+        values = stacked[inverse.ravel(), py % CHUNK_SIZE, px % CHUNK_SIZE]
+        v00, v10, v01, v11 = values[:n], values[n:2 * n], values[2 * n:3 * n], values[3 * n:]
+        
+        # 4. Bilinear blend
+        bottom = v00 + (v10 - v00) * tx
+        top = v01 + (v11 - v01) * tx
+        result = bottom + (top - bottom) * ty
+        
+        if single:
+            return result[:, 0].reshape(shape)
+        return result.reshape(shape + (len(layers),))
+
+    def sample_resident(self, xs, ys, layers):
+        """
+        Nearest-pixel lookup of chunk layers at world positions (xs, ys),
+        reading ONLY chunks already resident in loaded_chunks (never Disk/Generator).
+        The finest resident level covering a point wins.
+        Returns an (N, len(layers)) Float32 array, NaN where nothing is resident.
+        """
+        layers = list(layers)
+        out = np.full((len(xs), len(layers)), np.nan, dtype=np.float32)
+        pending = np.arange(len(xs))
+        
+        # Resident chunks grouped by level
+        by_level = {}
+        for key, chunk in self.loaded_chunks.items():
+            by_level.setdefault(key[2], []).append(chunk)
+        
+        for level in sorted(by_level, reverse=True):
+            if len(pending) == 0:
+                break
+            chunks = by_level[level]
+            
+            # 1. Stack this level's chunks and build a (chunk_y, chunk_x) -> slot lookup grid.
+            #    Resident chunks cover the view, so the grid stays small.
+            kx = np.array([c.x for c in chunks])
+            ky = np.array([c.y for c in chunks])
+            x0, y0 = kx.min(), ky.min()
+            lookup = np.full((ky.max() - y0 + 1, kx.max() - x0 + 1), -1, dtype=np.int64)
+            lookup[ky - y0, kx - x0] = np.arange(len(chunks))
+            for c in chunks:
+                c.ensure_layers(layers)
+            stacked = np.stack([c.buffer[:, :, layers] for c in chunks])
+            
+            # 2. Global pixel coordinates at this level
+            res = CHUNK_SIZE * (2 ** level)
+            px = np.floor(xs[pending] * res).astype(np.int64)
+            py = np.floor(ys[pending] * res).astype(np.int64)
+            gx = px // CHUNK_SIZE - x0
+            gy = py // CHUNK_SIZE - y0
+            
+            inside = (gx >= 0) & (gx < lookup.shape[1]) & (gy >= 0) & (gy < lookup.shape[0])
+            slot = np.full(len(pending), -1, dtype=np.int64)
+            slot[inside] = lookup[gy[inside], gx[inside]]
+            found = slot >= 0
+            
+            # 3. One fancy-indexed gather for every point on this level
+            out[pending[found]] = stacked[slot[found], py[found] % CHUNK_SIZE, px[found] % CHUNK_SIZE]
+            pending = pending[~found]
+        
+        return out
+
+    def _biome_source(self, key):
+        """
+        (biome_map, biome_histogram) of a chunk without reclassifying when possible:
+        RAM chunk -> LRU cache -> saved summary -> classify the raw layers.
+        """
+        chunk = self.loaded_chunks.get(key)
+        if chunk is not None:
+            return chunk.biome_summary()
+        
+        summary = self.biome_cache.get(key)
+        if summary is not None:
+            self.biome_cache.move_to_end(key)
+            return summary
+        
+        summary = self.save_manager.load_chunk_biomes(*key)
+        if summary is None:
+            # Lazy chunk: only Layers 0-2 are generated for the classification
+            summary = self.fetch_chunk(*key).biome_summary()
+        
+        self.biome_cache[key] = summary
+        if len(self.biome_cache) > self.biome_cache_size:
+            self.biome_cache.popitem(last=False)
+        return summary
+
+    def biome_at(self, xs, ys, level=0):
+        """
+        Biome id (see simulation.biomes) at world positions, nearest pixel.
+        Returns a uint8 array shaped like xs.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        shape = xs.shape
+        
+        res = CHUNK_SIZE * (2 ** level)
+        px = np.floor(xs.ravel() * res).astype(np.int64)
+        py = np.floor(ys.ravel() * res).astype(np.int64)
+        cx, cy = px // CHUNK_SIZE, py // CHUNK_SIZE
+        
+        # Group points by chunk (one summary lookup per distinct chunk)
+        packed = (cx << 32) + (cy + (1 << 31))
+        keys, inverse = np.unique(packed, return_inverse=True)
+        stacked = np.empty((len(keys), CHUNK_SIZE, CHUNK_SIZE), dtype=np.uint8)
+        for i, key in enumerate(keys.tolist()):
+            chunk_x = key >> 32
+            chunk_y = (key & 0xFFFFFFFF) - (1 << 31)
+            stacked[i] = self._biome_source((chunk_x, chunk_y, level))[0]
+        
+        return stacked[inverse.ravel(), py % CHUNK_SIZE, px % CHUNK_SIZE].reshape(shape)
+
+    def biome_histogram(self, x0, y0, x1, y1, level=0):
+        """
+        Pixel count per biome inside the world rectangle [x0, x1) x [y0, y1),
+        counted at the resolution of 'level'.
+        Chunks fully inside the rectangle contribute their stored histogram;
+        only the partially covered border chunks are counted pixel by pixel.
+        """
+        res = CHUNK_SIZE * (2 ** level)
+        px0, py0 = int(np.floor(x0 * res)), int(np.floor(y0 * res))
+        px1, py1 = int(np.ceil(x1 * res)), int(np.ceil(y1 * res))
+        counts = np.zeros(biomes.BIOME_COUNT, dtype=np.int64)
+        if px1 <= px0 or py1 <= py0:
+            return counts
+        
+        for cy in range(py0 // CHUNK_SIZE, (py1 - 1) // CHUNK_SIZE + 1):
+            for cx in range(px0 // CHUNK_SIZE, (px1 - 1) // CHUNK_SIZE + 1):
+                biome_map, histogram = self._biome_source((cx, cy, level))
+                
+                # Local pixel window of the rectangle inside this chunk
+                lx0 = max(px0 - cx * CHUNK_SIZE, 0)
+                ly0 = max(py0 - cy * CHUNK_SIZE, 0)
+                lx1 = min(px1 - cx * CHUNK_SIZE, CHUNK_SIZE)
+                ly1 = min(py1 - cy * CHUNK_SIZE, CHUNK_SIZE)
+                
+                if lx0 == 0 and ly0 == 0 and lx1 == CHUNK_SIZE and ly1 == CHUNK_SIZE:
+                    counts += histogram
+                else:
+                    counts += biomes.histogram(biome_map[ly0:ly1, lx0:lx1])
+        
+        return counts
+
+    def mark_chunk_edited(self, chunk, rect=None, layers=None):
+        """
+        Call after modifying a chunk's layers in place (terraforming, erosion, weather).
+        rect: changed pixels (x0, y0, x1, y1), None = whole chunk.
+        layers: changed layer indices, None = all.
+        Flags it for saving and re-upload, refreshes its summaries and
+        queues the rebuild of its coarser ancestors (see flush_edits()).
+        """
+        chunk.is_dirty = True
+        chunk.version += 1
+        if layers is None or 0 in layers:
+            chunk.height_version += 1  # Lighting is re-baked (biomass-only edits keep it)
+        chunk.mark_dirty_rect(rect, layers)
+        chunk.invalidate_summaries(layers)
+        
+        # Stats need every layer: like get_chunk(), lazy chunks are indexed once
+        # complete (see _index_pending) instead of generating the rest here
+        key = (chunk.x, chunk.y, chunk.level)
+        if chunk.is_complete:
+            self.stats_index.update_chunk(chunk)
+            self.unindexed.discard(key)
+        else:
+            self.unindexed.add(key)
+        
+        # Side caches may hold a stale copy from before the chunk became resident
+        self.sample_cache.pop(key, None)
+        self.biome_cache.pop(key, None)
+        
+        self.mip_pyramid.mark_dirty(key)
+
+    def flush_edits(self):
+        """
+        Rebuilds the ancestors of every chunk edited since the last call
+        and indexes lazy chunks that became complete. Call once per frame.
+        """
+        self._index_pending()
+        return self.mip_pyramid.flush()
+
+    def _index_pending(self):
+        """Adds resident lazy chunks to stats_index once all layers exist."""
+        for key in list(self.unindexed):
+            chunk = self.loaded_chunks.get(key)
+            if chunk is None:
+                self.unindexed.discard(key)
+            elif chunk.is_complete:
+                self.stats_index.update_chunk(chunk)
+                self.unindexed.discard(key)
+
     def save_all_loaded_chunks(self):
         """
         Iterates through all chunks currently in RAM and saves them to disk.
@@ -54,6 +513,109 @@ class DataManager:
             # chunk.is_dirty == True (chunks that changed).
             # For now, we save everything to be safe.
             self.save_manager.save_chunk(chunk)
+            self.stats_index.update_chunk(chunk)
+            self.unindexed.discard(key)
+        
+        # Coarse levels rebuilt from edits of chunks that were not in RAM
+        written = self.mip_pyramid.save()
+        if written:
+            print(f"Saved {written} rebuilt parent chunks.")
+        self.mip_pyramid.save_stale(self.save_manager)
+        
+        self.save_manager.save_stats_index(self.stats_index)
+
+    def reload_changed(self):
+        """
+        Hot reload: brings resident chunks back in line with the save store,
+        touching only the ones that differ. A chunk is unchanged if it was not
+        edited since it was loaded/saved and its file's mtime is the same.
+        Changed chunks are re-read (or regenerated if they have no file) into
+        their existing buffer and flagged for re-upload, so the VRAM pool and
+        texture slots stay as they are. Returns the number of chunks reloaded.
+        """
+        # Side caches are cheap to rebuild and may hold anything
+        self.sample_cache.clear()
+        self.biome_cache.clear()
+        
+        # Stale ancestors only stood for unsaved edits, which are undone now
+        self.mip_pyramid.stale.clear()
+        
+        reloaded = 0
+        for key, chunk in self.loaded_chunks.items():
+            disk_mtime = self.save_manager.chunk_mtime(*key)
+            if chunk.version == chunk.saved_version and disk_mtime == chunk.source_mtime:
+                continue
+            
+            # Drop a pending background refinement of the old data
+            refine = self.refining.pop(key, None)
+            if refine is not None:
+                refine[1].cancel()
+            
+            if disk_mtime is None:
+                chunk.reset_lazy(self.generator)
+            else:
+                self.save_manager.load_chunk_data(*key, out=chunk.buffer)
+                chunk.materialized[:] = True
+                chunk.resolution = CHUNK_SIZE
+                chunk.invalidate_summaries()
+                summary = self.save_manager.load_chunk_biomes(*key)
+                if summary is not None:
+                    chunk.biome_map, chunk.biome_histogram = summary
+            
+            chunk.version = chunk.saved_version = 0
+            chunk.height_version += 1
+            chunk.source_mtime = disk_mtime
+            chunk.is_dirty = disk_mtime is None
+            chunk.mark_dirty_rect()  # Re-upload into the same texture layer
+            
+            if chunk.is_complete:
+                self.stats_index.update_chunk(chunk)
+            else:
+                self.unindexed.add(key)
+            reloaded += 1
+        
+        return reloaded
+
+    def save_snapshot(self, camera, game_hours=None):
+        """Writes every resident chunk (and the view and game time they belong to) into the session snapshot."""
+        chunks = list(self.loaded_chunks.values())
+        self.save_manager.save_snapshot(self.generator.seed, camera, chunks, game_hours)
+        self.mip_pyramid.save_stale(self.save_manager)  # Parents of the snapshot's unsaved edits
+        print(f"Snapshot written: {len(chunks)} chunks.")
+
+    def restore_snapshot(self, header, blob):
+        """
+        Bulk-fills RAM from a mapped snapshot (see SaveManager.load_snapshot()).
+        Each chunk is one memcpy from the mapped file into its arena slot.
+        Returns the restored ChunkData list (empty if the snapshot is for another seed).
+        """
+        if header.get("seed") != self.generator.seed:
+            print("Snapshot ignored: different world seed.")
+            return []
+        
+        restored = []
+        for i, (key, dirty) in enumerate(zip(header["keys"], header["dirty"])):
+            key = tuple(key)
+            if key in self.loaded_chunks:
+                continue
+            slot = self.arena.allocate()
+            if slot is not None:
+                data = self.arena.view(slot)
+                data[...] = blob[i]
+            else:
+                data = np.array(blob[i])
+            
+            chunk = ChunkData(*key, data)
+            chunk.slot = slot
+            chunk.is_dirty = dirty
+            if dirty:
+                chunk.version = 1  # Unsaved state: a reload from disk replaces it
+            else:
+                chunk.source_mtime = self.save_manager.chunk_mtime(*key)
+            self.stats_index.update_chunk(chunk)
+            self.loaded_chunks[key] = chunk
+            restored.append(chunk)
+        return restored
 
     def prune(self, visible_nodes):
         """
@@ -74,8 +636,27 @@ class DataManager:
             # If we delete a dirty chunk without saving, that work is lost.
             # However, auto-saving on prune causes stutter.
             # For now, we accept that uncached data is lost until F5 is pressed.
-            del self.loaded_chunks[key]
+            self._unload(key)
             
         # Optional debug (Uncomment to see memory cleanup in action)
         if len(to_remove) > 0:
             print(f"Pruned {len(to_remove)} chunks. RAM: {len(self.loaded_chunks)}")
+
+    def _unload(self, key):
+        """Removes a chunk from RAM and hands its arena slot back."""
+        chunk = self.loaded_chunks.pop(key)
+        refine = self.refining.pop(key, None)
+        if refine is not None:
+            refine[1].cancel()
+        if key in self.unindexed:
+            self.unindexed.discard(key)
+            if chunk.is_complete:
+                self.stats_index.update_chunk(chunk)
+        if chunk.slot is not None:
+            self.arena.release(chunk.slot)
+            chunk.slot = None
+
+    def clear(self):
+        """Drops every resident chunk (e.g. before a reload from disk)."""
+        for key in list(self.loaded_chunks.keys()):
+            self._unload(key)
@@ -1,5 +1,199 @@
-# TODO: Day 5 & 6 - Agent Classes (Herbivore, Carnivore)
-class Entity:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+import numpy as np
+from simulation.spatial_hash import SpatialHash
+
+# --- SPECIES ---
+HERBIVORE = 0
+CARNIVORE = 1
+
+# Per-species parameters, indexed by species id (Structure of Arrays style)
+# Speeds are in World Units per second (1.0 = one root chunk).
+SPECIES_SPEED = np.array([0.010, 0.015], dtype=np.float32)
+SPECIES_METABOLISM = np.array([0.020, 0.030], dtype=np.float32)  # Energy lost per second
+SPECIES_GRAZING = np.array([0.050, 0.000], dtype=np.float32)     # Energy gained per second at full biomass
+SPECIES_MAX_ENERGY = np.array([1.0, 1.5], dtype=np.float32)
+
+# Predation
+PREDATION_RADIUS = 0.01   # World Units (smaller than one level-6 chunk)
+MEAL_ENERGY = 0.6         # Energy a carnivore gains per kill
+
+SEA_LEVEL = 0.5  # Same threshold as chunk.glsl (h < 0.5 is water)
+
+
+class EntityStore:
+    """
+    Stores every agent as NumPy columns instead of one Python object each.
+    Row i of every column is agent i. Only rows [0, count) are in use.
+    Dead agents keep their row (alive=False) until compact() runs.
+    """
+    COLUMNS = {
+        'x': np.float32,
+        'y': np.float32,
+        'vx': np.float32,
+        'vy': np.float32,
+        'energy': np.float32,
+        'species': np.int8,
+        'alive': np.bool_,
+    }
+
+    def __init__(self, capacity=1024, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+        # Compact automatically once this fraction of rows is dead
+        self.compact_threshold = 0.25
+
+        # Neighbour index on the level-6 chunk grid (cell >= PREDATION_RADIUS)
+        self.spatial = SpatialHash(level=6)
+
+    # ------------------------------------------------------------------
+    # STORAGE
+    # ------------------------------------------------------------------
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def alive_count(self):
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def _reserve(self, needed):
+        """Grows every column (doubling) so 'needed' rows fit."""
+        if needed <= self.capacity:
+            return
+        new_capacity = max(needed, self.capacity * 2)
+        for name in self.COLUMNS:
+            old = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=old.dtype)
+            grown[:self.count] = old[:self.count]
+            setattr(self, name, grown)
+        self.capacity = new_capacity
+
+    def spawn(self, xs, ys, species, energy=None, vx=0.0, vy=0.0):
+        """
+        Adds a batch of agents. Scalars are broadcast over the batch.
+        Returns the row indices of the new agents.
+        """
+        xs = np.atleast_1d(np.asarray(xs, dtype=np.float32))
+        n = len(xs)
+        self._reserve(self.count + n)
+
+        rows = slice(self.count, self.count + n)
+        species = np.broadcast_to(np.asarray(species, dtype=np.int8), (n,))
+        if energy is None:
+            energy = SPECIES_MAX_ENERGY[species] * 0.5
+
+        self.x[rows] = xs
+        self.y[rows] = ys
+        self.vx[rows] = vx
+        self.vy[rows] = vy
+        self.energy[rows] = energy
+        self.species[rows] = species
+        self.alive[rows] = True
+
+        self.count += n
+        return np.arange(rows.start, rows.stop)
+
+    def despawn(self, rows):
+        """Marks agents as dead. rows: index array or boolean mask over [0, count)."""
+        self.alive[:self.count][rows] = False
+
+    def compact(self):
+        """
+        Removes dead rows by moving survivors to the front.
+        Returns the old row index of every surviving agent (new row i was old_rows[i]),
+        so external per-agent arrays can be remapped the same way.
+        """
+        old_rows = np.flatnonzero(self.alive[:self.count])
+        n = len(old_rows)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:n] = column[old_rows]
+        self.count = n
+        return old_rows
+
+    # ------------------------------------------------------------------
+    # SIMULATION
+    # ------------------------------------------------------------------
+
+    def update(self, dt, data_manager):
+        """
+        One vectorized tick for all agents:
+        1. Wander (random steering, per-species speed)
+        2. Move, refusing steps into water
+        3. Graze biomass / burn energy, starve at 0
+        4. Carnivores eat one herbivore within PREDATION_RADIUS
+        Terrain comes from chunks resident in data_manager (finest level first).
+        Agents over non-resident terrain still move but cannot feed.
+        Returns compact()'s old_rows if the tick compacted the store
+        (row indices held by the caller must be remapped), else None.
+        """
+        n = self.count
+        if n == 0:
+            return None
+
+        alive = self.alive[:n]
+        species = self.species[:n]
+        speed = SPECIES_SPEED[species]
+
+        # 1. Steering: rotate the current heading by a small random angle
+        heading = np.arctan2(self.vy[:n], self.vx[:n])
+        heading += self.rng.normal(0.0, 0.5, n).astype(np.float32)
+        vx = (np.cos(heading) * speed).astype(np.float32)
+        vy = (np.sin(heading) * speed).astype(np.float32)
+
+        # 2. Movement with water avoidance
+        new_x = self.x[:n] + vx * dt
+        new_y = self.y[:n] + vy * dt
+        terrain = data_manager.sample_resident(new_x, new_y, (0, 3))
+        height, biomass = terrain[:, 0], terrain[:, 1]
+
+        blocked = height < SEA_LEVEL  # NaN (unknown terrain) compares False
+        moving = alive & ~blocked
+        self.x[:n] = np.where(moving, new_x, self.x[:n])
+        self.y[:n] = np.where(moving, new_y, self.y[:n])
+
+        # Turn around on the shore
+        self.vx[:n] = np.where(blocked, -vx, vx)
+        self.vy[:n] = np.where(blocked, -vy, vy)
+
+        # 3. Energy budget
+        food = np.nan_to_num(biomass, nan=0.0) * SPECIES_GRAZING[species]
+        energy = self.energy[:n] + (food - SPECIES_METABOLISM[species]) * dt
+        self.energy[:n] = np.minimum(energy, SPECIES_MAX_ENERGY[species])
+
+        alive &= self.energy[:n] > 0.0
+
+        # 4. Predation (neighbour search through the spatial hash)
+        self.spatial.rebuild(self.x[:n], self.y[:n])
+        hunters = np.flatnonzero(alive & (species == CARNIVORE))
+        if len(hunters):
+            offsets, prey = self.spatial.query_radius(
+                self.x[hunters], self.y[hunters], PREDATION_RADIUS, exclude=hunters)
+            hunter = np.repeat(hunters, np.diff(offsets))
+
+            edible = alive[prey] & (species[prey] == HERBIVORE)
+            hunter, prey = hunter[edible], prey[edible]
+
+            # Each prey dies once, each hunter eats once per tick.
+            # Resolved with scatter writes (last write wins) instead of sorting.
+            claim = np.full(n, -1, dtype=np.int64)
+            claim[prey] = hunter
+            won = claim[prey] == hunter
+            hunter, prey = hunter[won], prey[won]
+            claim[hunter] = prey
+            won = claim[hunter] == prey
+            hunter, prey = hunter[won], prey[won]
+
+            alive[prey] = False
+            self.energy[hunter] = np.minimum(self.energy[hunter] + MEAL_ENERGY,
+                                             SPECIES_MAX_ENERGY[CARNIVORE])
+
+        dead = n - np.count_nonzero(alive)
+        if dead > n * self.compact_threshold:
+            return self.compact()
+        return None
+
@@ -0,0 +1,297 @@
+import numpy as np
+from config import (CHUNK_SIZE, EROSION_ITERATIONS_PER_FRAME, EROSION_ITERATIONS_PER_CHUNK,
+                    EROSION_MIN_LEVEL, EROSION_MAX_CHUNKS, EROSION_HALO, EROSION_PUBLISH_STEPS)
+
+# Grid-based erosion (whole-array NumPy kernels, no per-droplet Python loop).
+# Every cell exchanges water, sediment and material with its 4 neighbours
+# in one vectorized step, so a step costs the same for 1 or 1000 rivers.
+
+SEA_LEVEL = 0.5
+
+# Neighbour directions as (dy, dx): right, left, up, down (row index grows with y)
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+def _neighbours(field, pad):
+    """
+    The 4 neighbour values of every cell as views into 'pad' ((H+2, W+2) scratch),
+    in DIRECTIONS order. Edges repeat, so nothing flows across the mosaic border.
+    """
+    pad[1:-1, 1:-1] = field
+    pad[0, 1:-1] = field[0]
+    pad[-1, 1:-1] = field[-1]
+    pad[1:-1, 0] = field[:, 0]
+    pad[1:-1, -1] = field[:, -1]
+    return (pad[1:-1, 2:], pad[1:-1, :-2], pad[2:, 1:-1], pad[:-2, 1:-1])
+
+
+def _gather(outflows, pad):
+    """What every cell receives: outflow towards direction d arrives from the opposite neighbour."""
+    pad.fill(0.0)
+    for (dy, dx), out in zip(DIRECTIONS, outflows):
+        pad[1 + dy:pad.shape[0] - 1 + dy, 1 + dx:pad.shape[1] - 1 + dx] += out
+    return pad[1:-1, 1:-1]
+
+
+class ErosionSimulator:
+    def __init__(self, data_manager, iterations_per_frame=EROSION_ITERATIONS_PER_FRAME,
+                 iterations_per_chunk=EROSION_ITERATIONS_PER_CHUNK):
+        self.data_manager = data_manager
+
+        # Budget: steps per update() call, and total steps a chunk receives
+        self.iterations_per_frame = iterations_per_frame
+        self.iterations_per_chunk = iterations_per_chunk
+        self.min_level = EROSION_MIN_LEVEL
+        self.max_chunks = EROSION_MAX_CHUNKS
+        self.halo = EROSION_HALO
+        self.publish_steps = EROSION_PUBLISH_STEPS
+
+        # Hydraulic Constants (per step, heights relative to sea level x 2^level)
+        self.rain = 0.002           # Water added to every cell
+        self.flow_rate = 0.25       # Fraction of the surface drop that flows per step
+        self.capacity = 100.0       # Sediment carried per unit of flux and slope
+        self.erosion_rate = 0.1     # How fast under-loaded water picks up material
+        self.deposition_rate = 0.1  # How fast over-loaded water drops it
+        self.evaporation = 0.02     # Fraction of water lost per step
+
+        # Thermal Constants
+        self.talus = 0.01           # Max stable height difference between neighbour pixels
+        self.thermal_rate = 0.25    # Fraction of the excess that slides per step
+
+        # Steps done per chunk key (persisted with the save, see save()/load())
+        self.progress = {}
+
+        # Water + sediment of the resident chunks: key -> (64, 64, 2)
+        # Dropped when the chunk leaves RAM (same policy as DataManager.prune)
+        self.fields = {}
+
+        # Steps already written into a chunk's height but not yet published
+        # (mark_chunk_edited: stats, mip pyramid, texture upload): key -> steps
+        self.pending = {}
+
+        # Height of non-resident neighbours read for the halo: key -> (64, 64)
+        self.context = {}
+
+        self._next_level = 0
+
+    # ------------------------------------------------------------------
+    # KERNELS (any (H, W) float32 arrays, modified in place)
+    # ------------------------------------------------------------------
+
+    def hydraulic_step(self, height, water, sediment, sea_level=SEA_LEVEL, pad=None):
+        pad = np.empty((height.shape[0] + 2, height.shape[1] + 2), dtype=np.float32) if pad is None else pad
+        
+        # 1. Rain
+        water += np.float32(self.rain)
+
+        # 2. Outflow to lower neighbours, proportional to the drop of the water surface
+        surface = height + water
+        drops = [np.maximum(surface - n, 0.0) for n in _neighbours(surface, pad)]
+        total_drop = drops[0] + drops[1] + drops[2] + drops[3]
+        # Never move more water than the cell holds
+        scale = np.minimum(np.float32(self.flow_rate), water / np.maximum(total_drop, np.float32(1e-12)))
+        outflows = [d * scale for d in drops]
+        flux = outflows[0] + outflows[1] + outflows[2] + outflows[3]
+
+        # 3. Erode / deposit towards the carrying capacity of the moving water
+        #    (faster water on steeper ground carries more)
+        n = _neighbours(height, pad)
+        slope = np.maximum(np.maximum(height - n[0], height - n[1]), np.maximum(height - n[2], height - n[3]))
+        np.maximum(slope, 0.0, out=slope)
+        capacity = np.float32(self.capacity) * flux * slope
+        excess = sediment - capacity
+        rate = np.where(excess > 0.0, np.float32(self.deposition_rate), np.float32(self.erosion_rate))
+        change = np.maximum(rate * excess, np.float32(-0.5) * slope)  # Never dig below the lowest neighbour
+        height += change
+        sediment -= change
+
+        # 4. Transport: sediment travels with its share of the water
+        load = sediment / np.maximum(water, np.float32(1e-12))  # Sediment per unit of water
+        water -= flux
+        water += _gather(outflows, pad)
+        sediment -= flux * load
+        sediment += _gather([out * load for out in outflows], pad)
+
+        # 5. Evaporation; the sea swallows water and keeps its sediment
+        water *= np.float32(1.0 - self.evaporation)
+        sea = height < sea_level
+        height[sea] += sediment[sea]
+        sediment[sea] = 0.0
+        water[sea] = 0.0
+
+    def thermal_step(self, height, pad=None):
+        """Material above the talus angle slides to lower neighbours."""
+        pad = np.empty((height.shape[0] + 2, height.shape[1] + 2), dtype=np.float32) if pad is None else pad
+        talus = np.float32(self.talus)
+        # Each neighbour gets its share; at most half the largest excess leaves (no overshoot)
+        share = np.float32(self.thermal_rate * 0.5)
+        slides = [np.maximum(height - n - talus, 0.0) * share for n in _neighbours(height, pad)]
+        height -= slides[0] + slides[1] + slides[2] + slides[3]
+        height += _gather(slides, pad)
+
+    def step(self, height, water, sediment, iterations=1, relief=1.0):
+        """
+        Runs full erosion steps on (H, W) float32 arrays (a chunk or a stitched mosaic).
+        relief: Height exaggeration for the run. Finer levels have flatter
+                pixels (2x per level), so heights are scaled by 2^level to keep
+                the constants meaning the same slope on every level.
+        """
+        pad = np.empty((height.shape[0] + 2, height.shape[1] + 2), dtype=np.float32)
+        # Work relative to sea level: small magnitudes keep float32 steps exact
+        height -= np.float32(SEA_LEVEL)
+        height *= np.float32(relief)
+        for _ in range(iterations):
+            self.hydraulic_step(height, water, sediment, 0.0, pad)
+            self.thermal_step(height, pad)
+        height /= np.float32(relief)
+        height += np.float32(SEA_LEVEL)
+
+    # ------------------------------------------------------------------
+    # CHUNKS
+    # ------------------------------------------------------------------
+
+    def update(self, budget=None):
+        """
+        Incremental erosion of the resident chunks. Call once per frame.
+        Spends at most 'budget' steps (default: iterations_per_frame) on one
+        group of same-level chunks that are not finished yet.
+        Returns the number of chunks published.
+        """
+        budget = self.iterations_per_frame if budget is None else budget
+        resident = self.data_manager.loaded_chunks
+
+        # Forget state of chunks that left RAM
+        for key in [k for k in self.fields if k not in resident]:
+            del self.fields[key]
+            self.pending.pop(key, None)
+
+        # 1. Unfinished, fully generated chunks by level
+        levels = {}
+        for key, chunk in resident.items():
+            if key[2] < self.min_level or chunk.is_preview:
+                continue
+            if key not in self.fields and chunk.regenerated:
+                # Fresh from the generator (not disk/snapshot): earlier erosion was never saved
+                # (checked before this object was eroded: fields exist from then on)
+                self.progress.pop(key, None)
+            if self.progress.get(key, 0) + self.pending.get(key, 0) < self.iterations_per_chunk:
+                levels.setdefault(key[2], []).append(key)
+        if not levels or budget <= 0:
+            return 0
+
+        # 2. Round-robin over levels
+        order = sorted(levels)
+        level = next((l for l in order if l >= self._next_level), order[0])
+        self._next_level = level + 1
+        keys = sorted(levels[level])[:self.max_chunks]
+
+        remaining = min(self.iterations_per_chunk - self.progress.get(k, 0) - self.pending.get(k, 0)
+                        for k in keys)
+        iterations = min(budget, remaining, self.halo)
+        return self.run(keys, iterations)
+
+    def run(self, keys, iterations):
+        """
+        Erodes the given chunks (one level) together for 'iterations' steps:
+        stitches them plus a halo of their neighbours into one mosaic, so rivers
+        cross chunk borders, then writes layer 0 of the resident ones back.
+        Returns the number of chunks published.
+        """
+        level = keys[0][2]
+        halo = self.halo
+        xs = [k[0] for k in keys]
+        ys = [k[1] for k in keys]
+        x0, y0 = min(xs), min(ys)
+        w, h = max(xs) - x0 + 1, max(ys) - y0 + 1
+
+        # 1. Stitch height / water / sediment, with a halo from the neighbours
+        size_y, size_x = h * CHUNK_SIZE + 2 * halo, w * CHUNK_SIZE + 2 * halo
+        height = np.empty((size_y, size_x), dtype=np.float32)
+        water = np.zeros((size_y, size_x), dtype=np.float32)
+        sediment = np.zeros((size_y, size_x), dtype=np.float32)
+
+        used_context = set()
+        for gy in range(-1, h + 1):
+            for gx in range(-1, w + 1):
+                # Mosaic pixels of this chunk (clipped to the halo for the ring around the block)
+                my0, mx0 = halo + gy * CHUNK_SIZE, halo + gx * CHUNK_SIZE
+                cy0, cx0 = max(my0, 0), max(mx0, 0)
+                cy1, cx1 = min(my0 + CHUNK_SIZE, size_y), min(mx0 + CHUNK_SIZE, size_x)
+                src = (slice(cy0 - my0, cy1 - my0), slice(cx0 - mx0, cx1 - mx0))
+                dst = (slice(cy0, cy1), slice(cx0, cx1))
+
+                key = (x0 + gx, y0 + gy, level)
+                height[dst] = self._height(key, used_context)[src]
+                field = self.fields.get(key)
+                if field is not None:
+                    water[dst] = field[src + (0,)]
+                    sediment[dst] = field[src + (1,)]
+
+        # Context of chunks that are no longer around a block is dropped
+        for key in [k for k in self.context if k not in used_context]:
+            del self.context[key]
+
+        # 2. Simulate
+        self.step(height, water, sediment, iterations, relief=2.0 ** level)
+
+        # 3. Write back the interior into the resident chunks
+        finished = []
+        for key in keys:
+            chunk = self.data_manager.loaded_chunks.get(key)
+            if chunk is None:
+                continue
+            gx, gy = key[0] - x0, key[1] - y0
+            region = (slice(halo + gy * CHUNK_SIZE, halo + (gy + 1) * CHUNK_SIZE),
+                      slice(halo + gx * CHUNK_SIZE, halo + (gx + 1) * CHUNK_SIZE))
+            chunk.get_layers(0, 1)[:, :, 0] = height[region]
+            field = self.fields.setdefault(key, np.zeros((CHUNK_SIZE, CHUNK_SIZE, 2), dtype=np.float32))
+            field[:, :, 0] = water[region]
+            field[:, :, 1] = sediment[region]
+            self.pending[key] = self.pending.get(key, 0) + iterations
+            if (self.pending[key] >= self.publish_steps
+                    or self.progress.get(key, 0) + self.pending[key] >= self.iterations_per_chunk):
+                finished.append(key)
+
+        # 4. Publish in batches: every edit re-summarizes the chunk and rebuilds
+        #    its mip ancestors, far more than one erosion step costs
+        return self.publish(finished)
+
+    def publish(self, keys=None):
+        """
+        Announces the pending height changes of 'keys' (default: all) as edits,
+        so statistics, parent levels and the GPU copy catch up.
+        Returns the number of chunks published.
+        """
+        keys = list(self.pending) if keys is None else keys
+        published = 0
+        for key in keys:
+            steps = self.pending.pop(key, 0)
+            chunk = self.data_manager.loaded_chunks.get(key)
+            if not steps or chunk is None:
+                continue
+            self.data_manager.mark_chunk_edited(chunk, layers=[0])
+            self.progress[key] = self.progress.get(key, 0) + steps
+            published += 1
+        return published
+
+    def _height(self, key, used_context):
+        """Height layer of a chunk: resident data, else a cached read-only copy (disk/generator)."""
+        chunk = self.data_manager.loaded_chunks.get(key)
+        if chunk is not None and not chunk.is_preview:
+            return chunk.get_layers(0, 1)[:, :, 0]
+        used_context.add(key)
+        if key not in self.context:
+            self.context[key] = self.data_manager.fetch_chunk(*key).get_layers(0, 1)[:, :, 0].copy()
+        return self.context[key]
+
+    # ------------------------------------------------------------------
+    # PERSISTENCE
+    # ------------------------------------------------------------------
+
+    def save(self, save_manager):
+        """Call after the chunks were saved: their unpublished steps are already on disk."""
+        self.publish()
+        save_manager.save_chunk_table("erosion", self.progress)
+
+    def load(self, save_manager):
+        self.progress = {key: int(v) for key, v in save_manager.load_chunk_table("erosion").items()}
@@ -1,6 +1,5 @@
 import numpy as np
-import noise
-import math
+from utils.noise import pnoise2
 from config import CHUNK_SIZE
 
 class TerrainGenerator:
@@ -28,12 +27,25 @@ class TerrainGenerator:
             'air_t':  300000,
             'air_h':  350000
         }
+        
+        # Layer index -> (offset name, scale_mod, octaves) for the plain noise layers.
+        # Layer 0 (Height) has its own curve, see _height_layer().
+        self.layer_specs = {
+            1: ('temp',   0.5, 2),
+            2: ('hum',    0.5, 2),
+            3: ('bio',    2.0, 1),
+            4: ('wind_x', 0.3, 2),
+            5: ('wind_y', 0.3, 2),
+            6: ('air_t',  0.4, 2),
+            7: ('air_h',  1.5, 2),
+        }
 
     def _get_noise(self, gx, gy, offset, scale_mod=1.0, octaves=2):
         """
         Helper method to generate specific noise layers.
+        gx, gy broadcast (a row and a column vector give a full grid).
         """
-        return noise.pnoise2(
+        return pnoise2(
             (gx + offset) * scale_mod, 
             (gy + offset) * scale_mod, 
             octaves=octaves, 
@@ -41,84 +53,115 @@ class TerrainGenerator:
             lacunarity=2.0
         )
 
-    def generate_chunk_data(self, cx, cy, level):
+    def _height_layer(self, gx, gy):
+        # 1. Raw Height Noise (-1.0 to 1.0)
+        n_height = pnoise2(
+            gx, 
+            gy, 
+            octaves=self.octaves, 
+            persistence=self.persistence, 
+            lacunarity=self.lacunarity
+        ).astype(np.float64)
+        
+        # 2. Normalize to 0.0 -> 1.0
+        h_norm = (n_height + 1) / 2.0
+        
+        # 3. Apply Polynomial Curve (x^3 + x)
+        # This creates a "rolling" slope at sea level (linear) 
+        # but still gets steeper towards peaks and trenches.
+        
+        # Shift to -1..1 (and clamp to prevent noise artifacts exploding)
+        h_signed = np.clip((h_norm - 0.5) * 2.0, -1.0, 1.0)
+        
+        # Apply f(x) = x^3 + x
+        # Resulting range is approx -2.0 to 2.0
+        h_poly = (h_signed ** 3) + h_signed
+        
+        # Normalize polynomial result back to -1..1
+        # We divide by 2.0 because the max possible value is (1^3 + 1) = 2
+        h_curved = h_poly / 2.0
+        
+        # Shift back to 0..1 for storage
+        return (h_curved / 2.0) + 0.5
+
+    def _pixel_coords(self, cx, cy, level, resolution):
         """
-        Generates an 8-channel data chunk (Float32).
+        World noise coordinates of the sampled pixels.
+        Scalars -> row vector (1, res) for x and column vector (res, 1) for y.
+        Arrays of N chunks -> (N, 1, res) and (N, res, 1).
+        Same arithmetic as the original per-pixel loop, so results are identical.
         """
+        cx = np.asarray(cx)[..., None, None]
+        cy = np.asarray(cy)[..., None, None]
+        level = np.asarray(level)[..., None, None]
+        
         # 1. Calculate Step Size
-        step = self.base_scale / (2 ** level)
+        step = self.base_scale / (2.0 ** level)
         
         # 2. Base World Offsets
         base_wx = (cx * CHUNK_SIZE * step) + self.seed
         base_wy = (cy * CHUNK_SIZE * step) + self.seed
         
-        # 3. Pre-allocate array
-        data = np.zeros((CHUNK_SIZE, CHUNK_SIZE, 8), dtype=np.float32)
-        
-        # 4. Loop through pixels
-        for y in range(CHUNK_SIZE):
-            global_y = base_wy + (y * step)
-            
-            for x in range(CHUNK_SIZE):                
-                global_x = base_wx + (x * step)
-                
-                # --- TERRAIN GENERATION (Layers 0-3) ---
-                                
-                # 1. Raw Height Noise (-1.0 to 1.0)
-                n_height = noise.pnoise2(
-                    global_x, 
-                    global_y, 
-                    octaves=self.octaves, 
-                    persistence=self.persistence, 
-                    lacunarity=self.lacunarity
-                )
-                
-                # 2. Normalize to 0.0 -> 1.0
-                h_norm = (n_height + 1) / 2.0
-                
-                # 3. Apply Polynomial Curve (x^3 + x)
-                # This creates a "rolling" slope at sea level (linear) 
-                # but still gets steeper towards peaks and trenches.
-                
-                # Shift to -1..1 (and clamp to prevent noise artifacts exploding)
-                h_signed = max(-1.0, min(1.0, (h_norm - 0.5) * 2.0))
-                
-                # Apply f(x) = x^3 + x
-                # Resulting range is approx -2.0 to 2.0
-                h_poly = (h_signed ** 3) + h_signed
-                
-                # Normalize polynomial result back to -1..1
-                # We divide by 2.0 because the max possible value is (1^3 + 1) = 2
-                h_curved = h_poly / 2.0
-                
-                # Shift back to 0..1 for storage
-                h_final = (h_curved / 2.0) + 0.5                
-                # ----------------------------------------------------
+        # 3. Pixel coordinates (every 'factor'-th pixel for previews)
+        factor = CHUNK_SIZE // resolution
+        pixels = np.arange(0, CHUNK_SIZE, factor, dtype=np.float64)
+        global_x = base_wx + pixels[None, :] * step
+        global_y = base_wy + pixels[:, None] * step
+        return global_x, global_y
 
-                # Temperature
-                n_temp = self._get_noise(global_x, global_y, self.offsets['temp'], scale_mod=0.5)
-                
-                # Humidity
-                n_hum = self._get_noise(global_x, global_y, self.offsets['hum'], scale_mod=0.5)
-                
-                # Biomass
-                n_bio = self._get_noise(global_x, global_y, self.offsets['bio'], scale_mod=2.0, octaves=1)
+    def _layer_values(self, global_x, global_y, layer):
+        if layer == 0:
+            # --- TERRAIN HEIGHT (curved) ---
+            return self._height_layer(global_x, global_y)
+        
+        # --- OTHER TERRAIN (1-3) / ATMOSPHERE (4-7) LAYERS ---
+        name, scale_mod, octaves = self.layer_specs[layer]
+        n = self._get_noise(global_x, global_y, self.offsets[name], scale_mod, octaves)
+        return (n.astype(np.float64) + 1) / 2.0
 
-                # --- ATMOSPHERE GENERATION (Layers 4-7) ---
-                n_wx = self._get_noise(global_x, global_y, self.offsets['wind_x'], scale_mod=0.3)
-                n_wy = self._get_noise(global_x, global_y, self.offsets['wind_y'], scale_mod=0.3)
-                n_at = self._get_noise(global_x, global_y, self.offsets['air_t'], scale_mod=0.4)
-                n_ah = self._get_noise(global_x, global_y, self.offsets['air_h'], scale_mod=1.5)
+    def generate_layers(self, cx, cy, level, layers, out=None, resolution=CHUNK_SIZE):
+        """
+        Generates only the requested layers of a chunk (vectorized, one noise call per layer).
+        layers: Layer indices to compute (0: Height ... 7: Air Hum)
+        out: Optional (64, 64, 8) Float32 array; channels not listed are left untouched.
+        resolution: Samples per side. Below CHUNK_SIZE only every (64 / resolution)-th
+                    pixel is computed and repeated into its block (fast preview).
+        Returns the (64, 64, 8) array.
+        """
+        global_x, global_y = self._pixel_coords(cx, cy, level, resolution)
+        factor = CHUNK_SIZE // resolution
+        
+        data = out if out is not None else np.zeros((CHUNK_SIZE, CHUNK_SIZE, 8), dtype=np.float32)
+        
+        for layer in layers:
+            values = self._layer_values(global_x, global_y, layer)
+            if factor > 1:
+                # Preview: each sample fills a factor x factor block
+                values = np.repeat(np.repeat(values, factor, axis=0), factor, axis=1)
+            data[:, :, layer] = values
+        
+        return data
 
-                # --- STORAGE ---
-                data[y, x, 0] = h_final  # Storing the curved height
-                data[y, x, 1] = (n_temp + 1) / 2.0
-                data[y, x, 2] = (n_hum + 1) / 2.0
-                data[y, x, 3] = (n_bio + 1) / 2.0
-                
-                data[y, x, 4] = (n_wx + 1) / 2.0 
-                data[y, x, 5] = (n_wy + 1) / 2.0 
-                data[y, x, 6] = (n_at + 1) / 2.0
-                data[y, x, 7] = (n_ah + 1) / 2.0
+    def generate_previews(self, keys, resolution, outs):
+        """
+        Coarse previews (all 8 layers) of many chunks in one batch.
+        At preview sizes the cost is per noise call, not per pixel, so
+        batching N chunks into each call is what makes previews cheap.
+        keys: list of (x, y, level); outs: matching (64, 64, 8) arrays to fill.
+        """
+        keys = np.asarray(keys, dtype=np.int64).reshape(-1, 3)
+        global_x, global_y = self._pixel_coords(keys[:, 0], keys[:, 1], keys[:, 2], resolution)
+        factor = CHUNK_SIZE // resolution
+        
+        for layer in range(8):
+            values = self._layer_values(global_x, global_y, layer)
+            values = np.repeat(np.repeat(values, factor, axis=1), factor, axis=2)
+            for out, block in zip(outs, values):
+                out[:, :, layer] = block
 
-        return data
+    def generate_chunk_data(self, cx, cy, level, out=None):
+        """
+        Generates an 8-channel data chunk (Float32).
+        out: Optional (64, 64, 8) Float32 array to write into (e.g. a ChunkArena slot).
+        """
+        return self.generate_layers(cx, cy, level, range(8), out=out)
@@ -0,0 +1,165 @@
+import numpy as np
+from config import CHUNK_SIZE
+
+HALF = CHUNK_SIZE // 2
+
+
+def downsample_2x2(layers):
+    """(H, W, C) -> (H/2, W/2, C) by averaging each 2x2 pixel block."""
+    h, w, c = layers.shape
+    return layers.reshape(h // 2, 2, w // 2, 2, c).mean(axis=(1, 3), dtype=np.float32)
+
+
+class MipPyramid:
+    """
+    Keeps coarse chunks consistent with edits made to finer ones.
+
+    Every LOD level is generated independently from noise, so an edit at
+    level L is invisible when zoomed out. mark_dirty() queues the edited chunk;
+    flush() then rebuilds, level by level from the finest, the quadrant each
+    dirty child covers in its parent (2x2 downsample), up to level 0.
+    Many edits in one frame cost one pass per ancestor.
+    Only resident ancestors are rebuilt right away; the others are marked
+    stale and rebuilt when loaded, so the save changes only with save().
+    """
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+
+        # level -> {parent key -> set of child quadrants (qx, qy) to rebuild}
+        self.pending = {}
+
+        # Ancestors that were not in RAM when a child changed:
+        # key -> set of child quadrants that are out of date.
+        # Nothing is generated or written for them per frame; they are rebuilt
+        # when loaded (on_load) or read (DataManager.fetch_chunk), and only
+        # reach the disk with the save (save()).
+        self.stale = {}
+
+    def mark_dirty(self, key):
+        """Queues the parent quadrant covered by chunk 'key' = (x, y, level)."""
+        x, y, level = key
+        if level == 0:
+            return
+        parent = (x // 2, y // 2, level - 1)
+        self.pending.setdefault(level - 1, {}).setdefault(parent, set()).add((x & 1, y & 1))
+
+    def flush(self):
+        """
+        Processes all queued edits. Call once per frame.
+        Returns the number of resident ancestor chunks rebuilt.
+        """
+        # Stale chunks that became resident without get_chunk() (previews, snapshot)
+        resident = self.data_manager.loaded_chunks
+        for key in [k for k in self.stale if k in resident]:
+            self.on_load(resident[key])
+
+        rebuilt = 0
+        while self.pending:
+            # Finest level first: its parents queue the next level up
+            level = max(self.pending)
+            parents = self.pending.pop(level)
+            for parent_key, quadrants in parents.items():
+                if self._rebuild(parent_key, quadrants):
+                    rebuilt += 1
+        return rebuilt
+
+    def _child_layers(self, key):
+        """Child data from RAM or Disk only (never regenerated: it would not hold the edit)."""
+        dm = self.data_manager
+        chunk = dm.loaded_chunks.get(key)
+        if chunk is not None:
+            return chunk.height_map
+        if key in self.stale:
+            return dm.fetch_chunk(*key).height_map  # Rebuilt copy of a stale child
+        return dm.save_manager.load_chunk_data(*key)
+
+    def _downsample_into(self, chunk, quadrants):
+        """
+        Overwrites each quadrant of 'chunk' with its downsampled child.
+        Returns the changed pixel rects.
+        """
+        px, py, level = chunk.x, chunk.y, chunk.level
+        # (child y*2+1 is the upper half: rows HALF..CHUNK_SIZE)
+        changed = []
+        for qx, qy in quadrants:
+            child = self._child_layers((px * 2 + qx, py * 2 + qy, level + 1))
+            if child is None:
+                continue
+            chunk.height_map[qy * HALF:(qy + 1) * HALF, qx * HALF:(qx + 1) * HALF] = downsample_2x2(child)
+            changed.append((qx * HALF, qy * HALF, (qx + 1) * HALF, (qy + 1) * HALF))
+        return changed
+
+    def _rebuild(self, parent_key, quadrants):
+        dm = self.data_manager
+
+        # 1. Parent not in RAM: only remember what is out of date (and its own parent)
+        chunk = dm.loaded_chunks.get(parent_key)
+        if chunk is None:
+            self.stale.setdefault(parent_key, set()).update(quadrants)
+            dm.sample_cache.pop(parent_key, None)
+            dm.biome_cache.pop(parent_key, None)
+            self.mark_dirty(parent_key)
+            return False
+
+        # 2. Overwrite each dirty quadrant with the downsampled child
+        changed = self._downsample_into(chunk, quadrants)
+        if not changed:
+            return False
+
+        # 3. Publish the change (queues this chunk's own parent via mark_dirty)
+        for rect in changed[1:]:
+            chunk.mark_dirty_rect(rect)
+        dm.mark_chunk_edited(chunk, changed[0])
+        return True
+
+    def apply_stale(self, chunk, keep=False):
+        """
+        Rebuilds the out-of-date quadrants of a stale chunk in place.
+        keep=True leaves it marked stale (temporary copies, see DataManager.fetch_chunk).
+        Returns the changed pixel rects (empty if the chunk was not stale).
+        """
+        key = (chunk.x, chunk.y, chunk.level)
+        quadrants = self.stale.get(key) if keep else self.stale.pop(key, None)
+        if not quadrants:
+            return []
+        return self._downsample_into(chunk, quadrants)
+
+    def on_load(self, chunk):
+        """DataManager load hook: a stale chunk catches up with its children before it is drawn."""
+        changed = self.apply_stale(chunk)
+        if changed:
+            for rect in changed[1:]:
+                chunk.mark_dirty_rect(rect)
+            self.data_manager.mark_chunk_edited(chunk, changed[0])
+
+    def save(self):
+        """
+        Rebuilds every stale ancestor and writes it to disk, finest level first
+        (so each level reads its already saved children). Part of the save
+        (DataManager.save_all_loaded_chunks). Returns the number of chunks written.
+        """
+        dm = self.data_manager
+        self.flush()
+        keys = sorted(self.stale, key=lambda k: k[2], reverse=True)
+        for key in keys:
+            chunk = dm.fetch_chunk(*key)  # Copy with the stale quadrants rebuilt
+            del self.stale[key]
+            dm.save_manager.save_chunk(chunk)
+            dm.stats_index.update_chunk(chunk)
+            dm.sample_cache.pop(key, None)
+            dm.biome_cache.pop(key, None)
+        return len(keys)
+
+    # ------------------------------------------------------------------
+    # PERSISTENCE (stale marks outlive the session with the snapshot)
+    # ------------------------------------------------------------------
+
+    def save_stale(self, save_manager):
+        # Quadrant set -> bit mask (bit qx + 2 * qy)
+        table = {key: sum(1 << (qx + 2 * qy) for qx, qy in quadrants)
+                 for key, quadrants in self.stale.items()}
+        save_manager.save_chunk_table("mip_stale", table)
+
+    def load_stale(self, save_manager):
+        self.stale = {key: {(bit & 1, bit >> 1) for bit in range(4) if int(mask) >> bit & 1}
+                      for key, mask in save_manager.load_chunk_table("mip_stale").items()}
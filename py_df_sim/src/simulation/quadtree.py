@@ -19,12 +19,24 @@ class QuadtreeNode:
         return (self.x * s, self.y * s)
 
 class QuadtreeManager:
-    def __init__(self):
+    def __init__(self, split_threshold=None, merge_threshold=None, min_residency=None):
         self.visible_nodes = []
         self.max_level = 6
+        
+        # LOD hysteresis (see config): split above one threshold, merge below a lower one
+        self.split_threshold = config.LOD_SPLIT_THRESHOLD if split_threshold is None else split_threshold
+        self.merge_threshold = config.LOD_MERGE_THRESHOLD if merge_threshold is None else merge_threshold
+        self.min_residency = config.LOD_MIN_RESIDENCY_FRAMES if min_residency is None else min_residency
+        
+        # Split state of the nodes in view: key -> frame of the last split/merge
+        self.split_nodes = {}
+        self.merged_at = {}  # Nodes drawn whole: key -> frame they were merged
+        self.frame = 0
 
     def update(self, cam_pos, cam_zoom):
         self.visible_nodes = []
+        self.frame += 1
+        self._seen = set()
         
         # --- 1. ASPECT RATIO CORRECTION ---
         aspect = config.SCREEN_HEIGHT / config.SCREEN_WIDTH
@@ -61,6 +73,11 @@ class QuadtreeManager:
                 # Pass the calculated boundaries for culling
                 view_rect = {'l': x_min, 'r': x_max, 'b': y_min, 't': y_max}
                 self._process_node(root, cam_zoom, view_rect)
+        
+        # 4. Forget decisions of nodes that left the view
+        for state in (self.split_nodes, self.merged_at):
+            for key in [k for k in state if k not in self._seen]:
+                del state[key]
 
     def _process_node(self, node, zoom, view_rect):
         u, v = node.uv_pos
@@ -72,10 +89,33 @@ class QuadtreeManager:
             v > view_rect['t'] or v + s < view_rect['b']):
             return
 
-        # Heuristic: Split if covers > 75% of screen
-        should_split = (s * zoom) > 0.75
+        key = (node.x, node.y, node.level)
+        self._seen.add(key)
+        
+        # Heuristic: Split if covers a large part of the screen (with hysteresis)
+        coverage = s * zoom
+        split_at = self.split_nodes.get(key)
+        if split_at is not None:
+            # Currently split: stay split until clearly zoomed out
+            should_split = coverage >= self.merge_threshold
+            if not should_split and self.frame - split_at < self.min_residency:
+                should_split = True  # Children are too fresh to be merged again
+        else:
+            should_split = coverage > self.split_threshold
+            merged_at = self.merged_at.get(key)
+            if should_split and merged_at is not None and self.frame - merged_at < self.min_residency:
+                should_split = False  # Merged too recently to split again
+        should_split = should_split and node.level < self.max_level
+        
+        # Record changes of the decision
+        if should_split and split_at is None:
+            self.split_nodes[key] = self.frame
+            self.merged_at.pop(key, None)
+        elif not should_split and split_at is not None:
+            del self.split_nodes[key]
+            self.merged_at[key] = self.frame
 
-        if should_split and node.level < self.max_level:
+        if should_split:
             cx, cy = node.x * 2, node.y * 2
             lvl = node.level + 1
             
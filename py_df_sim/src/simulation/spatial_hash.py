@@ -0,0 +1,243 @@
+import numpy as np
+
+# Cell coordinates are packed into one int64 key: (cell_x << 32) + (cell_y + 2^31)
+# (the bias keeps the low half non-negative, so keys decode and sort as (x, y))
+_KEY_SHIFT = np.int64(1 << 32)
+_KEY_BIAS = np.int64(1 << 31)
+
+
+class SpatialHash:
+    """
+    Uniform-grid index for 2D points (agents), aligned to the Quadtree chunk grid.
+    A cell is one chunk of 'level' split into cells_per_chunk x cells_per_chunk.
+
+    Layout (all NumPy, no per-point Python objects):
+      order       - point indices sorted by cell key
+      cell_keys   - unique occupied cell keys (sorted)
+      cell_starts - offset of each cell's first point inside 'order'
+      cell_counts - number of points in each cell
+      cell_grid   - dense (rows, cols) table of cell positions over the
+                    occupied bounding box, -1 = empty (O(1) cell lookup)
+    """
+    # Above this many bounding-box cells, fall back to binary search
+    MAX_DENSE_CELLS = 1 << 22
+
+    def __init__(self, level=4, cells_per_chunk=1):
+        self.level = level
+        self.cells_per_chunk = cells_per_chunk
+        self.cell_size = 1.0 / (2 ** level) / cells_per_chunk
+
+        self.xs = np.zeros(0, dtype=np.float32)
+        self.ys = np.zeros(0, dtype=np.float32)
+        self.order = np.zeros(0, dtype=np.int64)
+        self.cell_keys = np.zeros(0, dtype=np.int64)
+        self.cell_starts = np.zeros(0, dtype=np.int64)
+        self.cell_counts = np.zeros(0, dtype=np.int64)
+        self.cell_grid = None
+        self.grid_origin = (0, 0)
+
+        # Query batch size (bounds the candidate-pair temporaries)
+        self.batch_size = 32768
+
+    def _cells(self, xs, ys):
+        cx = np.floor(xs / self.cell_size).astype(np.int64)
+        cy = np.floor(ys / self.cell_size).astype(np.int64)
+        return cx, cy
+
+    def _keys(self, xs, ys):
+        cx, cy = self._cells(xs, ys)
+        return cx * _KEY_SHIFT + (cy + _KEY_BIAS)
+
+    def rebuild(self, xs, ys):
+        """
+        Indexes the points (xs, ys). Call once per tick.
+        If the point count is unchanged, the previous order is reused as the
+        starting permutation: agents rarely change cell between ticks, so the
+        keys are already (almost) sorted and the stable sort only fixes the
+        few that moved. Returns the number of points that changed cell.
+        """
+        self.xs = np.asarray(xs, dtype=np.float32)
+        self.ys = np.asarray(ys, dtype=np.float32)
+        keys = self._keys(self.xs, self.ys)
+
+        if len(self.order) == len(keys):
+            # Incremental path
+            keys_prev_order = keys[self.order]
+            out_of_place = np.count_nonzero(keys_prev_order[1:] < keys_prev_order[:-1])
+            if out_of_place:
+                perm = np.argsort(keys_prev_order, kind='stable')
+                self.order = self.order[perm]
+                keys_prev_order = keys_prev_order[perm]
+            sorted_keys = keys_prev_order
+        else:
+            # Full rebuild (first tick, spawn or compaction)
+            out_of_place = len(keys)
+            self.order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[self.order]
+
+        # Cell table: offsets of each run of equal keys
+        if len(sorted_keys):
+            is_start = np.empty(len(sorted_keys), dtype=bool)
+            is_start[0] = True
+            np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=is_start[1:])
+            self.cell_starts = np.flatnonzero(is_start)
+            self.cell_keys = sorted_keys[self.cell_starts]
+            self.cell_counts = np.diff(np.append(self.cell_starts, len(sorted_keys)))
+            self._build_grid()
+        else:
+            self.cell_starts = np.zeros(0, dtype=np.int64)
+            self.cell_keys = np.zeros(0, dtype=np.int64)
+            self.cell_counts = np.zeros(0, dtype=np.int64)
+            self.cell_grid = None
+
+        return int(out_of_place)
+
+    def _build_grid(self):
+        """Dense lookup table over the occupied cells' bounding box."""
+        cx = self.cell_keys // _KEY_SHIFT
+        cy = self.cell_keys - cx * _KEY_SHIFT - _KEY_BIAS
+        x0, y0 = cx.min(), cy.min()
+        shape = (cy.max() - y0 + 1, cx.max() - x0 + 1)
+
+        if shape[0] * shape[1] > self.MAX_DENSE_CELLS:
+            self.cell_grid = None
+            return
+        self.cell_grid = np.full(shape, -1, dtype=np.int64)
+        self.cell_grid[cy - y0, cx - x0] = np.arange(len(self.cell_keys))
+        self.grid_origin = (x0, y0)
+
+    def _find_cells(self, cx, cy):
+        """Position of each cell (cx, cy) in the cell table, -1 if empty."""
+        if self.cell_grid is not None:
+            gx = cx - self.grid_origin[0]
+            gy = cy - self.grid_origin[1]
+            rows, cols = self.cell_grid.shape
+            inside = (gx >= 0) & (gx < cols) & (gy >= 0) & (gy < rows)
+            pos = np.full(len(cx), -1, dtype=np.int64)
+            pos[inside] = self.cell_grid[gy[inside], gx[inside]]
+            return pos
+
+        keys = cx * _KEY_SHIFT + (cy + _KEY_BIAS)
+        pos = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+        return np.where(self.cell_keys[pos] == keys, pos, -1)
+
+    def _pairs_within(self, qx, qy, radius, exclude):
+        """
+        All (query, point) pairs closer than 'radius'.
+        Visits the neighbour cells of every query one offset at a time and
+        filters by true distance immediately, so temporaries stay small.
+        Returns (query_index, point_index, dist2) arrays.
+        """
+        reach = max(1, int(np.ceil(radius / self.cell_size)))
+        radius2 = np.float32(radius * radius)
+        qcx, qcy = self._cells(qx, qy)
+        pair_q, pair_p, pair_d = [], [], []
+
+        if len(self.cell_keys) == 0:
+            reach = -1  # Empty index: skip the neighbour loop
+
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                # Locate each neighbour cell in the cell table
+                pos = self._find_cells(qcx + dx, qcy + dy)
+                hit = np.flatnonzero(pos >= 0)
+                if len(hit) == 0:
+                    continue
+
+                counts = self.cell_counts[pos[hit]]
+                starts = self.cell_starts[pos[hit]]
+
+                # Expand (cell start, count) into one row per candidate point:
+                # slot i of run r is order[starts[r] + (i - first_slot_of_r)]
+                run_offset = starts - (np.cumsum(counts) - counts)
+                q = np.repeat(hit, counts)
+                p = self.order[np.arange(counts.sum()) + np.repeat(run_offset, counts)]
+
+                dist2 = (self.xs[p] - qx[q]) ** 2 + (self.ys[p] - qy[q]) ** 2
+                keep = dist2 <= radius2
+                if exclude is not None:
+                    keep &= p != exclude[q]
+
+                pair_q.append(q[keep])
+                pair_p.append(p[keep])
+                pair_d.append(dist2[keep])
+
+        if not pair_q:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=np.float32)
+        return np.concatenate(pair_q), np.concatenate(pair_p), np.concatenate(pair_d)
+
+    def query_radius(self, qx, qy, radius, exclude=None):
+        """
+        Batched radius query.
+        qx, qy:  Query positions (N,)
+        exclude: Optional point index per query to skip (e.g. the agent itself)
+        Returns CSR arrays (offsets (N+1,), indices): the neighbours of query i
+        are indices[offsets[i]:offsets[i+1]].
+        """
+        qx = np.asarray(qx, dtype=np.float32)
+        qy = np.asarray(qy, dtype=np.float32)
+        n = len(qx)
+
+        counts = np.zeros(n, dtype=np.int64)
+        chunks = []
+        for b0 in range(0, n, self.batch_size):
+            b1 = min(b0 + self.batch_size, n)
+            ex = None if exclude is None else exclude[b0:b1]
+            q, p, _ = self._pairs_within(qx[b0:b1], qy[b0:b1], radius, ex)
+
+            # Group by query (pairs arrive grouped by neighbour offset)
+            sort = np.argsort(q, kind='stable')
+            counts[b0:b1] = np.bincount(q, minlength=b1 - b0)
+            chunks.append(p[sort])
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        indices = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+        return offsets, indices
+
+    def query_knn(self, qx, qy, k, radius=None, exclude=None, max_expansions=4):
+        """
+        Batched k-nearest-neighbour query.
+        Searches within 'radius' and doubles the radius for queries that found
+        fewer than k points, up to max_expansions times. The default radius is
+        sized from the mean cell occupancy so most queries finish in one pass.
+        Returns (indices (N, k), distances (N, k)); missing slots are -1 / inf.
+        """
+        qx = np.asarray(qx, dtype=np.float32)
+        qy = np.asarray(qy, dtype=np.float32)
+        n = len(qx)
+
+        indices = np.full((n, k), -1, dtype=np.int64)
+        distances = np.full((n, k), np.inf, dtype=np.float32)
+        if len(self.order) == 0:
+            return indices, distances  # Empty index (population died out / not spawned yet)
+
+        if radius is None:
+            per_cell = len(self.order) / max(1, len(self.cell_keys))
+            radius = self.cell_size * max(1.0, np.sqrt((k + 1) / per_cell))
+
+        pending = np.arange(n)
+        for _ in range(max_expansions + 1):
+            if len(pending) == 0:
+                break
+            for b0 in range(0, len(pending), self.batch_size):
+                rows = pending[b0:b0 + self.batch_size]
+                ex = None if exclude is None else exclude[rows]
+                q, p, dist2 = self._pairs_within(qx[rows], qy[rows], radius, ex)
+
+                # Sort by (query, distance) and keep the first k of each query.
+                # dist2 / radius^2 is in [0, 1], so q + that fraction orders both at once.
+                sort = np.argsort(q + dist2 / (radius * radius * 1.001))
+                q, p, dist2 = q[sort], p[sort], dist2[sort]
+                group_start = np.searchsorted(q, q, side='left')
+                rank = np.arange(len(q)) - group_start
+                top = rank < k
+
+                indices[rows[q[top]], rank[top]] = p[top]
+                distances[rows[q[top]], rank[top]] = np.sqrt(dist2[top])
+
+            pending = pending[indices[pending, k - 1] < 0]
+            radius *= 2.0
+
+        return indices, distances
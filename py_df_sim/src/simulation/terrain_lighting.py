@@ -0,0 +1,88 @@
+import numpy as np
+from config import TERRAIN_HEIGHT_SCALE
+
+# Baked lighting of a chunk's height field (CPU, NumPy).
+# Terrain only changes on edits, so the slopes and shadows the fragment
+# shader used to march every frame are computed once per chunk here and
+# uploaded as two extra RGBA texture arrays (see TextureManager).
+#
+# Layout of the 8 baked channels:
+#   0-1: Surface normal x, y remapped to 0..1 (z = sqrt(1 - x^2 - y^2))
+#   2-7: Horizon elevation towards HORIZON_AZIMUTHS directions
+#        (0, 60, ..., 300 degrees, counter-clockwise from +x),
+#        as angle / 90 degrees. A light below the horizon is shadowed.
+
+LAYER_COUNT = 8
+HORIZON_AZIMUTHS = 6
+SHADOW_STEPS = 24  # Same reach as STEPS in calculateShadow() (chunk.glsl)
+
+
+def surface_normals(height, scale=TERRAIN_HEIGHT_SCALE):
+    """
+    Forward-difference normals like getNormal() in the shader:
+    (h - h_right, h - h_up) * scale. Edge pixels reuse their own height
+    (clamp-to-edge). Water (h < 0.5) is forced flat.
+    """
+    h_right = np.concatenate([height[:, 1:], height[:, -1:]], axis=1)
+    h_up = np.concatenate([height[1:, :], height[-1:, :]], axis=0)  # Row index grows with y
+
+    normals = np.empty(height.shape + (3,), dtype=np.float32)
+    normals[..., 0] = (height - h_right) * scale
+    normals[..., 1] = (height - h_up) * scale
+    normals[..., 2] = 1.0
+    normals[height < 0.5] = (0.0, 0.0, 1.0)
+    normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+    return normals
+
+
+def horizon_angles(height, scale=TERRAIN_HEIGHT_SCALE, steps=SHADOW_STEPS):
+    """
+    (H, W, HORIZON_AZIMUTHS) highest terrain elevation angle seen from each
+    texel towards each azimuth, in 0..1 (= 0..90 degrees).
+    Samples 'steps' texels along each direction, with the same vertical
+    exaggeration as the normals (one texel of distance = 1 / scale height).
+    Samples outside the chunk do not occlude, like the shader's ray that stops
+    at the chunk border.
+    """
+    rows, cols = height.shape
+    padded = np.full((rows + 2 * steps, cols + 2 * steps), -np.inf, dtype=np.float32)
+    padded[steps:steps + rows, steps:steps + cols] = height
+
+    horizon = np.zeros((HORIZON_AZIMUTHS, rows, cols), dtype=np.float32)
+    tangent = np.empty((rows, cols), dtype=np.float32)
+    for k, offsets in enumerate(_ray_offsets(steps)):
+        best = horizon[k]  # Max tangent so far (0 = flat horizon)
+        for dx, dy, inv_distance in offsets:
+            sample = padded[steps + dy:steps + dy + rows, steps + dx:steps + dx + cols]
+            np.subtract(sample, height, out=tangent)
+            tangent *= inv_distance
+            np.maximum(best, tangent, out=best)
+
+    # Tangent -> angle / 90 degrees, exaggerated like the normals
+    horizon *= np.float32(scale)
+    np.arctan(horizon, out=horizon)
+    horizon *= np.float32(2.0 / np.pi)
+    return np.moveaxis(horizon, 0, -1)
+
+
+def _ray_offsets(steps):
+    """Per azimuth: the distinct nearest-texel offsets (dx, dy, 1 / distance) along the ray."""
+    rays = []
+    for k in range(HORIZON_AZIMUTHS):
+        azimuth = 2.0 * np.pi * k / HORIZON_AZIMUTHS
+        offsets = {}
+        for i in range(1, steps + 1):
+            dx = int(round(i * np.cos(azimuth)))
+            dy = int(round(i * np.sin(azimuth)))
+            offsets[(dx, dy)] = np.float32(1.0 / np.hypot(dx, dy))
+        rays.append([(dx, dy, inv) for (dx, dy), inv in offsets.items()])
+    return rays
+
+
+def bake(height, scale=TERRAIN_HEIGHT_SCALE):
+    """(H, W, 8) Float32 baked lighting of a height layer, all channels in 0..1."""
+    height = np.asarray(height, dtype=np.float32)
+    baked = np.empty(height.shape + (LAYER_COUNT,), dtype=np.float32)
+    baked[:, :, 0:2] = surface_normals(height, scale)[:, :, 0:2] * 0.5 + 0.5
+    baked[:, :, 2:] = horizon_angles(height, scale)
+    return baked
@@ -1,8 +1,13 @@
 import numpy as np
 from scipy.ndimage import gaussian_filter
+from config import CHUNK_SIZE, WEATHER_LOD_LEVEL, REAL_SECONDS_PER_GAME_DAY
+
+# Mosaic channels _refine_chunk() needs: Height, then the atmosphere (Layers 4-7)
+REFINE_CHANNELS = [0, 4, 5, 6, 7]
+
 
 class WeatherSimulator:
-    def __init__(self, size):
+    def __init__(self, size, lod_level=WEATHER_LOD_LEVEL):
         self.size = size
         
         # Physics Constants
@@ -11,6 +16,24 @@ class WeatherSimulator:
         self.wind_strength = 0.5    # Multiplier for wind speed
         self.coriolis_effect = 0.1  # Spin of the earth deflecting wind
 
+        # Multi-Resolution Settings
+        # Weather only runs on chunks of this Quadtree level (or coarser).
+        # Finer chunks are derived by upsampling (see update_lod).
+        self.lod_level = lod_level
+        self.lapse_rate = 0.2       # Same "Higher = Colder" factor used in update()
+
+        # Coarse atmosphere state: (x, y, level) -> (CHUNK_SIZE, CHUNK_SIZE, 8) array
+        # Owned by the simulator so DataManager.prune() does not reset the weather.
+        self.coarse_fields = {}
+
+        # Systems that adjust a coarse field copied from chunk data before it is
+        # first simulated (e.g. catch-up). Each hook is called as hook(chunk, field)
+        self.field_hooks = []
+
+    def add_field_hook(self, hook):
+        """Registers hook(chunk, field), called for every coarse field update_lod() fetches."""
+        self.field_hooks.append(hook)
+
     def update(self, world_map, dt):
         """
         Main simulation step. Modifies world_map in place.
@@ -78,3 +101,142 @@ class WeatherSimulator:
         # We will do a "Semi-Lagrangian" approximation or simple neighbor blending next.
         
         return world_map
+
+    def relax_air_temperature(self, world_map, dt):
+        """
+        Closed form of the thermal step in update() for large dt.
+        update() does an Euler step (diff * inertia * dt), which overshoots
+        once inertia * dt > 1. Here the air decays exponentially towards
+        its target instead, so any dt is stable and costs one pass.
+        """
+        height = world_map[:, :, 0]
+        target_air_temp = world_map[:, :, 1] - (height * self.lapse_rate)
+        decay = np.exp(-self.thermal_inertia * dt)
+        world_map[:, :, 6] = target_air_temp + (world_map[:, :, 6] - target_air_temp) * decay
+        return world_map
+
+    def catch_up(self, elapsed_hours):
+        """
+        Chronos catch-up hook. Fast-forwards the coarse atmosphere state.
+        Pressure and wind are diagnostic (derived from temperature), so the
+        next update_lod() recomputes them from the relaxed temperatures.
+        """
+        dt = (elapsed_hours / 24.0) * REAL_SECONDS_PER_GAME_DAY
+        for field in self.coarse_fields.values():
+            self.relax_air_temperature(field, dt)
+
+    def update_lod(self, visible_nodes, data_manager, dt):
+        """
+        Multi-resolution weather step.
+        1. Maps every visible node to its ancestor on self.lod_level
+           (nodes that are already coarser are simulated as-is).
+        2. Runs update() once on a stitched mosaic of those coarse chunks.
+        3. Writes the atmosphere (Layers 4-7) back into the resident chunks,
+           upsampling for finer nodes and adding a local orography term.
+        """
+        # 1. Group visible nodes by the coarse chunk that simulates them
+        groups = {}
+        for node in visible_nodes:
+            sim_level = min(node.level, self.lod_level)
+            shift = node.level - sim_level
+            coarse_key = (node.x >> shift, node.y >> shift, sim_level)
+            groups.setdefault(sim_level, {}).setdefault(coarse_key, []).append(node)
+
+        needed_keys = set()
+        for sim_level, coarse_groups in groups.items():
+            # 2. Stitch the bounding rectangle of coarse chunks into one map
+            #    so pressure blur and gradients are continuous across borders.
+            xs = [k[0] for k in coarse_groups]
+            ys = [k[1] for k in coarse_groups]
+            x0, y0 = min(xs), min(ys)
+            w, h = max(xs) - x0 + 1, max(ys) - y0 + 1
+
+            mosaic = np.empty((h * CHUNK_SIZE, w * CHUNK_SIZE, 8), dtype=np.float32)
+            for gy in range(h):
+                for gx in range(w):
+                    key = (x0 + gx, y0 + gy, sim_level)
+                    needed_keys.add(key)
+                    if key not in self.coarse_fields:
+                        chunk = data_manager.fetch_chunk(*key)
+                        field = chunk.height_map.copy()
+                        for hook in self.field_hooks:
+                            hook(chunk, field)
+                        self.coarse_fields[key] = field
+                    mosaic[gy * CHUNK_SIZE:(gy + 1) * CHUNK_SIZE,
+                           gx * CHUNK_SIZE:(gx + 1) * CHUNK_SIZE] = self.coarse_fields[key]
+
+            self.update(mosaic, dt)
+
+            for gy in range(h):
+                for gx in range(w):
+                    key = (x0 + gx, y0 + gy, sim_level)
+                    self.coarse_fields[key][:] = mosaic[gy * CHUNK_SIZE:(gy + 1) * CHUNK_SIZE,
+                                                        gx * CHUNK_SIZE:(gx + 1) * CHUNK_SIZE]
+
+            # 3. Refine downward into the resident chunks
+            #    (only height + atmosphere are interpolated: 5 of 8 channels)
+            refine_field = mosaic[:, :, REFINE_CHANNELS]
+            for coarse_key, nodes in coarse_groups.items():
+                for node in nodes:
+                    chunk = data_manager.loaded_chunks.get((node.x, node.y, node.level))
+                    if chunk is None:
+                        continue
+                    self._refine_chunk(chunk, refine_field, x0, y0, sim_level)
+
+        # Forget state for regions that left the view (same policy as DataManager.prune)
+        for key in list(self.coarse_fields.keys()):
+            if key not in needed_keys:
+                del self.coarse_fields[key]
+
+    def _refine_chunk(self, chunk, mosaic, x0, y0, sim_level):
+        """
+        Derives the atmosphere of a (finer) resident chunk from the coarse mosaic
+        (REFINE_CHANNELS of it: height, then Layers 4-7).
+        """
+        shift = chunk.level - sim_level
+        span = CHUNK_SIZE / (2 ** shift)  # Coarse pixels covered by this chunk
+
+        # Top-left of the chunk in mosaic pixel coordinates
+        oy = (chunk.y / (2 ** shift) - y0) * CHUNK_SIZE
+        ox = (chunk.x / (2 ** shift) - x0) * CHUNK_SIZE
+
+        coarse = _bilinear_patch(mosaic, oy, ox, span, CHUNK_SIZE)
+
+        # Local detail: the coarse sim only knows the coarse terrain height.
+        # Correct air temperature for the fine terrain with the lapse rate.
+        # (Preview chunks use their placeholder height instead of generating it here)
+        fine_height = chunk.get_display_layers(0, 1)[:, :, 0]
+        orography = (coarse[:, :, 0] - fine_height) * np.float32(self.lapse_rate)
+
+        # The atmosphere is fully overwritten: no need to generate it first
+        atmos = chunk.get_layers(4, 8, overwrite=True)
+        atmos[:] = coarse[:, :, 1:5]
+        atmos[:, :, 2] += orography  # Layer 6: Air Temp
+        chunk.mark_dirty_rect(layers=range(4, 8))  # Atmosphere texture only
+
+
+def _bilinear_patch(field, oy, ox, span, out_size):
+    """
+    Samples an (out_size, out_size) patch of field (H, W, C) starting at the
+    fractional pixel (oy, ox) and covering 'span' pixels per axis.
+    Pixel i of the output lands on field pixel o + i * span / out_size,
+    matching the corner-aligned sampling of TerrainGenerator.
+    """
+    h, w = field.shape[:2]
+    steps = np.arange(out_size) * (span / out_size)
+
+    ys = np.clip(oy + steps, 0, h - 1)
+    xs = np.clip(ox + steps, 0, w - 1)
+
+    y0 = np.floor(ys).astype(np.int64)
+    x0 = np.floor(xs).astype(np.int64)
+    y1 = np.minimum(y0 + 1, h - 1)
+    x1 = np.minimum(x0 + 1, w - 1)
+
+    # Float32 weights keep the blend in Float32 (field precision)
+    fy = (ys - y0).astype(np.float32)[:, None, None]
+    fx = (xs - x0).astype(np.float32)[None, :, None]
+
+    top = field[np.ix_(y0, x0)] * (1.0 - fx) + field[np.ix_(y0, x1)] * fx
+    bottom = field[np.ix_(y1, x0)] * (1.0 - fx) + field[np.ix_(y1, x1)] * fx
+    return (top * (1.0 - fy) + bottom * fy).astype(np.float32)
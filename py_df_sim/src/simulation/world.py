@@ -1,6 +1,6 @@
 import numpy as np
-import noise
 import config
+from utils.noise import pnoise2
 
 class World:
     def __init__(self):
@@ -20,40 +20,39 @@ class World:
         lacunarity = 2.0    # Detail frequency
         
         center_x, center_y = self.size / 2, self.size / 2
+        max_width = self.size * 0.5
 
-        # Iterate over every pixel
-        for y in range(self.size):
-            for x in range(self.size):
-                
-                # 1. Generate Perlin Noise
-                # We divide by scale to "zoom in"
-                # base=42 is the seed
-                nx = x / scale
-                ny = y / scale
-                h = noise.pnoise2(nx, ny, octaves=octaves, persistence=persistence, 
-                                  lacunarity=lacunarity, repeatx=1024, repeaty=1024, base=42)
-                
-                # Noise outputs -1.0 to 1.0 roughly. Normalize to 0.0 to 1.0
-                h = (h + 1) / 2.0
+        # Column coordinates are shared by every row (Broadcasting)
+        xs = np.arange(self.size, dtype=np.float32)
+        dx2 = (xs - center_x) ** 2
 
-                # 2. Apply Island Mask (Circular Gradient)
-                dx = x - center_x
-                dy = y - center_y
-                distance = np.sqrt(dx*dx + dy*dy)
-                
-                # Normalize distance: 0.0 at center, 1.0 at edge
-                max_width = self.size * 0.5
-                gradient = distance / max_width
-                
-                # Subtract gradient from height.
-                # Center (gradient 0) keeps original height.
-                # Edges (gradient 1) get pushed down into negative (water).
-                final_height = h - (gradient * 0.8)
-                
-                # Clamp between 0.0 and 1.0
-                final_height = max(0.0, min(1.0, final_height))
-                
-                # 3. Write Data
-                # R = Height, G/B = 0 (unused yet), A = 1 (Opaque)
-                self.data[y, x, 0] = final_height
-                self.data[y, x, 3] = 1.0
+        # Work in horizontal bands to cap temporary memory
+        # (~1M pixels per band, so 4096x4096 never holds full-size temporaries)
+        band = max(1, (1 << 20) // self.size)
+
+        for y0 in range(0, self.size, band):
+            ys = np.arange(y0, min(y0 + band, self.size), dtype=np.float32)[:, None]
+
+            # 1. Generate Perlin Noise for the whole band
+            # We divide by scale to "zoom in"
+            # base=42 is the seed
+            h = pnoise2(xs / scale, ys / scale, octaves=octaves, persistence=persistence,
+                        lacunarity=lacunarity, repeatx=1024, repeaty=1024, base=42)
+            
+            # Noise outputs -1.0 to 1.0 roughly. Normalize to 0.0 to 1.0
+            h = (h + 1) / 2.0
+
+            # 2. Apply Island Mask (Circular Gradient)
+            # Normalize distance: 0.0 at center, 1.0 at edge
+            gradient = np.sqrt(dx2 + (ys - center_y) ** 2) / max_width
+            
+            # Subtract gradient from height.
+            # Center (gradient 0) keeps original height.
+            # Edges (gradient 1) get pushed down into negative (water).
+            # Clamp between 0.0 and 1.0
+            final_height = np.clip(h - (gradient * 0.8), 0.0, 1.0)
+            
+            # 3. Write Data
+            # R = Height, G/B = 0 (unused yet), A = 1 (Opaque)
+            self.data[y0:y0 + len(ys), :, 0] = final_height
+            self.data[y0:y0 + len(ys), :, 3] = 1.0
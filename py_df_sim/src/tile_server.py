@@ -0,0 +1,261 @@
+"""
+Local HTTP server for world data (no pygame, stdlib asyncio only).
+
+Routes (GET):
+    /chunk/<level>/<x>/<y>.bin[?layers=0,3]  raw Float32 layers, shape (64, 64, n), row 0 = lowest y
+    /tiles/<level>/<x>/<y>.png                rendered tile (TMS order, see export_tiles.py)
+    /health                                   "ok"
+
+Levels outside 0..--max-level are 404; a chunk that fails to build is 500.
+Every response carries an ETag derived from the chunk version (seed, key and
+the mtime of the saved file, if any). "If-None-Match" answers 304 without
+touching the chunk. Bodies are kept in an in-process LRU; misses are built in
+a thread pool, at most --max-generate at a time, and concurrent misses for
+the same resource share one build.
+
+Usage:
+    python py_df_sim/src/tile_server.py --port 8765
+"""
+import argparse
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config import TILE_SERVER_PORT, TILE_SERVER_CACHE_SIZE, TILE_SERVER_MAX_LEVEL
+from engine.save_manager import SaveManager, SAVE_DIR
+from engine.tile_rasterizer import rasterize
+from simulation.data_manager import DataManager
+from simulation.generator import TerrainGenerator
+from utils.png import encode_png
+
+# The server never listens on anything but the loopback interface
+HOST = "127.0.0.1"
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+class ChunkServer:
+    def __init__(self, data_manager, cache_size=TILE_SERVER_CACHE_SIZE, max_generate=None,
+                 max_level=TILE_SERVER_MAX_LEVEL):
+        self.data_manager = data_manager
+        self.seed = data_manager.generator.seed
+        self.max_level = max_level
+
+        # LRU response cache: (kind, key, variant) -> (etag, content_type, body)
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+
+        # Bounded generation on cache misses
+        max_generate = max_generate or os.cpu_count()
+        self.executor = ThreadPoolExecutor(max_workers=max_generate)
+        self.generate_slots = asyncio.Semaphore(max_generate)
+        self.in_flight = {}  # Resource -> Future, so identical misses build once
+
+        self.stats = {'requests': 0, 'hits': 0, 'not_modified': 0, 'built': 0, 'failed': 0}
+
+    # ------------------------------------------------------------------
+    # RESOURCES
+    # ------------------------------------------------------------------
+
+    def etag(self, kind, key, variant, mtime):
+        """Version tag of a resource: changes when the saved chunk changes."""
+        x, y, level = key
+        layers = ".".join(str(v) for v in variant) or "all"
+        return f'"{kind}-{self.seed}-{level}-{x}-{y}-{mtime or 0}-{layers}"'
+
+    def _build(self, kind, key, variant):
+        """Runs in the thread pool: loads/generates the chunk and encodes the body."""
+        chunk = self.data_manager.fetch_chunk(*key)
+        if kind == 'chunk':
+            layers = list(variant) if variant else list(range(chunk.LAYER_COUNT))
+            chunk.ensure_layers(layers)  # Lazy chunks generate only these
+            body = np.ascontiguousarray(chunk.buffer[:, :, layers], dtype=np.float32).tobytes()
+            content_type = "application/octet-stream"
+        else:
+            body = encode_png(rasterize(chunk.height_map))
+            content_type = "image/png"
+        return self.etag(kind, key, variant, chunk.source_mtime), content_type, body
+
+    async def get_resource(self, kind, key, variant, if_none_match):
+        """Returns (status, etag, content_type, body)."""
+        resource = (kind, key, variant)
+
+        # 1. Current version from a stat() call, no data access
+        mtime = self.data_manager.save_manager.chunk_mtime(*key)
+        etag = self.etag(kind, key, variant, mtime)
+        if if_none_match == etag:
+            self.stats['not_modified'] += 1
+            return 304, etag, None, b""
+
+        # 2. Response cache
+        cached = self.cache.get(resource)
+        if cached is not None and cached[0] == etag:
+            self.cache.move_to_end(resource)
+            self.stats['hits'] += 1
+            return (200,) + cached
+
+        # 3. Build (shared with any identical request already building)
+        future = self.in_flight.get(resource)
+        if future is None:
+            future = asyncio.ensure_future(self._build_bounded(kind, key, variant))
+            self.in_flight[resource] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(resource, None))
+        entry = await future
+
+        self.cache[resource] = entry
+        self.cache.move_to_end(resource)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return (200,) + entry
+
+    async def _build_bounded(self, kind, key, variant):
+        async with self.generate_slots:
+            loop = asyncio.get_running_loop()
+            entry = await loop.run_in_executor(self.executor, self._build, kind, key, variant)
+            self.stats['built'] += 1
+            return entry
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def route(self, path):
+        """Parses a request path into (kind, key, variant), or None."""
+        path, _, query = path.partition('?')
+        parts = path.strip('/').split('/')
+        if len(parts) != 4 or parts[0] not in ('chunk', 'tiles'):
+            return None
+        kind = 'chunk' if parts[0] == 'chunk' else 'tile'
+        name, _, ext = parts[3].partition('.')
+        if ext != ('bin' if kind == 'chunk' else 'png'):
+            return None
+        try:
+            level, x, y = int(parts[1]), int(parts[2]), int(name)
+            if not 0 <= level <= self.max_level:
+                return None
+            variant = ()
+            for item in query.split('&'):
+                if kind == 'chunk' and item.startswith('layers='):
+                    variant = tuple(int(v) for v in item[len('layers='):].split(','))
+                    if any(v < 0 or v >= 8 for v in variant):
+                        return None
+        except ValueError:
+            return None
+        return kind, (x, y, level), variant
+
+    async def handle(self, reader, writer):
+        """One connection; serves requests until the client closes (HTTP/1.1 keep-alive)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                self.stats['requests'] += 1
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, body=b"bad request\n", close=True)
+                    break
+
+                keep_alive = version == "HTTP/1.1" and headers.get('connection', '').lower() != 'close'
+                await self._dispatch(writer, method, path, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            # Anything else must not end the task silently ("Task exception was never retrieved")
+            print(f"Connection error: {e!r}")
+        finally:
+            writer.close()
+
+    async def _dispatch(self, writer, method, path, headers, keep_alive):
+        if method != "GET":
+            await self._respond(writer, 405, body=b"GET only\n", close=not keep_alive)
+            return
+        if path == "/health":
+            await self._respond(writer, 200, body=b"ok\n", close=not keep_alive)
+            return
+
+        target = self.route(path)
+        if target is None:
+            await self._respond(writer, 404, body=b"not found\n", close=not keep_alive)
+            return
+
+        try:
+            status, etag, content_type, body = await self.get_resource(*target, headers.get('if-none-match'))
+        except Exception as e:
+            # Generation or I/O failed (shared by every request waiting on it, never cached)
+            self.stats['failed'] += 1
+            print(f"Build failed for {path}: {e!r}")
+            await self._respond(writer, 500, body=b"build failed\n", close=not keep_alive)
+            return
+        extra = {"ETag": etag, "Cache-Control": "no-cache"}
+        if target[0] == 'chunk' and status == 200:
+            extra["X-Chunk-Shape"] = f"64,64,{len(target[2]) or 8}"
+            extra["X-Chunk-Dtype"] = "float32"
+        await self._respond(writer, status, content_type, body, extra, close=not keep_alive)
+
+    async def _respond(self, writer, status, content_type="text/plain", body=b"", extra=None, close=False):
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}", f"Content-Length: {len(body)}"]
+        if status != 304:
+            lines.append(f"Content-Type: {content_type}")
+        for name, value in (extra or {}).items():
+            lines.append(f"{name}: {value}")
+        lines.append("Connection: close" if close else "Connection: keep-alive")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(port, save_dir, seed, cache_size, max_generate, max_level):
+    save_manager = SaveManager(save_dir=save_dir)
+    data_manager = DataManager(TerrainGenerator(seed=seed), save_manager)
+    server = ChunkServer(data_manager, cache_size, max_generate, max_level)
+
+    listener = await asyncio.start_server(server.handle, HOST, port)
+    print(f"Serving world (seed {seed}) on http://{HOST}:{port}/  (Ctrl+C to stop)")
+    started = time.perf_counter()
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        elapsed = time.perf_counter() - started
+        print(f"\n{server.stats} in {elapsed:.0f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=TILE_SERVER_PORT)
+    parser.add_argument("--save-dir", default=SAVE_DIR)
+    parser.add_argument("--seed", type=int, default=None, help="Default: seed of the save, else 12345")
+    parser.add_argument("--cache-size", type=int, default=TILE_SERVER_CACHE_SIZE, help="Responses kept in RAM")
+    parser.add_argument("--max-generate", type=int, default=None, help="Concurrent chunk builds (default: CPU count)")
+    parser.add_argument("--max-level", type=int, default=TILE_SERVER_MAX_LEVEL, help="Deepest level served")
+    args = parser.parse_args()
+
+    seed = args.seed
+    if seed is None:
+        state = SaveManager(save_dir=args.save_dir).load_global_state()
+        seed = state['seed'] if state else 12345
+
+    try:
+        asyncio.run(serve(args.port, args.save_dir, seed, args.cache_size, args.max_generate, args.max_level))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
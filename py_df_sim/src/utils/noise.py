@@ -1,2 +1,124 @@
-# TODO: Day 2 - Perlin/Simplex noise wrappers
-pass
+import numpy as np
+
+# --- VECTORIZED PERLIN NOISE ---
+# A NumPy port of noise.pnoise2 (the 'noise' package, Casey Duncan).
+# Same permutation table, gradients and Float32 arithmetic, so a field built
+# here matches a pixel-by-pixel pnoise2 loop, but runs as whole-array math.
+#
+# Deliberate divergence for base > 0: the C code indexes its 512-entry table
+# up to 510 + base, reading whatever memory follows it (build dependent).
+# We wrap the index instead, so base > 0 is a different (but deterministic)
+# field: e.g. for World's base=42 roughly 15-30% of points differ from C.
+# base = 0 (TerrainGenerator) is bit-identical.
+
+# Ken Perlin's reference permutation (repeated twice, like the C table)
+_PERM_BASE = [
+    151, 160, 137, 91, 90, 15, 131, 13, 201, 95, 96, 53, 194, 233, 7, 225, 140,
+    36, 103, 30, 69, 142, 8, 99, 37, 240, 21, 10, 23, 190, 6, 148, 247, 120,
+    234, 75, 0, 26, 197, 62, 94, 252, 219, 203, 117, 35, 11, 32, 57, 177, 33,
+    88, 237, 149, 56, 87, 174, 20, 125, 136, 171, 168, 68, 175, 74, 165, 71,
+    134, 139, 48, 27, 166, 77, 146, 158, 231, 83, 111, 229, 122, 60, 211, 133,
+    230, 220, 105, 92, 41, 55, 46, 245, 40, 244, 102, 143, 54, 65, 25, 63, 161,
+    1, 216, 80, 73, 209, 76, 132, 187, 208, 89, 18, 169, 200, 196, 135, 130,
+    116, 188, 159, 86, 164, 100, 109, 198, 173, 186, 3, 64, 52, 217, 226, 250,
+    124, 123, 5, 202, 38, 147, 118, 126, 255, 82, 85, 212, 207, 206, 59, 227,
+    47, 16, 58, 17, 182, 189, 28, 42, 223, 183, 170, 213, 119, 248, 152, 2, 44,
+    154, 163, 70, 221, 153, 101, 155, 167, 43, 172, 9, 129, 22, 39, 253, 19, 98,
+    108, 110, 79, 113, 224, 232, 178, 185, 112, 104, 218, 246, 97, 228, 251, 34,
+    242, 193, 238, 210, 144, 12, 191, 179, 162, 241, 81, 51, 145, 235, 249, 14,
+    239, 107, 49, 192, 214, 31, 181, 199, 106, 157, 184, 84, 204, 176, 115, 121,
+    50, 45, 127, 4, 150, 254, 138, 236, 205, 93, 222, 114, 67, 29, 24, 72, 243,
+    141, 128, 195, 78, 66, 215, 61, 156, 180,
+]
+_PERM = np.array(_PERM_BASE * 2, dtype=np.int32)
+
+# 2D gradients: the X/Y columns of the 16 GRAD3 vectors
+_GRAD_X = np.array([1, -1, 1, -1, 1, -1, 1, -1, 0, 0, 0, 0, 1, -1, 0, 0], dtype=np.float32)
+_GRAD_Y = np.array([1, 1, -1, -1, 0, 0, 0, 0, 1, -1, 1, -1, 0, 0, -1, 1], dtype=np.float32)
+
+
+def _perm(index):
+    # The C version reads past its 512 entries when base > 0; we wrap instead
+    # (see the module header: output differs from C for base > 0).
+    return _PERM[index & 511]
+
+
+def _grad(hash_value, x, y):
+    h = hash_value & 15
+    return x * _GRAD_X[h] + y * _GRAD_Y[h]
+
+
+def _noise2(x, y, repeatx, repeaty, base):
+    """
+    Single octave of improved Perlin noise over Float32 arrays.
+    """
+    repeatx = np.float32(repeatx)
+    repeaty = np.float32(repeaty)
+
+    # 1. Lattice cell (with tiling)
+    i = np.floor(np.fmod(x, repeatx)).astype(np.int32)
+    j = np.floor(np.fmod(y, repeaty)).astype(np.int32)
+    ii = np.fmod((i + 1).astype(np.float32), repeatx).astype(np.int32)
+    jj = np.fmod((j + 1).astype(np.float32), repeaty).astype(np.int32)
+
+    i = (i & 255) + base
+    j = (j & 255) + base
+    ii = (ii & 255) + base
+    jj = (jj & 255) + base
+
+    # 2. Position inside the cell + quintic fade curve
+    x = x - np.floor(x)
+    y = y - np.floor(y)
+    fx = x * x * x * (x * (x * 6 - 15) + 10)
+    fy = y * y * y * (y * (y * 6 - 15) + 10)
+
+    # 3. Hash the 4 corners
+    a = _perm(i)
+    aa = _perm(a + j)
+    ab = _perm(a + jj)
+    b = _perm(ii)
+    ba = _perm(b + j)
+    bb = _perm(b + jj)
+
+    # 4. Blend corner gradients
+    one = np.float32(1.0)
+    g_aa = _grad(_perm(aa), x, y)
+    g_ba = _grad(_perm(ba), x - one, y)
+    g_ab = _grad(_perm(ab), x, y - one)
+    g_bb = _grad(_perm(bb), x - one, y - one)
+
+    bottom = g_aa + fx * (g_ba - g_aa)
+    top = g_ab + fx * (g_bb - g_ab)
+    return bottom + fy * (top - bottom)
+
+
+def pnoise2(x, y, octaves=1, persistence=0.5, lacunarity=2.0,
+            repeatx=1024, repeaty=1024, base=0):
+    """
+    Vectorized drop-in for noise.pnoise2 (identical for base=0 only, see module header).
+    x, y: Scalars or arrays (broadcast together). Returns a Float32 array.
+
+    Passing a row of X and a column of Y (e.g. shapes (1, W) and (H, 1))
+    keeps all per-axis work 1D; only the corner hashing runs at (H, W).
+    """
+    if octaves < 1:
+        raise ValueError("Expected octaves value > 0")
+
+    x = np.asarray(x, dtype=np.float32)
+    y = np.asarray(y, dtype=np.float32)
+
+    if octaves == 1:
+        return _noise2(x, y, repeatx, repeaty, base)
+
+    freq = np.float32(1.0)
+    amp = np.float32(1.0)
+    max_amp = np.float32(0.0)
+    total = np.zeros(np.broadcast_shapes(x.shape, y.shape), dtype=np.float32)
+
+    for _ in range(octaves):
+        total += _noise2(x * freq, y * freq, repeatx * freq, repeaty * freq, base) * amp
+        max_amp += amp
+        freq *= np.float32(lacunarity)
+        amp *= np.float32(persistence)
+
+    return total / max_amp
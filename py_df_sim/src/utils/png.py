@@ -0,0 +1,43 @@
+# src/utils/png.py
+# Minimal PNG writer (stdlib zlib + struct only, no Pillow needed).
+import os
+import struct
+import zlib
+
+import numpy as np
+
+
+def _chunk(tag, payload):
+    data = tag + payload
+    return struct.pack('>I', len(payload)) + data + struct.pack('>I', zlib.crc32(data) & 0xFFFFFFFF)
+
+
+def encode_png(pixels, compression=6):
+    """
+    Encodes an (H, W, 3) or (H, W, 4) uint8 array as PNG bytes.
+    Row 0 is the TOP row of the image.
+    """
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    height, width, channels = pixels.shape
+    color_type = {3: 2, 4: 6}[channels]  # 2 = RGB, 6 = RGBA
+
+    # Every scanline starts with a filter byte (0 = None)
+    raw = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, -1)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n'
+            + _chunk(b'IHDR', header)
+            + _chunk(b'IDAT', zlib.compress(raw.tobytes(), compression))
+            + _chunk(b'IEND', b''))
+
+
+def write_png(path, pixels, compression=6):
+    """
+    Writes a PNG atomically: the file either does not exist or is complete,
+    so an interrupted export can tell finished tiles by their presence.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(encode_png(pixels, compression))
+    os.replace(tmp_path, path)
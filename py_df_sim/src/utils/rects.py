@@ -0,0 +1,71 @@
+# src/utils/rects.py
+# Integer pixel rectangles (x0, y0, x1, y1), half-open: x0 <= x < x1, y0 <= y < y1.
+# Pure Python helpers, no GPU required.
+
+
+def rect_area(r):
+    return max(0, r[2] - r[0]) * max(0, r[3] - r[1])
+
+
+def rect_union(a, b):
+    """Smallest rectangle containing both a and b."""
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def rect_intersection_area(a, b):
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    return max(0, w) * max(0, h)
+
+
+def clip_rect(r, width, height):
+    """Clips r to [0, width) x [0, height). Returns None if nothing is left."""
+    clipped = (max(0, r[0]), max(0, r[1]), min(width, r[2]), min(height, r[3]))
+    if clipped[2] <= clipped[0] or clipped[3] <= clipped[1]:
+        return None
+    return clipped
+
+
+def merge_waste(a, b):
+    """Pixels the union of a and b covers that neither a nor b covers."""
+    covered = rect_area(a) + rect_area(b) - rect_intersection_area(a, b)
+    return rect_area(rect_union(a, b)) - covered
+
+
+def merge_rects(rects, max_rects=4, slack=0):
+    """
+    Reduces a list of dirty rectangles to a few upload regions.
+    1. Pairs whose union wastes at most 'slack' pixels are merged
+       (contained, overlapping in a line, or edge-adjacent rectangles).
+    2. While more than max_rects remain, the pair with the least waste is merged.
+    Returns a new list; the union of the result always covers the input.
+    """
+    rects = [r for r in rects if rect_area(r) > 0]
+
+    # 1. Free merges
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                if merge_waste(rects[i], rects[j]) <= slack:
+                    rects[i] = rect_union(rects[i], rects[j])
+                    del rects[j]
+                    merged = True
+                    break
+            if merged:
+                break
+
+    # 2. Cheapest merges until the budget is met
+    while len(rects) > max_rects:
+        best = None
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                waste = merge_waste(rects[i], rects[j])
+                if best is None or waste < best[0]:
+                    best = (waste, i, j)
+        _, i, j = best
+        rects[i] = rect_union(rects[i], rects[j])
+        del rects[j]
+
+    return rects